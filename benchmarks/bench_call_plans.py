@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of the overhead of `Api` method calls.
+
+Compares the stack introspection that `ApiBase._make_request` used before with
+the precompiled call plans. The network is replaced by a canned response, so
+only the client side work is measured.
+
+Usage:
+    python -m benchmarks.bench_call_plans [number of calls]
+"""
+
+import inspect
+import sys
+import time
+
+import telegrambotapiwrapper.frames as frames
+from telegrambotapiwrapper import Api
+from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper.request import json_payload
+from telegrambotapiwrapper.response import handle_response
+
+RESPONSE = (b'{"ok":true,"result":{"message_id":1,"date":1600000000,'
+            b'"chat":{"id":3,"type":"private","first_name":"John"},'
+            b'"from":{"id":5,"is_bot":true,"first_name":"bot"},'
+            b'"text":"hello"}}')
+
+
+class FakeResponse:
+    content = RESPONSE
+
+
+class OfflineApi(Api):
+    """Api that does not touch the network."""
+
+    def _make_post_request(self, url, **kwargs):
+        return FakeResponse()
+
+
+class IntrospectingApi(OfflineApi):
+    """Api with `_make_request` implemented via stack introspection."""
+
+    def _make_request(self):
+        args = frames.outer2_args()
+        caller2_name = frames.outer2_name()
+        result_type = AnnotationWrapper(inspect.signature(
+            getattr(self, caller2_name)).return_annotation).sanitized
+        tg_method_name = self._get_tg_api_method_name(caller2_name)
+        payload = json_payload(args)
+        url = self._get_tg_api_method_url(tg_method_name)
+        r = self._make_post_request(
+            url, data=payload, headers={'Content-Type': 'application/json'})
+        return handle_response(r.content.decode('utf-8'), result_type)
+
+
+def calls_per_second(api: Api, number: int) -> float:
+    api.send_message(chat_id=3, text='hello')  # warm up
+    start = time.perf_counter()
+    for _ in range(number):
+        api.send_message(chat_id=3, text='hello')
+    return number / (time.perf_counter() - start)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    before = calls_per_second(IntrospectingApi(token='123:abc'), number)
+    after = calls_per_second(OfflineApi(token='123:abc'), number)
+    print('stack introspection: {:10.0f} calls/s'.format(before))
+    print('call plans:          {:10.0f} calls/s'.format(after))
+    print('speedup:             {:10.1f}x'.format(after / before))
+
+
+if __name__ == '__main__':
+    main()
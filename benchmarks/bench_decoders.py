@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of decoding of Telegram Bot Api types.
+
+Compares the recursive `response.to_api_type` with the compiled decoders on
+Message, CallbackQuery and a batch of 100 updates.
+
+Usage:
+    python -m benchmarks.bench_decoders [number of repeats]
+"""
+
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.response import replace__from__by__from_
+from telegrambotapiwrapper.response import to_api_type
+
+CASES = [
+    ('Message', 'Message', payloads.MESSAGE),
+    ('photo Message', 'Message', payloads.PHOTO_MESSAGE),
+    ('CallbackQuery', 'CallbackQuery', payloads.CALLBACK_QUERY),
+    ('100 updates', 'List[Update]', payloads.updates(100)),
+]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print('{:15} {:>14} {:>14} {:>8}'.format(
+        'payload', 'to_api_type', 'compiled', 'speedup'))
+    for title, anno, obj in CASES:
+        wrapper = AnnotationWrapper(anno)
+        decoder = get_decoder(anno)
+        assert decoder(obj) == to_api_type(replace__from__by__from_(obj),
+                                           wrapper)
+        before = timeit.timeit(
+            lambda: to_api_type(replace__from__by__from_(obj), wrapper),
+            number=number) / number
+        after = timeit.timeit(lambda: decoder(obj), number=number) / number
+        print('{:15} {:11.1f} us {:11.1f} us {:7.1f}x'.format(
+            title, before * 1e6, after * 1e6, before / after))
+
+
+if __name__ == '__main__':
+    main()
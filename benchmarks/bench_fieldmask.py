@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of decoding updates with a field mask.
+
+A bot reads only the chat, the sender and the text of messages. The updates
+of a `getUpdates` response are decoded fully, and decoded with the mask of
+these fields, so replies, entities, photos, etc. are skipped.
+
+Usage:
+    python -m benchmarks.bench_fieldmask [number of repeats]
+"""
+
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper.decoders import get_decoder
+
+MASK = ('message.chat.id', 'message.from_.id', 'message.text',
+        'callback_query.from_.id', 'callback_query.data')
+
+UPDATES = payloads.updates()
+
+full = get_decoder('List[Update]')
+masked = get_decoder('List[Update]', MASK)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for a, b in zip(full(UPDATES), masked(UPDATES)):
+        assert (a.message and a.message.text) == (b.message and b.message.text)
+    before = timeit.timeit(lambda: full(UPDATES), number=number) / number
+    after = timeit.timeit(lambda: masked(UPDATES), number=number) / number
+    print('100 updates: full {:.0f} us, masked {:.0f} us, {:.1f}x'.format(
+        before * 1e6, after * 1e6, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of the JSON codecs.
+
+Parses a getUpdates response with 100 updates and encodes a sendMessage
+payload with every installed codec of `jsoncodec`, and with `jsonpickle`,
+which was used before, if it is installed.
+
+Usage:
+    python -m benchmarks.bench_json [number of repeats]
+"""
+
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper import jsoncodec
+from telegrambotapiwrapper.request import to_jsonable
+
+RESPONSE = payloads.get_updates_response(100)
+PAYLOAD = to_jsonable({
+    'chat_id': payloads.GROUP['id'],
+    'text': payloads.MESSAGE['text'],
+    'reply_markup': payloads.CALLBACK_QUERY['message']['reply_markup'],
+})
+
+
+def _jsonpickle():
+    try:
+        import jsonpickle  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return (jsonpickle.loads,
+            lambda obj: jsonpickle.dumps(obj).encode('utf-8'))
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    backends = {}
+    for name in jsoncodec.available_codecs():
+        codec = jsoncodec.CODECS[name]()
+        backends[name] = (codec.loads, codec.dumps)
+    baseline = _jsonpickle()
+    if baseline is not None:
+        backends['jsonpickle'] = baseline
+
+    expected = jsoncodec.StdlibCodec().loads(RESPONSE)
+    print('{:<12}{:>22}{:>22}'.format('codec', 'getUpdates x100, us',
+                                      'sendMessage, us'))
+    for name, (loads, dumps) in backends.items():
+        assert loads(RESPONSE) == expected
+        parse = timeit.timeit(lambda: loads(RESPONSE),
+                              number=number) / number
+        encode = timeit.timeit(lambda: dumps(PAYLOAD),
+                               number=number * 10) / (number * 10)
+        print('{:<12}{:>22.1f}{:>22.2f}'.format(name, parse * 1e6,
+                                                encode * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of lazy decoding of updates.
+
+Decodes a batch of updates and reads what a typical handler reads
+(`update.message.text` and `update.message.chat.id`), eagerly with the
+compiled decoders and lazily with `lazy.decoders`.
+
+Usage:
+    python -m benchmarks.bench_lazy [number of repeats]
+"""
+
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper import lazy
+from telegrambotapiwrapper.decoders import decoders
+
+UPDATES = payloads.updates(100)
+
+
+def handle(decode):
+    for update in decode(UPDATES):
+        message = update.message or update.callback_query.message
+        _ = message.text, message.chat.id
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    eager = decoders.get('List[Update]')
+    lazy_ = lazy.decoders.get('List[Update]')
+    assert repr(eager(UPDATES)) == repr(lazy_(UPDATES))
+    before = timeit.timeit(lambda: handle(eager), number=number) / number
+    after = timeit.timeit(lambda: handle(lazy_), number=number) / number
+    print('100 updates: eager {:.1f} us, lazy {:.1f} us, {:.1f}x'.format(
+        before * 1e6, after * 1e6, before / after))
+
+
+if __name__ == '__main__':
+    main()
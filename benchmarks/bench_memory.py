@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of memory taken by decoded updates.
+
+Decodes a batch of updates with every set of decoders and measures with
+tracemalloc the memory allocated for the decoded objects only (the parsed
+json is allocated before the measurement).
+
+Usage:
+    python -m benchmarks.bench_memory [number of updates]
+"""
+
+import json
+import sys
+import tracemalloc
+
+from benchmarks import payloads
+from telegrambotapiwrapper import slotted, sparse
+from telegrambotapiwrapper.decoders import decoders
+
+MODES = [
+    ('dataclasses', decoders),
+    ('slotted', slotted.decoders),
+    ('sparse', sparse.decoders),
+]
+
+
+def bytes_per_update(decoder, number: int) -> float:
+    raw = json.loads(json.dumps(payloads.updates(number)))
+    tracemalloc.start()
+    try:
+        updates = decoder(raw)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(updates) == number
+    return size / number
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print('{:15} {:>16} {:>8}'.format('decoders', 'bytes per update',
+                                     'ratio'))
+    baseline = None
+    for title, mode in MODES:
+        size = bytes_per_update(mode.get('List[Update]'), number)
+        baseline = baseline or size
+        print('{:15} {:16.0f} {:7.2f}x'.format(title, size, baseline / size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of filtering of webhook requests before decoding.
+
+A bot handles only commands in a busy group: of 100 webhook requests 5 carry
+commands. The requests are decoded by `webhook_handler` and filtered after
+decoding, and filtered by a `Prefilter` before decoding.
+
+Usage:
+    python -m benchmarks.bench_prefilter [number of repeats]
+"""
+
+import copy
+import json
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper.prefilter import commands
+from telegrambotapiwrapper.webhooks import webhook_handler
+
+
+def requests(number: int = 100) -> list:
+    res = []
+    for i in range(number):
+        update = {'update_id': i, 'message': copy.deepcopy(payloads.MESSAGE)}
+        if i % 20:
+            update['message']['text'] = 'just chatting about decoders'
+            del update['message']['entities']
+        res.append(json.dumps(update).encode('utf-8'))
+    return res
+
+
+REQUESTS = requests()
+
+
+def decode_then_filter():
+    return [update for update in map(webhook_handler, REQUESTS)
+            if update.message.text.startswith('/')]
+
+
+def prefilter_then_decode(prefilter=commands()):
+    return [update for update in (webhook_handler(raw, prefilter=prefilter)
+                                  for raw in REQUESTS)
+            if update is not None]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    assert repr(decode_then_filter()) == repr(prefilter_then_decode())
+    before = timeit.timeit(decode_then_filter, number=number) / number
+    after = timeit.timeit(prefilter_then_decode, number=number) / number
+    print('100 requests, 5 commands: decode and filter {:.0f} us, '
+          'prefilter {:.0f} us, {:.1f}x'.format(before * 1e6, after * 1e6,
+                                                before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Benchmark of routing of updates.
+
+Routes a batch of updates with commands and callback queries with a linear
+scan of filter predicates and with `Router`, for different numbers of the
+registered handlers.
+
+Usage:
+    python -m benchmarks.bench_router [number of repeats]
+"""
+
+import sys
+import timeit
+
+from benchmarks import payloads
+from telegrambotapiwrapper.decoders import decoders
+from telegrambotapiwrapper.router import Router
+
+UPDATES = decoders.get('List[Update]')(payloads.updates(99))
+
+
+def handler(update):
+    return update
+
+
+def linear(count: int):
+    """Handlers with filters, like `if update.message.text == '/cmd0'`."""
+    filters = []
+    for i in range(count):
+        filters.append((
+            lambda update, text='/cmd{}'.format(i): (
+                update.message is not None and update.message.text
+                and update.message.text.split()[0] == text),
+            handler))
+        filters.append((
+            lambda update, prefix='data{}:'.format(i): (
+                update.callback_query is not None
+                and update.callback_query.data.startswith(prefix)),
+            handler))
+    filters.append((lambda update: update.message is not None, handler))
+    filters.append((lambda update: update.callback_query is not None,
+                    handler))
+
+    def route(update):
+        for matches, func in filters:
+            if matches(update):
+                return func
+        return None
+
+    return route
+
+
+def indexed(count: int):
+    router = Router()
+    for i in range(count):
+        router.add_command('cmd{}'.format(i), handler)
+        router.add_callback('data{}:'.format(i), handler)
+    router.add('message', handler)
+    router.add('callback_query', handler)
+    return router.route
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print('{:>10}{:>16}{:>16}'.format('handlers', 'linear, us', 'router, us'))
+    for count in (10, 100, 1000):
+        results = []
+        for build in (linear, indexed):
+            route = build(count)
+            results.append(timeit.timeit(
+                lambda: [route(update) for update in UPDATES],
+                number=number) / number / len(UPDATES))
+        print('{:>10}{:>16.2f}{:>16.2f}'.format(
+            count * 2, results[0] * 1e6, results[1] * 1e6))
+
+
+if __name__ == '__main__':
+    main()
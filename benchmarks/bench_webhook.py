@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Throughput benchmark of the webhook server.
+
+Runs `WebhookServer` with a trivial handler in a thread with its own event
+loop, and a load generator sending realistic updates over keep-alive
+connections from the main thread.
+
+Usage:
+    python -m benchmarks.bench_webhook [number of requests] [connections]
+
+Notes:
+    1) The server and the load generator share the process and the GIL, so
+       the numbers are a lower bound of what the server does alone.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from typing import Tuple
+
+from benchmarks import payloads
+from telegrambotapiwrapper import lazy
+from telegrambotapiwrapper.aiotransport import AsyncTransport
+from telegrambotapiwrapper.webhookserver import WebhookServer
+
+BODIES = [json.dumps(update).encode('utf-8')
+          for update in payloads.updates(100)]
+
+
+async def handle(update):
+    _ = update.update_id
+
+
+def start_server(decoders
+                 ) -> Tuple[WebhookServer, asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    server = WebhookServer(handle, port=0, path='/hook', decoders=decoders)
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return server, loop
+
+
+def stop_server(server: WebhookServer, loop: asyncio.AbstractEventLoop):
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+async def load(port: int, number: int, connections: int) -> float:
+    url = 'http://127.0.0.1:{}/hook'.format(port)
+    counter = iter(range(number))
+
+    async def client(transport):
+        for i in counter:
+            response = await transport.request('POST', url,
+                                               BODIES[i % len(BODIES)])
+            assert response.status == 200
+
+    async with AsyncTransport(pool_maxsize=connections) as transport:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(transport)
+                               for _ in range(connections)))
+        return time.perf_counter() - started
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    for name, decoders in (('compiled', None), ('lazy', lazy.decoders)):
+        server, loop = start_server(decoders)
+        elapsed = asyncio.run(load(server.port, number, connections))
+        stop_server(server, loop)
+        assert server.handled == number
+        print('{:<10}{} requests over {} connections: {:.0f} requests/s'
+              .format(name, number, connections, number / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Realistic Telegram Bot Api payloads for the benchmarks."""
+
+import json
+
+USER = {'id': 123456789, 'is_bot': False, 'first_name': 'John',
+        'last_name': 'Doe', 'username': 'johndoe', 'language_code': 'en'}
+
+GROUP = {'id': -1001234567890, 'title': 'Python developers',
+         'username': 'pythondevs', 'type': 'supergroup'}
+
+MESSAGE = {
+    'message_id': 4321,
+    'from': USER,
+    'chat': GROUP,
+    'date': 1600000000,
+    'reply_to_message': {
+        'message_id': 4320,
+        'from': {'id': 987654321, 'is_bot': False, 'first_name': 'Jane'},
+        'chat': GROUP,
+        'date': 1599999990,
+        'text': 'Does anybody know how to decode updates fast?',
+    },
+    'text': '/help@somebot please, see https://example.com',
+    'entities': [
+        {'offset': 0, 'length': 13, 'type': 'bot_command'},
+        {'offset': 26, 'length': 19, 'type': 'url'},
+    ],
+}
+
+PHOTO_MESSAGE = {
+    'message_id': 4322,
+    'from': USER,
+    'chat': GROUP,
+    'date': 1600000001,
+    'photo': [
+        {'file_id': 'AgADAgAD' + 'a' * 60, 'file_unique_id': 'AQADa1',
+         'file_size': 1500, 'width': 90, 'height': 60},
+        {'file_id': 'AgADAgAD' + 'b' * 60, 'file_unique_id': 'AQADb2',
+         'file_size': 25000, 'width': 320, 'height': 213},
+        {'file_id': 'AgADAgAD' + 'c' * 60, 'file_unique_id': 'AQADc3',
+         'file_size': 100000, 'width': 800, 'height': 533},
+    ],
+    'caption': 'Look at this',
+}
+
+CALLBACK_QUERY = {
+    'id': '4382bfdwdsb323b2d9',
+    'from': USER,
+    'message': {
+        'message_id': 4323,
+        'from': {'id': 555555555, 'is_bot': True, 'first_name': 'somebot',
+                 'username': 'somebot'},
+        'chat': {'id': 123456789, 'first_name': 'John', 'type': 'private'},
+        'date': 1600000002,
+        'text': 'Choose an option',
+        'reply_markup': {'inline_keyboard': [[
+            {'text': 'Yes', 'callback_data': 'vote:yes'},
+            {'text': 'No', 'callback_data': 'vote:no'},
+        ]]},
+    },
+    'chat_instance': '-1234567890123456789',
+    'data': 'vote:yes',
+}
+
+
+def updates(number: int = 100) -> list:
+    """Get a batch of updates with messages, photos and callback queries."""
+    res = []
+    for i in range(number):
+        update = {'update_id': 10000 + i}
+        kind = i % 3
+        if kind == 0:
+            update['message'] = MESSAGE
+        elif kind == 1:
+            update['message'] = PHOTO_MESSAGE
+        else:
+            update['callback_query'] = CALLBACK_QUERY
+        res.append(update)
+    return res
+
+
+def get_updates_response(number: int = 100) -> bytes:
+    """Get a raw response of getUpdates."""
+    return json.dumps({'ok': True, 'result': updates(number)}).encode('utf-8')
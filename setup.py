@@ -17,7 +17,6 @@ with open('README.md', 'r', 'utf-8') as f:
 
 requirements = [
     'prettyprinter',
-    'jsonpickle',
     'requests',
 ]
 
@@ -1,16 +1,24 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2019 Dzmitry Maliuzhenets; MIT License
 """Module containing wrapper around Telegram Bot Api methods."""
-import inspect
+import copy
 import io
+import sys
 from typing import BinaryIO
 
-import requests
-
-import telegrambotapiwrapper.frames as frames
-from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper.annotation import type_node
+from telegrambotapiwrapper.callplan import CallPlan, get_plan_by_code
+from telegrambotapiwrapper.callplan import tg_method_name
+from telegrambotapiwrapper.decoders import Decoders
+from telegrambotapiwrapper.download import CHUNK_SIZE, Downloader
+from telegrambotapiwrapper.filecache import FileIdCache, cached_upload
 from telegrambotapiwrapper.request import json_payload
+from telegrambotapiwrapper.response import RESULT_BYTES, RESULT_DICT
+from telegrambotapiwrapper.response import RESULT_FORMATS, RESULT_OBJECTS
+from telegrambotapiwrapper.response import get_result, get_result_bytes
 from telegrambotapiwrapper.response import handle_response
+from telegrambotapiwrapper.retry import RetryPolicy
+from telegrambotapiwrapper.transport import Transport
 from telegrambotapiwrapper.typelib import *
 from telegrambotapiwrapper.typelib import (
     PassportElementErrorDataField, PassportElementErrorFrontSide,
@@ -54,75 +62,133 @@ InlineQueryResult = Union[
 class ApiBase:  # pylint: disable=too-few-public-methods
     """This class contains methods that are not methods Telegram Bot Api."""
 
-    def __init__(self, token: str, proxy: Optional[dict] = None):
+    def __init__(self, token: str, proxy: Optional[dict] = None,
+                 transport: Optional[Transport] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 file_cache: Optional[FileIdCache] = None,
+                 decoders: Optional[Decoders] = None,
+                 result_format: str = RESULT_OBJECTS):
+        if result_format not in RESULT_FORMATS:
+            raise ValueError('result_format must be one of {}'.format(
+                ', '.join(RESULT_FORMATS)))
         self.token = token
         self.proxy = proxy
+        self.transport = transport if transport is not None else Transport()
+        self.retry_policy = retry_policy
+        self.file_cache = file_cache
+        self.decoders = decoders
+        self.result_format = result_format
 
     @staticmethod
     def _get_tg_api_method_name(py_style_method_name):
         """Get Telegram API method name from python method name."""
-        res = py_style_method_name.replace("_", " ").title().replace(" ", "")
-        res = res[0].lower() + res[1:]
-        return res
+        return tg_method_name(py_style_method_name)
 
     def _get_tg_api_method_url(self, api_method_name: str):
         """Get method url."""
         return "https://api.telegram.org/bot{}/{}".format(
             self.token, api_method_name)
 
-    @classmethod
-    def _get_caller_method_return_type(cls) -> AnnotationWrapper:
-        """Get caller return value annotation.
+    def _get_tg_file_url(self, file_path: str):
+        """Get url of the content of the file."""
+        return "https://api.telegram.org/file/bot{}/{}".format(
+            self.token, file_path)
 
-        Get the annotation of the return value of the method within which this
-        method is called.
+    def download_file(self, file, destination, chunk_size: int = CHUNK_SIZE):
+        """Download the content of the file.
 
-        Notes:
-            The result contains only the name of the type without the path to
-            it.
-        """
-        caller_method_name = inspect.stack()[1][3]
-        res = inspect.signature(getattr(cls,
-                                        caller_method_name)).return_annotation
-        return AnnotationWrapper(res).sanitized
-
-    def _get_caller2_return_type(self) -> AnnotationWrapper:
-        """Get caller caller return value annotation.
+        Args:
+            file (File, str): file returned by `get_file`, or any object with
+                `file_id` (e.g. Document, PhotoSize), or `file_id` itself
+            destination (str, os.PathLike, BinaryIO): path of the file to
+                write or a binary file object opened for writing
+            chunk_size (int): size of the chunks, in which the content is
+                streamed
 
         Notes:
-            The result contains only the name of the type without the path to
-            it.
+            1) See `download.Downloader` for concurrent downloads.
         """
-        caller2_name = (inspect.stack()[2][3])
-        signature = inspect.signature(getattr(self, caller2_name))
-        annotation = signature.return_annotation
-        anno_wrapper = AnnotationWrapper(annotation)
-        return anno_wrapper.sanitized
+        return Downloader(self, chunk_size=chunk_size).download(file,
+                                                                destination)
 
     def _make_post_request(self, url, **kwargs):
         if self.proxy:
-            return requests.post(url, proxy=self.proxy, **kwargs)
+            return self.transport.post(url, proxies=self.proxy, **kwargs)
         else:
-            return requests.post(url, **kwargs)
+            return self.transport.post(url, **kwargs)
 
     def _make_request(self):
-        """Make a request to Telegram Bot Api."""
-        args = frames.outer2_args()
+        """Make a request to Telegram Bot Api.
+
+        Notes:
+            1) Must be called directly from the `Api` method, the name of which
+               corresponds to the Telegram Bot Api method. The current values
+               of the caller parameters are the arguments of the request.
+            2) The caller is found by its code object, so after the first call
+               of a method its plan is taken from the cache.
+        """
+        caller = sys._getframe(1)  # pylint: disable=protected-access
+        plan = get_plan_by_code(type(self), caller.f_code)
+        return self._call(plan, plan.args(caller.f_locals))
 
-        result_type = self._get_caller2_return_type()
-        caller2_name = frames.outer2_name()
-        tg_method_name = self._get_tg_api_method_name(caller2_name)
+    def _get_call_args(self) -> dict:
+        """Get the arguments of the `Api` method, inside which it is called.
 
+        Notes:
+            1) The names of the parameters are taken from the method plan, so
+               unlike `frames.outer_args` the stack is not inspected.
+        """
+        caller = sys._getframe(1)  # pylint: disable=protected-access
+        return get_plan_by_code(type(self), caller.f_code).args(
+            caller.f_locals)
+
+    def _call(self, plan: CallPlan, args: dict):
+        """Make a request to Telegram Bot Api according to the plan."""
+        if self.retry_policy is None:
+            return self._request(plan, args)
+        return self.retry_policy.call(
+            lambda call_args: self._request(plan, call_args), args)
+
+    def _request(self, plan: CallPlan, args: dict):
+        """Send a single request to Telegram Bot Api."""
         payload = json_payload(args)
 
-        url = self._get_tg_api_method_url(tg_method_name)
+        url = self._get_tg_api_method_url(plan.tg_method_name)
 
         r = self._make_post_request(url,
                                     data=payload,
                                     headers={
                                         'Content-Type': 'application/json'},
                                     )
-        return handle_response(r.content.decode('utf-8'), result_type)
+        if self.decoders is None and self.result_format == RESULT_OBJECTS:
+            return plan.decode(r.content)
+        return self._decode(r.content, plan.result_type)
+
+    def _decode(self, raw_response: bytes, anno):
+        """Convert the raw response into the result of the method."""
+        if self.result_format == RESULT_BYTES:
+            return get_result_bytes(raw_response)
+        if self.result_format == RESULT_DICT:
+            return get_result(raw_response)
+        if self.decoders is None:
+            return handle_response(raw_response, anno)
+        return self.decoders.get(anno)(get_result(raw_response))
+
+    def with_result_format(self, result_format: str):
+        """Get a copy of the client, which returns the results in the format.
+
+        The copy shares the transport and the other settings, so it is cheap
+        to make one for a single call.
+
+        Example:
+            >>> raw = bot_api.with_result_format(RESULT_BYTES).get_updates()
+        """
+        if result_format not in RESULT_FORMATS:
+            raise ValueError('result_format must be one of {}'.format(
+                ', '.join(RESULT_FORMATS)))
+        api = copy.copy(self)
+        api.result_format = result_format
+        return api
 
 
 class Api(ApiBase):  # pylint: disable=too-many-public-methods
@@ -130,13 +196,41 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
 
     Args:
         token (str): token
+        proxy (dict): proxies in the format of `requests` library
+        transport (Transport): pool of connections, can be shared by several
+            instances; if not specified, the instance creates its own
+        retry_policy (RetryPolicy): policy of repeating unsuccessful requests
+            with `retry_after` or `migrate_to_chat_id`; by default the requests
+            are not repeated
+        file_cache (FileIdCache): cache of `file_id` of uploaded files; if
+            specified, the same content is uploaded only once and then sent
+            by `file_id`
+        decoders (Decoders): decoders of the results, e.g.
+            `slotted.decoders` to get the slotted variants of the api types;
+            by default the results are decoded into the types of `typelib`
+        result_format (str): RESULT_OBJECTS - api types, RESULT_DICT - parsed
+            json without decoding (keys are not renamed, e.g. `from`),
+            RESULT_BYTES - json bytes of the result sliced from the response;
+            see `response.decode_result` to decode them later
 
     Attributes:
         token (str): token
+        transport (Transport): pool of connections
+        retry_policy (RetryPolicy): policy of repeating unsuccessful requests
+        file_cache (FileIdCache): cache of `file_id` of uploaded files
+        decoders (Decoders): decoders of the results
+        result_format (str): format of the results
     """
 
-    def __init__(self, token: str, proxy: Optional[dict] = None):
-        super().__init__(token=token, proxy=proxy)
+    def __init__(self, token: str, proxy: Optional[dict] = None,
+                 transport: Optional[Transport] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 file_cache: Optional[FileIdCache] = None,
+                 decoders: Optional[Decoders] = None,
+                 result_format: str = RESULT_OBJECTS):
+        super().__init__(token=token, proxy=proxy, transport=transport,
+                         retry_policy=retry_policy, file_cache=file_cache,
+                         decoders=decoders, result_format=result_format)
 
     def set_chat_photo(
             self,
@@ -149,7 +243,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            Returns True on success."""
 
         url = self._get_tg_api_method_url('setChatPhoto')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         del values['photo']
         files = {'photo': photo}
@@ -158,8 +252,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                     files=files,
                                     data=values,
                                     )
-        return handle_response(
-            r.content.decode('utf-8'), AnnotationWrapper('bool'))
+        return self._decode(
+            r.content, type_node('bool'))
 
     def set_chat_permissions(
             self,
@@ -172,6 +266,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
         True on success."""
         return self._make_request()
 
+    @cached_upload('sticker')
     def send_sticker(
             self,
             chat_id: Union[int, str],
@@ -187,7 +282,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            is returned."""
 
         url = self._get_tg_api_method_url('sendSticker')
-        values = frames.outer_args()
+        values = self._get_call_args()
         del values['sticker']
 
         if isinstance(sticker, str):
@@ -201,8 +296,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         data=values,
                                         )
 
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('Message'))
+            return self._decode(
+                r.content, type_node('Message'))
 
     def add_sticker_to_set(
             self,
@@ -223,7 +318,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
             if isinstance(png_sticker, str):
                 return self._make_request()
             else:
-                values = frames.outer_args()
+                values = self._get_call_args()
                 del values['png_sticker']
                 files = {'png_sticker': png_sticker}
 
@@ -231,10 +326,10 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('bool'))
+                return self._decode(
+                    r.content, type_node('bool'))
         else:
-            values = frames.outer_args()
+            values = self._get_call_args()
             files = {}
 
             del values['tgs_sticker']
@@ -245,8 +340,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('bool'))
+                return self._decode(
+                    r.content, type_node('bool'))
             else:
                 del values['png_sticker']
                 files['png_sticker'] = png_sticker
@@ -254,8 +349,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('bool'))
+                return self._decode(
+                    r.content, type_node('bool'))
 
     def create_new_sticker_set(
             self,
@@ -279,7 +374,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
             if isinstance(png_sticker, str):
                 return self._make_request()
             else:
-                values = frames.outer_args()
+                values = self._get_call_args()
                 del values['png_sticker']
                 files = {'png_sticker': png_sticker}
 
@@ -287,11 +382,11 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('bool'))
+                return self._decode(
+                    r.content, type_node('bool'))
 
         if tgs_sticker is not None:
-            values = frames.outer_args()
+            values = self._get_call_args()
             del values['tgs_sticker']
             files = {'tgs_sticker': tgs_sticker}
 
@@ -299,8 +394,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         files=files,
                                         data=values,
                                         )
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('bool'))
+            return self._decode(
+                r.content, type_node('bool'))
 
     def upload_sticker_file(
             self,
@@ -312,7 +407,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            multiple times). Returns the uploaded File on success."""
 
         url = self._get_tg_api_method_url('uploadStickerFile')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         del values['png_sticker']
         files = {'png_sticker': png_sticker}
@@ -321,8 +416,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                     files=files,
                                     data=values,
                                     )
-        return handle_response(
-            r.content.decode('utf-8'), AnnotationWrapper('File'))
+        return self._decode(
+            r.content, type_node('File'))
 
     def set_webhook(
             self,
@@ -339,8 +434,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            serialized Update. In case of an unsuccessful request, we will give up
            after a reasonable amount of attempts. Returns True on success."""
         if certificate is not None:
+            values = self._get_call_args()
             url = self._get_tg_api_method_url('setWebhook')
-            values = frames.outer_args()
 
             del values['certificate']
             files = {'certificate': certificate}
@@ -349,11 +444,12 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         files=files,
                                         data=values,
                                         )
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('bool'))
+            return self._decode(
+                r.content, type_node('bool'))
         else:
             return self._make_request()
 
+    @cached_upload('audio')
     def send_audio(
             self,
             chat_id: Union[int, str],
@@ -379,7 +475,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            in the future."""
 
         url = self._get_tg_api_method_url('sendAudio')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         if thumb is not None:
             if isinstance(audio, str) and isinstance(thumb, str):
@@ -393,8 +489,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             elif isinstance(audio, str) and isinstance(thumb, io.BytesIO):
                 del values['thumb']
@@ -404,8 +500,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             else:
                 # assert isinstance(audio, io.BytesIO) and isinstance(thumb, io.BytesIO)
@@ -416,8 +512,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
         else:
 
             if isinstance(audio, str):
@@ -432,9 +528,10 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
+    @cached_upload('photo')
     def send_photo(
             self,
             chat_id: Union[int, str],
@@ -453,7 +550,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            returned."""
 
         url = self._get_tg_api_method_url('sendPhoto')
-        values = frames.outer_args()
+        values = self._get_call_args()
         del values['photo']
 
         if isinstance(photo, str):
@@ -465,8 +562,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         files=files,
                                         data=values,
                                         )
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('Message'))
+            return self._decode(
+                r.content, type_node('Message'))
 
     def answer_callback_query(
             self,
@@ -877,6 +974,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
 
         return self._make_request()
 
+    @cached_upload('animation')
     def send_animation(
             self,
             chat_id: Union[int, str],
@@ -901,7 +999,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            may be changed in the future."""
 
         url = self._get_tg_api_method_url('sendAnimation')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         if thumb is not None:
             if isinstance(animation, str) and isinstance(thumb, str):
@@ -915,8 +1013,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             elif isinstance(animation, str) and isinstance(thumb, io.BytesIO):
                 del values['thumb']
@@ -926,8 +1024,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             else:
                 # assert isinstance(audio, io.BytesIO) and isinstance(thumb, io.BytesIO)
@@ -938,8 +1036,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
         else:
 
             if isinstance(animation, str):
@@ -954,8 +1052,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
     def send_chat_action(
             self,
@@ -988,6 +1086,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
 
         return self._make_request()
 
+    @cached_upload('document')
     def send_document(
             self,
             chat_id: Union[int, str],
@@ -1009,7 +1108,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            MB in size, this limit may be changed in the future."""
 
         url = self._get_tg_api_method_url('sendDocument')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         if thumb is not None:
             if isinstance(document, str) and isinstance(thumb, str):
@@ -1023,8 +1122,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             elif isinstance(document, str) and isinstance(thumb, io.BytesIO):
                 del values['thumb']
@@ -1034,8 +1133,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             else:
                 # assert isinstance(audio, io.BytesIO) and isinstance(thumb, io.BytesIO)
@@ -1046,8 +1145,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
         else:
 
             if isinstance(document, str):
@@ -1062,8 +1161,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
     def send_game(
             self,
@@ -1213,6 +1312,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
 
         return self._make_request()
 
+    @cached_upload('video')
     def send_video(
             self,
             chat_id: Union[int, str],
@@ -1238,7 +1338,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            MB in size, this limit may be changed in the future."""
 
         url = self._get_tg_api_method_url('sendVideo')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         if thumb is not None:
             if isinstance(video, str) and isinstance(thumb, str):
@@ -1252,8 +1352,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             elif isinstance(video, str) and isinstance(thumb, io.BytesIO):
                 del values['thumb']
@@ -1263,8 +1363,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             else:
                 # assert isinstance(audio, io.BytesIO) and isinstance(thumb, io.BytesIO)
@@ -1275,8 +1375,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
         else:
 
             if isinstance(video, str):
@@ -1291,9 +1391,10 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             data=values,
                                             )
 
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
+    @cached_upload('video_note')
     def send_video_note(
             self,
             chat_id: Union[int, str],
@@ -1313,7 +1414,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            On success, the sent Message is returned."""
 
         url = self._get_tg_api_method_url('sendVideoNote')
-        values = frames.outer_args()
+        values = self._get_call_args()
 
         if thumb is not None:
             if isinstance(video_note, str) and isinstance(thumb, str):
@@ -1327,8 +1428,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             elif isinstance(video_note, str) and isinstance(thumb, io.BytesIO):
                 del values['thumb']
@@ -1338,8 +1439,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
             else:
                 # assert isinstance(audio, io.BytesIO) and isinstance(thumb, io.BytesIO)
@@ -1350,8 +1451,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
         else:
 
             if isinstance(video_note, str):
@@ -1366,9 +1467,10 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                             files=files,
                                             data=values,
                                             )
-                return handle_response(
-                    r.content.decode('utf-8'), AnnotationWrapper('Message'))
+                return self._decode(
+                    r.content, type_node('Message'))
 
+    @cached_upload('voice')
     def send_voice(
             self,
             chat_id: Union[int, str],
@@ -1392,7 +1494,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
            this limit may be changed in the future."""
 
         url = self._get_tg_api_method_url('sendVoice')
-        values = frames.outer_args()
+        values = self._get_call_args()
         del values['voice']
 
         if isinstance(voice, str):
@@ -1405,8 +1507,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         files=files,
                                         data=values,
                                         )
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('Message'))
+            return self._decode(
+                r.content, type_node('Message'))
 
     def set_chat_description(
             self,
@@ -1589,7 +1691,7 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
             return self._make_request()
 
         else:
-            values = frames.outer_args()
+            values = self._get_call_args()
             del values['thumb']
             files = {'thumb': thumb}
 
@@ -1598,8 +1700,8 @@ class Api(ApiBase):  # pylint: disable=too-many-public-methods
                                         files=files,
                                         data=values,
                                         )
-            return handle_response(
-                r.content.decode('utf-8'), AnnotationWrapper('bool'))
+            return self._decode(
+                r.content, type_node('bool'))
 
     def log_out(self) -> bool:
         """Use this method to log out from the cloud Bot API server before launching the bot locally. You must log out
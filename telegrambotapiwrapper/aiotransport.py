@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Non-blocking HTTP/1.1 transport with a pool of keep-alive connections.
+
+The transport is built on asyncio streams only and implements the part of
+HTTP/1.1, that is needed to talk to Telegram Bot Api: requests with a body of
+known length and responses with `Content-Length` or chunked body.
+
+Example:
+    >>> transport = AsyncTransport(pool_maxsize=100)
+    >>> response = await transport.request(
+    ...     'POST', 'https://api.telegram.org/bot<token>/getMe')
+    >>> response.status
+    200
+"""
+
+import asyncio
+import ssl
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from telegrambotapiwrapper.transport import TransportStats
+
+
+class AsyncResponse:  # pylint: disable=too-few-public-methods
+    """Response to a request.
+
+    Attributes:
+        status (int): status code
+        headers (Dict[str, str]): headers with lowercase names
+        content (bytes): body
+    """
+
+    __slots__ = ('status', 'headers', 'content')
+
+    def __init__(self, status: int, headers: Dict[str, str], content: bytes):
+        self.status = status
+        self.headers = headers
+        self.content = content
+
+
+class _Connection:
+    """Opened connection to a host."""
+
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def is_closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+_Key = Tuple[str, str, int]  # scheme, host, port
+
+
+class AsyncTransport:
+    """Pool of non-blocking keep-alive HTTP connections.
+
+    Args:
+        pool_maxsize (int): maximum number of connections to one host; extra
+            requests wait for a free connection
+        keep_alive (bool): keep connections open between requests
+        timeout (float): timeout of requests in seconds, None means no timeout
+        ssl_context (ssl.SSLContext): context for https connections
+
+    Attributes:
+        stats (TransportStats): counters of requests and connections
+    """
+
+    def __init__(self,
+                 pool_maxsize: int = 10,
+                 keep_alive: bool = True,
+                 timeout: Optional[float] = None,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.stats = TransportStats()
+        self._idle: Dict[_Key, List[_Connection]] = defaultdict(list)
+        self._limits: Dict[_Key, asyncio.Semaphore] = {}
+
+    def _limit(self, key: _Key) -> asyncio.Semaphore:
+        try:
+            return self._limits[key]
+        except KeyError:
+            limit = asyncio.Semaphore(self.pool_maxsize)
+            self._limits[key] = limit
+            return limit
+
+    async def _connect(self, key: _Key) -> _Connection:
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port,
+                                                       ssl=context)
+        return _Connection(reader, writer)
+
+    def _get_idle(self, key: _Key) -> Optional[_Connection]:
+        idle = self._idle[key]
+        while idle:
+            conn = idle.pop()
+            if not conn.is_closed:
+                return conn
+            conn.close()
+        return None
+
+    async def request(self, method: str, url: str, body: bytes = b'',
+                      headers: Optional[Dict[str, str]] = None
+                      ) -> AsyncResponse:
+        """Send a request over the pooled connections."""
+        coro = self._request(method, url, body, headers or {})
+        if self.timeout is None:
+            return await coro
+        return await asyncio.wait_for(coro, self.timeout)
+
+    async def _request(self, method: str, url: str, body: bytes,
+                       headers: Dict[str, str]) -> AsyncResponse:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        head = self._head(method, path, parts.netloc, body, headers)
+
+        self.stats.count_request()
+        async with self._limit(key):
+            conn = self._get_idle(key)
+            if conn is not None:
+                self.stats.count_attempt(reused=True)
+                try:
+                    return await self._exchange(key, conn, head, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # the server has closed the idle connection, the
+                    # request is repeated over a new one
+                    conn.close()
+            conn = await self._connect(key)
+            self.stats.count_attempt(reused=False)
+            return await self._exchange(key, conn, head, body)
+
+    def _head(self, method: str, path: str, host: str, body: bytes,
+              headers: Dict[str, str]) -> bytes:
+        lines = ['{} {} HTTP/1.1'.format(method, path),
+                 'Host: {}'.format(host),
+                 'Content-Length: {}'.format(len(body)),
+                 'Connection: {}'.format(
+                     'keep-alive' if self.keep_alive else 'close')]
+        lines.extend('{}: {}'.format(k, v) for k, v in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _exchange(self, key: _Key, conn: _Connection, head: bytes,
+                        body: bytes) -> AsyncResponse:
+        try:
+            conn.writer.write(head + body)
+            await conn.writer.drain()
+            response, reusable = await _read_response(conn.reader)
+        except BaseException:
+            conn.close()
+            raise
+        if reusable and self.keep_alive:
+            self._idle[key].append(conn)
+        else:
+            conn.close()
+        return response
+
+    async def close(self):
+        """Close all idle connections."""
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+            idle.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        if line == b'\r\n':
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+        if size == 0:
+            await _read_headers(reader)  # trailer
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_response(reader: asyncio.StreamReader
+                         ) -> Tuple[AsyncResponse, bool]:
+    """Read a response.
+
+    Returns:
+        (AsyncResponse, bool): the response and whether the connection can be
+            used for the next request
+    """
+    status_line = await reader.readuntil(b'\r\n')
+    version, status = status_line.split(b' ', 2)[:2]
+    headers = await _read_headers(reader)
+    reusable = (version == b'HTTP/1.1'
+                and headers.get('connection', '').lower() != 'close')
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        content = await _read_chunked(reader)
+    elif 'content-length' in headers:
+        content = await reader.readexactly(int(headers['content-length']))
+    else:
+        content = await reader.read()
+        reusable = False
+    return AsyncResponse(int(status), headers, content), reusable
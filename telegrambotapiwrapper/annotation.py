@@ -14,13 +14,23 @@ Example:
     False
     >>> anno.inner_part_of_list
     'InlineKeyboardButton'
+
+    Annotations parsed once into cached type nodes:
+
+    >>> from telegrambotapiwrapper.annotation import type_node
+    >>> node = type_node('Optional[List[PhotoSize]]')
+    >>> node.is_optional, node.inner.is_list, node.inner.inner.name
+    (True, True, 'PhotoSize')
+    >>> node is type_node('typing.Optional[typing.List[PhotoSize]]')
+    True
 """
 
 from __future__ import annotations
 
 import re
+import threading
 from collections import UserString
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 
 class AnnotationWrapper(UserString):  # pylint: disable=R0901
@@ -229,3 +239,142 @@ class AnnotationWrapper(UserString):  # pylint: disable=R0901
                 Optional[Union[InputFile, str]] -> False,
         """
         return bool(AnnotationWrapper.union_field_re.match(self.data))
+
+
+SIMPLE = 'simple'  # int, bool, float, str
+CLASS = 'class'  # api type, e.g. User
+OPTIONAL = 'optional'
+LIST = 'list'
+UNION = 'union'
+
+SIMPLE_TYPE_NAMES = frozenset(('int', 'bool', 'float', 'str'))
+
+
+class TypeNode:
+    """Parsed annotation.
+
+    Nodes are immutable and interned: `type_node` returns the same node for
+    the same annotation, so the checks of the annotation are attribute reads.
+
+    Attributes:
+        text (str): sanitized annotation, e.g. 'Optional[List[PhotoSize]]'
+        kind (str): SIMPLE, CLASS, OPTIONAL, LIST or UNION
+        name (str): name of the type for SIMPLE and CLASS nodes
+        inner (TypeNode): inner type of OPTIONAL and LIST nodes
+        members (Tuple[TypeNode]): types of UNION node
+        is_optional, is_list, is_list_of_list, is_union, is_simple,
+        is_simple_in_opt_and_not_opt (bool): the same as the properties of
+            `AnnotationWrapper`
+    """
+
+    __slots__ = ('text', 'kind', 'name', 'inner', 'members', 'is_optional',
+                 'is_list', 'is_list_of_list', 'is_union', 'is_simple',
+                 'is_simple_in_opt_and_not_opt')
+
+    def __init__(self, text: str, kind: str, name: Optional[str] = None,
+                 inner: Optional[TypeNode] = None,
+                 members: Tuple[TypeNode, ...] = ()):
+        is_list_of_list = kind == LIST and inner.kind == LIST
+        is_simple = kind == SIMPLE
+        values = {
+            'text': text,
+            'kind': kind,
+            'name': name,
+            'inner': inner,
+            'members': members,
+            'is_optional': kind == OPTIONAL,
+            'is_list': kind == LIST and not is_list_of_list,
+            'is_list_of_list': is_list_of_list,
+            'is_union': kind == UNION,
+            'is_simple': is_simple,
+            'is_simple_in_opt_and_not_opt': is_simple or (
+                kind == OPTIONAL and inner.is_simple),
+        }
+        for attr, value in values.items():
+            object.__setattr__(self, attr, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(
+            self.__class__.__name__))
+
+    __delattr__ = __setattr__
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return "{}('{}')".format(self.__class__.__name__, self.text)
+
+
+def sanitize(anno: str) -> str:
+    """Remove the module paths from the annotation.
+
+    Notes:
+        1) The same as `AnnotationWrapper.sanitized`.
+    """
+    return anno.replace('typing.', ''). \
+        replace('telegrambotapiwrapper.typelib.', ''). \
+        replace("<class '", ""). \
+        replace("'>", "")
+
+
+def _split_args(text: str) -> List[str]:
+    """Split the arguments of a generic type at the top-level commas."""
+    args, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == ',' and not depth:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return args
+
+
+_GENERICS = (('Optional[', OPTIONAL), ('List[', LIST), ('Union[', UNION))
+
+_nodes: Dict[str, TypeNode] = {}  # sanitized or raw annotation -> node
+_nodes_lock = threading.Lock()
+
+
+def _parse(text: str) -> TypeNode:
+    for prefix, kind in _GENERICS:
+        if text.startswith(prefix) and text.endswith(']'):
+            inner = text[len(prefix):-1]
+            if kind == UNION:
+                return TypeNode(text, kind, members=tuple(
+                    type_node(arg) for arg in _split_args(inner)))
+            return TypeNode(text, kind, inner=type_node(inner))
+    kind = SIMPLE if text in SIMPLE_TYPE_NAMES else CLASS
+    return TypeNode(text, kind, name=text)
+
+
+def type_node(anno) -> TypeNode:
+    """Get the parsed annotation.
+
+    Args:
+        anno (str, AnnotationWrapper, TypeNode, type): annotation, e.g.
+            'Optional[User]', typing.Optional[User] or User
+
+    Returns:
+        (TypeNode): node, which is parsed once per annotation
+    """
+    if isinstance(anno, TypeNode):
+        return anno
+    key = anno if isinstance(anno, str) else str(anno)
+    try:
+        return _nodes[key]
+    except KeyError:
+        pass
+    text = sanitize(key)
+    with _nodes_lock:
+        node = _nodes.get(text)
+    if node is None:
+        node = _parse(text)
+    with _nodes_lock:
+        # the first node stored for the text wins, so nodes stay interned
+        node = _nodes.setdefault(text, node)
+        _nodes[key] = node
+    return node
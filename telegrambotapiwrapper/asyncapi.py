@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Asyncio client of Telegram Bot Api.
+
+`AsyncApi` has the same methods as `telegrambotapiwrapper.Api`, but they are
+coroutines, and the requests are sent over a non-blocking pool of connections.
+The types of the arguments and the results are the types from `typelib`.
+
+Example:
+    >>> from telegrambotapiwrapper.asyncapi import AsyncApi
+    >>> async with AsyncApi(token="<paste your token here>") as bot_api:
+    ...     await bot_api.send_message(chat_id=-321532153215, text="Hello")
+"""
+
+import inspect
+import os
+from typing import Optional
+
+from urllib3.filepost import encode_multipart_formdata
+
+from telegrambotapiwrapper import Api, jsoncodec
+from telegrambotapiwrapper.aiotransport import AsyncTransport
+from telegrambotapiwrapper.callplan import CallPlan, get_call_plan
+from telegrambotapiwrapper.request import json_payload, to_jsonable
+from telegrambotapiwrapper.response import get_result
+
+
+def is_file(value) -> bool:
+    """Is the value a file to upload, e.g. an opened file or io.BytesIO."""
+    return hasattr(value, 'read')
+
+
+def multipart_payload(values: dict, files: dict):
+    """Get the body and the content type of multipart/form-data request.
+
+    Notes:
+        1) Values, that are not strings, are sent as json, e.g. reply_markup.
+    """
+    fields = {}
+    for name, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            fields[name] = value
+        else:
+            fields[name] = jsoncodec.dumps(to_jsonable(value)).decode('utf-8')
+    for name, file in files.items():
+        filename = os.path.basename(str(getattr(file, 'name', name)))
+        fields[name] = (filename, file.read())
+    return encode_multipart_formdata(fields)
+
+
+class AsyncApiBase:
+    """This class contains methods of `AsyncApi`, that are not methods of
+    Telegram Bot Api."""
+
+    def __init__(self, token: str,
+                 transport: Optional[AsyncTransport] = None):
+        self.token = token
+        self.transport = (transport if transport is not None
+                          else AsyncTransport())
+
+    def _get_tg_api_method_url(self, api_method_name: str):
+        """Get method url."""
+        return "https://api.telegram.org/bot{}/{}".format(
+            self.token, api_method_name)
+
+    async def _call(self, plan: CallPlan, args: dict):
+        """Make a request to Telegram Bot Api according to the plan."""
+        files = {name: value for name, value in args.items()
+                 if is_file(value)}
+        if files:
+            values = {name: value for name, value in args.items()
+                      if name not in files}
+            body, content_type = multipart_payload(values, files)
+        else:
+            body, content_type = json_payload(args), 'application/json'
+        response = await self.transport.request(
+            'POST', self._get_tg_api_method_url(plan.tg_method_name),
+            body=body, headers={'Content-Type': content_type})
+        return plan.decoder(get_result(response.content))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # not self.close(), it is the method `close` of Telegram Bot Api
+        await self.transport.close()
+
+
+def _bind(plan: CallPlan, required: frozenset, args: tuple,
+          kwargs: dict) -> dict:
+    """Get the arguments of the call as name: value pairs."""
+    if len(args) > len(plan.param_names):
+        raise TypeError('{}() takes {} positional arguments but {} were given'
+                        .format(plan.name, len(plan.param_names), len(args)))
+    values = dict(zip(plan.param_names, args))
+    for name, value in kwargs.items():
+        if name not in plan.param_names:
+            raise TypeError("{}() got an unexpected keyword argument '{}'"
+                            .format(plan.name, name))
+        if name in values:
+            raise TypeError("{}() got multiple values for argument '{}'"
+                            .format(plan.name, name))
+        values[name] = value
+    missing = required.difference(values)
+    if missing:
+        raise TypeError('{}() missing required arguments: {}'.format(
+            plan.name, ', '.join(sorted(missing))))
+    return values
+
+
+def _make_method(func):
+    """Make a coroutine method of `AsyncApi` from the method of `Api`."""
+    plan = get_call_plan(Api, func.__name__)
+    signature = inspect.signature(func)
+    required = frozenset(
+        name for name, param in signature.parameters.items()
+        if name != 'self' and param.default is inspect.Parameter.empty)
+
+    async def method(self, *args, **kwargs):
+        return await self._call(plan, _bind(plan, required, args, kwargs))
+
+    method.__name__ = func.__name__
+    method.__qualname__ = 'AsyncApi.' + func.__name__
+    method.__doc__ = func.__doc__
+    method.__signature__ = signature
+    return method
+
+
+class AsyncApi(AsyncApiBase):
+    """Class containing coroutine methods of Telegram Bot Api.
+
+    Args:
+        token (str): token
+        transport (AsyncTransport): pool of connections, can be shared by
+            several instances; if not specified, the instance creates its own
+
+    Notes:
+        1) Methods accept files (opened files, io.BytesIO) in the same
+           arguments as the methods of `Api`.
+        2) Proxies are not supported.
+    """
+
+
+for _name, _func in vars(Api).items():
+    if not _name.startswith('_') and inspect.isfunction(_func):
+        setattr(AsyncApi, _name, _make_method(_func))
+del _name, _func
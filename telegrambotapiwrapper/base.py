@@ -4,19 +4,88 @@
 
 import dataclasses
 from importlib import import_module
-from typing import List, Optional, Dict
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
 
 import prettyprinter
 
-from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper.annotation import type_node
 
 extra_module = import_module('telegrambotapiwrapper.printpretty')
 extra_module.install()
 
 
+class ClassInfo:  # pylint: disable=too-few-public-methods
+    """Metadata of an api type, computed once per class.
+
+    All the containers are read-only.
+
+    Attributes:
+        fields_names (Tuple[str]): names of the dataclass fields
+        annotations (Mapping[str, str]): field name: annotation
+        used_annotations (FrozenSet[str]): all used annotations
+        simple_fields (Mapping[str, str]): fields that are int, str, bool,
+            float, optional or not
+        not_simple_fields (Mapping[str, str]): the other fields
+        is_simple_type (bool): whether all the fields are simple
+    """
+
+    __slots__ = ('fields_names', 'annotations', 'used_annotations',
+                 'simple_fields', 'not_simple_fields', 'is_simple_type')
+
+    def __init__(self, cls: type):
+        annotations = {field.name: field.type
+                       for field in dataclasses.fields(cls)}
+        simple = {name: anno for name, anno in annotations.items()
+                  if type_node(anno).is_simple_in_opt_and_not_opt}
+        self.fields_names: Tuple[str, ...] = tuple(annotations)
+        self.annotations: Mapping[str, str] = MappingProxyType(annotations)
+        self.used_annotations: FrozenSet[str] = frozenset(
+            annotations.values())
+        self.simple_fields: Mapping[str, str] = MappingProxyType(simple)
+        self.not_simple_fields: Mapping[str, str] = MappingProxyType(
+            {name: anno for name, anno in annotations.items()
+             if name not in simple})
+        self.is_simple_type: bool = len(simple) == len(annotations)
+
+
+_class_infos: Dict[type, ClassInfo] = {}
+_types_by_module: Dict[str, Dict[str, type]] = {}
+
+
+def class_info(cls: type) -> ClassInfo:
+    """Get the metadata of the api type, computing it on the first call."""
+    try:
+        return _class_infos[cls]
+    except KeyError:
+        info = _class_infos[cls] = ClassInfo(cls)
+        return info
+
+
+def types_by_name(module) -> Mapping[str, type]:
+    """Get the api types defined in the module by their names.
+
+    Args:
+        module (module, str): module or its name, e.g. `typelib`
+
+    Notes:
+        1) Every subclass of `Base` is registered in the module of its
+           definition when it is created, so the map is a read-only view of
+           the registry, not the result of a scan of the module.
+    """
+    name = module if isinstance(module, str) else module.__name__
+    return MappingProxyType(_types_by_module.setdefault(name, {}))
+
+
 class Base:  # pylint: disable=R0903
     """Base class for all types of APIs."""
 
+    __slots__ = ()  # so the slotted variants of the api types have no __dict__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _types_by_module.setdefault(cls.__module__, {})[cls.__name__] = cls
+
     def __str__(self):
         return prettyprinter.pformat(self).replace(
             "telegrambotapiwrapper.typelib.", "")
@@ -27,20 +96,16 @@ class Base:  # pylint: disable=R0903
         return cls.__name__
 
     @classmethod
-    def _get_simple_fields(cls) -> dict:
+    def _get_simple_fields(cls) -> Mapping[str, str]:
         """Get the dataclass fields that are int, str, bool, float.
 
         Note:
             1) It does not matter whether the field is optional or not.
         """
-        return {
-            name: tp
-            for name, tp in cls._annotations().items()
-            if AnnotationWrapper(tp).is_simple_in_opt_and_not_opt
-        }
+        return class_info(cls).simple_fields
 
     @classmethod
-    def _get_not_simple_fields(cls) -> Dict[str, str]:
+    def _get_not_simple_fields(cls) -> Mapping[str, str]:
         """Get fields that are not int, bool, str, float.
 
         Notes:
@@ -60,11 +125,7 @@ class Base:  # pylint: disable=R0903
                     {'thumb': 'Optional[PhotoSize]'}
         """
 
-        return {
-            name: anno
-            for name, anno in cls._annotations().items()
-            if not AnnotationWrapper(anno).is_simple_in_opt_and_not_opt
-        }
+        return class_info(cls).not_simple_fields
 
     @classmethod
     def _is_simple_type(cls):
@@ -98,13 +159,10 @@ class Base:  # pylint: disable=R0903
                 Returns:
                     False
             """
-        return all([
-            AnnotationWrapper(anno).is_simple_in_opt_and_not_opt
-            for anno in cls._used_annotations()
-        ])
+        return class_info(cls).is_simple_type
 
     @classmethod
-    def _fields_names(cls) -> List:
+    def _fields_names(cls) -> Tuple[str, ...]:
         """Get a list of dataclass fields names.
 
 
@@ -119,13 +177,13 @@ class Base:  # pylint: disable=R0903
                 language_code: Optional[str] = None
 
             Returns:
-                ['id', 'is_bot', 'first_name', 'last_name', 'username',
-                'language_code']
+                ('id', 'is_bot', 'first_name', 'last_name', 'username',
+                'language_code')
         """
-        return list(field.name for field in dataclasses.fields(cls))
+        return class_info(cls).fields_names
 
     @classmethod
-    def _annotations(cls) -> dict:
+    def _annotations(cls) -> Mapping[str, str]:
         """Get annotations.
 
         Example:
@@ -145,10 +203,10 @@ class Base:  # pylint: disable=R0903
                       'username': 'Optional[str]',
                       'language_code': 'Optional[str]'}
         """
-        return {field.name: field.type for field in dataclasses.fields(cls)}
+        return class_info(cls).annotations
 
     @classmethod
-    def _used_annotations(cls) -> set:
+    def _used_annotations(cls) -> FrozenSet[str]:
         """Get all used annotations.
 
         Example:
@@ -161,9 +219,9 @@ class Base:  # pylint: disable=R0903
                 username: Optional[str] = None
                 language_code: Optional[str] = None
 
-            Returns: {'int', 'str', 'bool', 'Optional[str]'}
+            Returns: frozenset({'int', 'str', 'bool', 'Optional[str]'})
         """
-        return set(field.type for field in dataclasses.fields(cls))
+        return class_info(cls).used_annotations
 
     @classmethod
     def _field_type(cls, field_name: str) -> Optional[str]:
@@ -174,10 +232,7 @@ class Base:  # pylint: disable=R0903
         Returns:
             (str): field annotation
         """
-        for field in dataclasses.fields(cls):
-            if field.name == field_name:
-                return field.type
-        return None
+        return class_info(cls).annotations.get(field_name)
 
     @property
     def _fields_items(self) -> dict:
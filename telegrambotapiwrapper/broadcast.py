@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Sending one message to a very large list of chats.
+
+`Broadcast` streams through the chat ids, sends the message to every chat
+with a bounded number of concurrent requests within the global rate limit of
+Telegram and records the outcome for every recipient. With a checkpoint file
+an interrupted broadcast is resumed: the chats, whose final outcome has been
+recorded, are skipped, the chats, whose sending failed for a network error
+or a server error, are sent again.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> broadcast = Broadcast(Api(token="<paste your token here>"),
+    ...                       checkpoint='announcement.log')
+    >>> stats = broadcast.run(subscriber_ids, text="Hello")
+    >>> stats.sent, stats.blocked
+    (199211, 789)
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.outbox import TokenBucket
+from telegrambotapiwrapper.retry import ChatMigrations, chat_migrations
+from telegrambotapiwrapper.retry import error_parameters
+
+SENT = 'sent'
+BLOCKED = 'blocked'  # the bot was blocked or kicked, the user is deactivated
+MIGRATED = 'migrated'  # sent to the supergroup the group was migrated to
+FAILED = 'failed'
+
+OUTCOMES = (SENT, BLOCKED, MIGRATED, FAILED)
+
+
+def _is_final(exc: UnsuccessfulRequest) -> bool:
+    """Does sending again make no sense after the error, e.g. a bad request,
+    unlike after a server error or flooding."""
+    error_code = getattr(exc, 'error_code', None)
+    return (isinstance(error_code, int) and 400 <= error_code < 500
+            and error_code != 429)
+
+
+class Checkpoint:
+    """Append-only log of the outcomes of a broadcast.
+
+    Every line is a json array `[chat_id, outcome, detail]`, the lines are
+    flushed as soon as they are written.
+
+    Args:
+        path (str): path of the file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> Dict[Union[int, str], str]:
+        """Read the recorded outcomes.
+
+        Returns:
+            (dict): chat_id: outcome
+
+        Notes:
+            1) A line broken by a crash is ignored, the chat is sent again.
+        """
+        outcomes = {}
+        if not os.path.exists(self.path):
+            return outcomes
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    chat_id, outcome, _ = json.loads(line)
+                except ValueError:
+                    continue
+                outcomes[chat_id] = outcome
+        return outcomes
+
+    def record(self, chat_id, outcome: str, detail=None):
+        """Append the outcome of sending to the chat."""
+        line = json.dumps([chat_id, outcome, detail], ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def _open(self):
+        file = open(self.path, 'a+b')
+        if file.tell():
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b'\n':
+                file.write(b'\n')  # terminate the line broken by a crash
+        file.close()
+        return open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class BroadcastStats:
+    """Counters of a running broadcast.
+
+    Args:
+        total (int): number of recipients, if known
+        clock (Callable): monotonic clock in seconds
+
+    Attributes:
+        total (int): number of recipients, None if unknown
+        skipped (int): recipients skipped since they are in the checkpoint
+        sent, blocked, migrated, failed (int): outcomes of this run
+    """
+
+    def __init__(self, total: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.total = total
+        self.skipped = 0
+        self.sent = 0
+        self.blocked = 0
+        self.migrated = 0
+        self.failed = 0
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def count(self, outcome: str):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    @property
+    def done(self) -> int:
+        """Recipients processed in this run."""
+        return self.sent + self.blocked + self.migrated + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the start of the run."""
+        return self._clock() - self._started
+
+    @property
+    def throughput(self) -> float:
+        """Recipients per second."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the end, None if unknown."""
+        if self.total is None:
+            return None
+        left = max(self.total - self.skipped - self.done, 0)
+        if not left:
+            return 0.0
+        throughput = self.throughput
+        return left / throughput if throughput > 0 else None
+
+    def __repr__(self):
+        return ('{}(total={}, skipped={}, sent={}, blocked={}, migrated={}, '
+                'failed={})'.format(self.__class__.__name__, self.total,
+                                    self.skipped, self.sent, self.blocked,
+                                    self.migrated, self.failed))
+
+
+class Broadcast:
+    """Sender of one message to many chats.
+
+    Args:
+        api (Api): client used to send the messages
+        method (str): `Api` method, e.g. 'send_message' or 'copy_message'
+        concurrency (int): maximum number of requests in flight
+        rate (float): messages per second for all the chats together
+        checkpoint (str): path of the checkpoint file, if the broadcast has
+            to be resumable
+        max_retries (int): maximum number of repeats after `retry_after`
+        migrations (ChatMigrations): map of migrated chats
+        clock (Callable): monotonic clock in seconds
+        sleep (Callable): function to sleep for the given seconds
+
+    Attributes:
+        stats (BroadcastStats): counters of the current run, can be read
+            from other threads while the broadcast is running
+
+    Notes:
+        1) Telegram answers to flooding with `retry_after` for the whole bot,
+           so it pauses all the sending, not only the chat.
+        2) Every chat gets one message, so per-chat limits do not apply.
+    """
+
+    def __init__(self, api,
+                 method: str = 'send_message',
+                 concurrency: int = 8,
+                 rate: float = 30,
+                 checkpoint: Optional[str] = None,
+                 max_retries: int = 3,
+                 migrations: ChatMigrations = chat_migrations,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.api = api
+        self.method = method
+        self.concurrency = concurrency
+        self.checkpoint = Checkpoint(checkpoint) if checkpoint else None
+        self.max_retries = max_retries
+        self.migrations = migrations
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = BroadcastStats(clock=clock)
+        self._bucket = TokenBucket(rate, rate, clock())
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        """Wait for a token of the global bucket."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                delay = self._bucket.delay(now)
+                if delay <= 0:
+                    self._bucket.consume(now)
+                    return
+            self.sleep(delay)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            self._bucket.pause(self.clock(), seconds)
+
+    def send(self, chat_id, template: dict):
+        """Send the message to one chat.
+
+        Returns:
+            (tuple): outcome and its detail (the new chat id for MIGRATED, the
+                description of the error for BLOCKED and FAILED)
+
+        Raises:
+            UnsuccessfulRequest: if the sending failed, but can succeed later,
+                e.g. a server error or flooding after `max_retries` repeats
+            Exception: the errors of the transport, e.g. a connection error
+        """
+        kwargs = dict(template, chat_id=self.migrations.get(chat_id))
+        outcome = SENT if kwargs['chat_id'] == chat_id else MIGRATED
+        retries = 0
+        while True:
+            try:
+                getattr(self.api, self.method)(**kwargs)
+            except UnsuccessfulRequest as exc:
+                parameters = error_parameters(exc)
+                if getattr(exc, 'error_code', None) == 403:
+                    return BLOCKED, exc.description
+                if retries >= self.max_retries or parameters is None:
+                    if not _is_final(exc):
+                        raise
+                    return FAILED, exc.description
+                if parameters.migrate_to_chat_id:
+                    self.migrations.add(kwargs['chat_id'],
+                                        parameters.migrate_to_chat_id)
+                    kwargs['chat_id'] = parameters.migrate_to_chat_id
+                    outcome = MIGRATED
+                elif parameters.retry_after:
+                    self._pause(parameters.retry_after)
+                    self._acquire()
+                elif not _is_final(exc):
+                    raise
+                else:
+                    return FAILED, exc.description
+                retries += 1
+            else:
+                return outcome, (kwargs['chat_id'] if outcome == MIGRATED
+                                 else None)
+
+    def _send_and_record(self, chat_id, template: dict,
+                         on_result: Optional[Callable]):
+        final = True
+        try:
+            outcome, detail = self.send(chat_id, template)
+        except Exception as exc:  # pylint: disable=broad-except
+            # not recorded, so the chat is sent again, when resumed
+            final = False
+            outcome, detail = FAILED, repr(exc)
+        if self.checkpoint is not None and final:
+            self.checkpoint.record(chat_id, outcome, detail)
+        self.stats.count(outcome)
+        if on_result is not None:
+            on_result(chat_id, outcome, detail)
+
+    def run(self, chat_ids: Iterable, total: Optional[int] = None,
+            on_result: Optional[Callable] = None,
+            **template) -> BroadcastStats:
+        """Send the message to all the chats.
+
+        Args:
+            chat_ids (Iterable): ids of the chats, e.g. a generator reading
+                them from a database; it is consumed lazily
+            total (int): number of the chats, if `chat_ids` has no len(); it
+                is used only to estimate the ETA
+            on_result (Callable): called with (chat_id, outcome, detail) for
+                every recipient, from the worker threads; the failures, which
+                are not final, e.g. connection errors, are reported with the
+                repr of the error as the detail and are not checkpointed
+            **template: arguments of the method except `chat_id`, e.g.
+                text='Hello'
+
+        Returns:
+            (BroadcastStats): counters of the run
+        """
+        if total is None and hasattr(chat_ids, '__len__'):
+            total = len(chat_ids)
+        self.stats = BroadcastStats(total, self.clock)
+        done = self.checkpoint.load() if self.checkpoint is not None else {}
+        in_flight = set()
+        try:
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                for chat_id in chat_ids:
+                    if chat_id in done:
+                        self.stats.skipped += 1
+                        continue
+                    if len(in_flight) >= self.concurrency:
+                        _, in_flight = wait(in_flight,
+                                            return_when=FIRST_COMPLETED)
+                    self._acquire()
+                    in_flight.add(executor.submit(
+                        self._send_and_record, chat_id, template, on_result))
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+        return self.stats
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Precompiled plans of calls to Telegram Bot Api methods.
+
+A call plan contains everything that is needed to turn a call of an `Api`
+method into a request: the name of the Telegram Bot Api method, the names of
+the parameters and the annotation of the result. Plans are built once, on the
+first call of a method, so the calls themselves do not inspect the stack or the
+signature of the method.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> plan = get_call_plan(Api, 'send_message')
+    >>> plan.tg_method_name
+    'sendMessage'
+    >>> plan.param_names[:2]
+    ('chat_id', 'text')
+"""
+
+import inspect
+from types import CodeType
+from typing import Dict, FrozenSet, Tuple, Union
+
+from telegrambotapiwrapper.annotation import TypeNode, type_node
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.response import get_result
+
+
+def tg_method_name(py_style_method_name: str) -> str:
+    """Get Telegram API method name from python method name.
+
+    Notes:
+        1)
+            send_message -> sendMessage
+            get_me -> getMe
+    """
+    res = py_style_method_name.replace("_", " ").title().replace(" ", "")
+    return res[0].lower() + res[1:]
+
+
+class CallPlan:  # pylint: disable=too-few-public-methods
+    """Plan of a call to Telegram Bot Api method.
+
+    Attributes:
+        name (str): name of the python method, e.g. `send_message`
+        tg_method_name (str): name of the Telegram Bot Api method, e.g.
+            `sendMessage`; it is also the last part of the method url
+        param_names (Tuple[str]): names of the method parameters without `self`
+        required_names (FrozenSet[str]): names of the parameters without
+            default values
+        result_type (TypeNode): parsed annotation of the result
+        decoder (Callable): compiled decoder of the result
+    """
+
+    __slots__ = ('name', 'tg_method_name', 'param_names', 'required_names',
+                 'result_type', 'decoder')
+
+    def __init__(self, name: str, param_names: Tuple[str, ...],
+                 result_type: TypeNode,
+                 required_names: FrozenSet[str] = frozenset()):
+        self.name = name
+        self.tg_method_name = tg_method_name(name)
+        self.param_names = param_names
+        self.required_names = required_names
+        self.result_type = result_type
+        self.decoder = get_decoder(result_type)
+
+    @classmethod
+    def from_function(cls, func) -> 'CallPlan':
+        """Build a plan from `Api` method."""
+        signature = inspect.signature(func)
+        param_names = tuple(name for name in signature.parameters
+                            if name != 'self')
+        required_names = frozenset(
+            name for name in param_names
+            if signature.parameters[name].default is inspect.Parameter.empty)
+        result_type = type_node(signature.return_annotation)
+        return cls(func.__name__, param_names, result_type, required_names)
+
+    def args(self, values: dict) -> dict:
+        """Pick the arguments of the call from the method locals."""
+        return {name: values[name] for name in self.param_names}
+
+    def decode(self, raw_response: Union[bytes, str]):
+        """Convert the raw response into the method result."""
+        return self.decoder(get_result(raw_response))
+
+    def __repr__(self):
+        return "{}(name='{}', tg_method_name='{}', result_type='{}')".format(
+            self.__class__.__name__, self.name, self.tg_method_name,
+            self.result_type)
+
+
+_plans: Dict[CodeType, CallPlan] = {}  # code object of Api method -> plan
+
+
+def _find_method(api_cls: type, code: CodeType):
+    """Find the function of `api_cls` or its bases, which owns the code."""
+    for klass in api_cls.__mro__:
+        for func in vars(klass).values():
+            # methods can be wrapped, e.g. by filecache.cached_upload
+            func = inspect.unwrap(func) if callable(func) else func
+            if getattr(func, '__code__', None) is code:
+                return func
+    raise LookupError("{} has no method with code {!r}".format(
+        api_cls.__name__, code))
+
+
+def get_plan_by_code(api_cls: type, code: CodeType) -> CallPlan:
+    """Get the plan of a call to the method, which owns the code object.
+
+    Notes:
+        1) The plan is built from the function, that owns the code, not from
+           the attribute of `api_cls` with the same name. So a subclass that
+           overrides a method and delegates to `super()` does not affect the
+           plan of the original method.
+    """
+    try:
+        return _plans[code]
+    except KeyError:
+        plan = CallPlan.from_function(_find_method(api_cls, code))
+        _plans[code] = plan
+        return plan
+
+
+def get_call_plan(api_cls: type, method_name: str) -> CallPlan:
+    """Get the plan of a call to `api_cls` method, building it if necessary."""
+    func = inspect.unwrap(getattr(api_cls, method_name))
+    return get_plan_by_code(api_cls, func.__code__)
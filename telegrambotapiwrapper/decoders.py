@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Compiled decoders of Telegram Bot Api types.
+
+A decoder converts a json-like object (the result of a request to Telegram
+Bot Api) into the api type described by an annotation. Decoders are built once
+per annotation and per class from the parsed annotations (`TypeNode`), so the
+annotations are not parsed when the responses are decoded.
+
+Example:
+    >>> from telegrambotapiwrapper.decoders import get_decoder
+    >>> decode = get_decoder('User')
+    >>> decode({'id': 1, 'is_bot': False, 'first_name': 'John'})
+    User(id=1, is_bot=False, first_name='John', last_name=None, ...)
+    >>> decode = get_decoder('Update', mask=['message.chat.id'])
+"""
+
+import dataclasses
+import inspect
+from types import MemberDescriptorType
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+import telegrambotapiwrapper.typelib as types_module
+from telegrambotapiwrapper.annotation import TypeNode, type_node
+from telegrambotapiwrapper.base import class_info, types_by_name
+from telegrambotapiwrapper.fieldmask import FieldMask, field_mask
+
+Mask = Union[FieldMask, Iterable[str]]
+
+_MISSING = object()
+
+
+def _identity(obj):
+    return obj
+
+
+class Decoders:
+    """Cache of decoders of the api types.
+
+    Args:
+        types (module): module containing the api types
+    """
+
+    def __init__(self, types=types_module):
+        self._types = types_by_name(types)
+        self._cache: Dict[TypeNode, Callable] = {}
+        self._masked: Dict[Tuple[TypeNode, FieldMask], Callable] = {}
+
+    def get(self, anno, mask: Optional[Mask] = None) -> Callable:
+        """Get the decoder of the type described by the annotation.
+
+        Args:
+            anno (str, AnnotationWrapper, TypeNode): annotation, e.g.
+                'List[Update]'
+            mask (FieldMask, Iterable[str]): fields to decode, e.g.
+                ['message.chat.id', 'message.text'] for 'Update' or
+                'List[Update]'; by default all the fields are decoded
+
+        Raises:
+            ValueError: if the type has no field of the mask
+        """
+        node = type_node(anno)
+        if mask is not None:
+            return self._get_masked(node, field_mask(mask))
+        try:
+            return self._cache[node]
+        except KeyError:
+            decoder = self._compile(node)
+            self._cache[node] = decoder
+            return decoder
+
+    def _compile(self, node: TypeNode) -> Callable:
+        """Build the decoder of the annotation."""
+        if node.is_optional:
+            return self.get(node.inner)
+        if node.is_list_of_list or node.is_list:
+            return self._compile_list(self.get(node.inner))
+        if node.is_union:
+            return self._compile_union(node)
+        if node.is_simple:
+            return _identity
+        cls = self._types.get(node.name)
+        if isinstance(cls, type) and dataclasses.is_dataclass(cls):
+            return self._compile_class(cls)
+        return _identity
+
+    @staticmethod
+    def _compile_list(item_decoder: Callable) -> Callable:
+        if item_decoder is _identity:
+            return _identity
+
+        def decode_list(obj):
+            return [item_decoder(item) for item in obj]
+
+        return decode_list
+
+    def _compile_union(self, node: TypeNode) -> Callable:
+        """Build the decoder of `Union[...]`.
+
+        Notes:
+            1) json objects are decoded as the first api type of the union,
+               other values (e.g. True for Union[Message, bool]) are returned
+               as is.
+        """
+        for member in node.members:
+            decoder = self.get(member)
+            if decoder is not _identity:
+                break
+        else:
+            return _identity
+
+        def decode_union(obj):
+            if isinstance(obj, dict):
+                return decoder(obj)
+            return obj
+
+        return decode_union
+
+    def _compile_class(self, cls: type) -> Callable:
+        """Build the decoder of the api type.
+
+        Notes:
+            1) Absent fields are left to their defaults, unknown keys are
+               skipped.
+            2) The key `from` of json objects is mapped to the field `from_`.
+            3) Values that are not json objects are returned as is, like
+               `response.to_api_type` does.
+        """
+        specs = {}
+
+        def decode(obj):
+            if not isinstance(obj, dict):
+                return obj
+            kwargs = {}
+            for key, value in obj.items():
+                spec = specs.get(key)
+                if spec is None:
+                    continue
+                name, decoder = spec
+                if decoder is not None and value is not None:
+                    value = decoder(value)
+                kwargs[name] = value
+            return cls(**kwargs)
+
+        # registered before the fields are compiled, since the api types can
+        # refer to themselves, e.g. Message.reply_to_message
+        self._cache[type_node(cls.__name__)] = decode
+        for name, anno in class_info(cls).annotations.items():
+            decoder = self.get(anno)
+            spec = (name, None if decoder is _identity else decoder)
+            specs[name] = spec
+            if name == 'from_':
+                specs['from'] = spec
+        return decode
+
+    def _get_masked(self, node: TypeNode, mask: FieldMask) -> Callable:
+        try:
+            return self._masked[node, mask]
+        except KeyError:
+            decoder = self._compile_masked(node, mask)
+            self._masked[node, mask] = decoder
+            return decoder
+
+    def _compile_masked(self, node: TypeNode, mask: FieldMask) -> Callable:
+        """Build the decoder of the fields of the mask."""
+        if node.is_optional:
+            return self._get_masked(node.inner, mask)
+        if node.is_list_of_list or node.is_list:
+            return self._compile_list(self._get_masked(node.inner, mask))
+        if node.is_union:
+            for member in node.members:
+                cls = self._types.get(type_node(member).name)
+                if isinstance(cls, type) and dataclasses.is_dataclass(cls):
+                    decoder = self._get_masked(type_node(member), mask)
+
+                    def decode_union(obj):
+                        if isinstance(obj, dict):
+                            return decoder(obj)
+                        return obj
+
+                    return decode_union
+        cls = self._types.get(node.name)
+        if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+            raise ValueError('{} has no fields {}'.format(
+                node, ', '.join(sorted(mask.paths))))
+        return self._compile_masked_class(cls, mask)
+
+    def _compile_masked_class(self, cls: type, mask: FieldMask) -> Callable:
+        """Build the decoder of the fields of the api type in the mask.
+
+        Notes:
+            1) The instance is made without `__init__`, so the required
+               fields outside the mask are not needed. The fields outside
+               the mask are None or the class defaults.
+            2) Fields of the mask absent in the json are None as well, no
+               check for required fields is made.
+        """
+        annotations = class_info(cls).annotations
+        specs = {}
+        for name, sub_mask in mask.fields.items():
+            if name not in annotations:
+                raise ValueError('{} has no field {!r}'.format(
+                    cls.__name__, name))
+            if sub_mask is None:
+                decoder = self.get(annotations[name])
+            else:
+                decoder = self._get_masked(type_node(annotations[name]),
+                                           sub_mask)
+            specs['from' if name == 'from_' else name] = (
+                name, None if decoder is _identity else decoder)
+        specs = tuple(specs.items())
+        # fields, that have no default values in the class, e.g. the
+        # required ones or the ones of the slotted variants
+        defaults = {}
+        for field in dataclasses.fields(cls):
+            attr = inspect.getattr_static(cls, field.name, _MISSING)
+            if attr is _MISSING or isinstance(attr, MemberDescriptorType):
+                default = field.default
+                defaults[field.name] = (None if default is dataclasses.MISSING
+                                        else default)
+        new = object.__new__
+        has_dict = hasattr(new(cls), '__dict__')
+
+        def decode(obj):
+            if not isinstance(obj, dict):
+                return obj
+            instance = new(cls)
+            values = {}
+            for key, (name, decoder) in specs:
+                value = obj.get(key)
+                if value is not None:
+                    values[name] = value if decoder is None else decoder(value)
+            if has_dict:
+                instance.__dict__.update(defaults)
+                instance.__dict__.update(values)
+            else:
+                for name, value in defaults.items():
+                    object.__setattr__(instance, name, value)
+                for name, value in values.items():
+                    object.__setattr__(instance, name, value)
+            return instance
+
+        return decode
+
+
+decoders = Decoders()
+
+
+def get_decoder(anno, mask: Optional[Mask] = None) -> Callable:
+    """Get the decoder of the type described by the annotation.
+
+    Args:
+        anno (str, AnnotationWrapper, TypeNode): annotation, e.g. 'Update'
+        mask (FieldMask, Iterable[str]): fields to decode, see `Decoders.get`
+    """
+    return decoders.get(anno, mask)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Deduplication of updates by `update_id`.
+
+Telegram delivers an update again, when a webhook request fails or times
+out, and `getUpdates` returns the unconfirmed updates again after a poller
+restarts. `UpdateDeduplicator` remembers the identifiers of the recent
+updates, so the repeated ones are dropped before they are decoded and
+handled.
+
+Example:
+    >>> dedupe = UpdateDeduplicator()
+    >>> server = WebhookServer(handle, dedupe=dedupe)
+    >>> poller = UpdatePoller(bot_api, dedupe=dedupe)
+"""
+
+import re
+import threading
+from typing import Optional, Union
+
+from telegrambotapiwrapper import jsoncodec
+from telegrambotapiwrapper.dispatch import get_field
+
+_update_id_re = re.compile(rb'"update_id"\s*:\s*(-?\d+)')
+
+
+class UpdateDeduplicator:
+    """Set of the recent identifiers of updates of a bounded size.
+
+    Args:
+        window (int): number of the recent identifiers remembered; the
+            identifiers greater than the greatest one seen minus `window`
+            are checked exactly
+
+    Attributes:
+        duplicates (int): number of the dropped updates
+
+    Notes:
+        1) Telegram numbers the updates sequentially, so the seen identifiers
+           are bits of a ring buffer of `window` bits: the bit of an
+           identifier is its remainder by `window`, the bits of the skipped
+           identifiers are cleared, when the greatest one moves forward. A
+           check takes O(1) time, the memory is `window / 8` bytes.
+        2) Identifiers older than the window are taken for seen ones, so a
+           late redelivery does not erase the memory. After a week without
+           updates Telegram may start the sequence anew from a random
+           identifier: a jump forward by `window` or more starts a new
+           window, a jump backward must be followed by `clear`.
+        3) The deduplicator is thread safe and can be shared by a poller and
+           a webhook server.
+    """
+
+    def __init__(self, window: int = 65536):
+        if window <= 0:
+            raise ValueError('window must be positive')
+        self.window = window
+        self.duplicates = 0
+        self._bits = bytearray((window + 7) // 8)
+        self._last: Optional[int] = None  # the greatest seen identifier
+        self._lock = threading.Lock()
+
+    def _restart(self, update_id: int):
+        self._bits = bytearray(len(self._bits))
+        self._last = update_id
+
+    def add(self, update_id: int) -> bool:
+        """Remember the identifier.
+
+        Returns:
+            (bool): False if the identifier has been seen or is older than
+                the window
+        """
+        with self._lock:
+            last = self._last
+            if last is None or update_id - last >= self.window:
+                self._restart(update_id)
+            elif update_id <= last - self.window:
+                self.duplicates += 1
+                return False
+            elif update_id > last:
+                # the slots of the new identifiers hold the old ones
+                bits = self._bits
+                for new_id in range(last + 1, update_id + 1):
+                    slot = new_id % self.window
+                    bits[slot >> 3] &= ~(1 << (slot & 7))
+                self._last = update_id
+            slot = update_id % self.window
+            mask = 1 << (slot & 7)
+            if self._bits[slot >> 3] & mask:
+                self.duplicates += 1
+                return False
+            self._bits[slot >> 3] |= mask
+            return True
+
+    def __contains__(self, update_id: int) -> bool:
+        with self._lock:
+            last = self._last
+            if last is None or not last - self.window < update_id <= last:
+                return False
+            slot = update_id % self.window
+            return bool(self._bits[slot >> 3] & (1 << (slot & 7)))
+
+    def is_new(self, update) -> bool:
+        """Remember the update decoded into an object or a dict.
+
+        Returns:
+            (bool): False if the update has been seen
+        """
+        return self.add(get_field(update, 'update_id'))
+
+    def is_new_raw(self, raw: Union[bytes, str]) -> bool:
+        """Remember the update by its raw json, without parsing it.
+
+        Returns:
+            (bool): False if the update has been seen
+        """
+        if isinstance(raw, str):
+            raw = raw.encode('utf-8')
+        # only the update itself has this field, and strings can not hold
+        # it unescaped
+        match = _update_id_re.search(raw)
+        if match is None:
+            return self.is_new(jsoncodec.loads(raw))
+        return self.add(int(match.group(1)))
+
+    def clear(self):
+        """Forget all the identifiers, e.g. when Telegram has started the
+        sequence of identifiers anew."""
+        with self._lock:
+            self._bits = bytearray(len(self._bits))
+            self._last = None
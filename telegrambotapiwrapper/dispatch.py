@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Parallel handling of updates, ordered within every chat.
+
+`ChatDispatcher` runs the handler of updates on an executor, e.g. a thread or
+process pool, so the updates of different chats are handled concurrently,
+while the updates of one chat are handled one after another in the order they
+were submitted.
+
+Example:
+    >>> from telegrambotapiwrapper.polling import UpdatePoller
+    >>> dispatcher = ChatDispatcher(handle, max_workers=16)
+    >>> with UpdatePoller(bot_api) as poller:
+    ...     dispatcher.run(poller)
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Executor, Future
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+# fields of Update in the order they are looked through
+UPDATE_KINDS = ('message', 'edited_message', 'channel_post',
+                'edited_channel_post', 'inline_query', 'chosen_inline_result',
+                'callback_query', 'shipping_query', 'pre_checkout_query',
+                'poll', 'poll_answer')
+
+MESSAGE_KINDS = frozenset(('message', 'edited_message', 'channel_post',
+                           'edited_channel_post'))
+
+
+def get_field(obj, name: str):
+    """Get the field of an api object or of its json dict."""
+    if isinstance(obj, dict):
+        return obj.get('from' if name == 'from_' else name)
+    return getattr(obj, name, None)
+
+
+def update_kind(update) -> Optional[str]:
+    """Get the name of the field set in the update, e.g. 'callback_query'.
+
+    Notes:
+        1) The update can be `Update` or its json dict.
+    """
+    for kind in UPDATE_KINDS:
+        if get_field(update, kind) is not None:
+            return kind
+    return None
+
+
+def chat_id(update) -> Optional[int]:
+    """Get id of the chat, to which the update belongs.
+
+    Notes:
+        1) Updates without a chat, e.g. inline queries, belong to the private
+           chat with their user, i.e. the id of the user is returned.
+        2) None is returned for updates of polls, which belong to no chat.
+    """
+    kind = update_kind(update)
+    if kind is None or kind == 'poll':
+        return None
+    value = get_field(update, kind)
+    if kind in MESSAGE_KINDS:
+        return get_field(get_field(value, 'chat'), 'id')
+    if kind == 'callback_query':
+        message = get_field(value, 'message')
+        if message is not None:
+            return get_field(get_field(message, 'chat'), 'id')
+    user = get_field(value, 'user' if kind == 'poll_answer' else 'from_')
+    return get_field(user, 'id')
+
+
+def _copy_outcome(target: Future, source: Future):
+    if source.cancelled():  # the running target can not be cancelled
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class _Submission:
+    """State of an update submitted to the executor."""
+
+    __slots__ = ('starting', 'finished')
+
+    def __init__(self):
+        self.starting = True  # `_start` has not returned yet
+        self.finished = False
+
+
+class ChatDispatcher:
+    """Dispatcher of updates ordered within the chats.
+
+    Args:
+        handler (Callable): function, which is called with every update; it
+            must be picklable for a process pool
+        executor (Executor): executor of the handler; by default a thread
+            pool of `max_workers` threads is created and owned
+        max_workers (int): number of threads of the default executor
+        key (Callable): function getting the key of the update, the updates
+            with the same key are handled in order; by default `chat_id`;
+            the updates with None key are not ordered
+        max_pending (int): maximum number of submitted updates, which are not
+            handled yet; `submit` blocks, when it is reached
+
+    Notes:
+        1) Only the first update of a chat is in the executor, the others wait
+           in the queue of the chat and are submitted when the previous one
+           is handled, so a busy chat does not take more than one worker.
+    """
+
+    def __init__(self, handler: Callable,
+                 executor: Optional[Executor] = None,
+                 max_workers: int = 8,
+                 key: Callable[..., Optional[Hashable]] = chat_id,
+                 max_pending: Optional[int] = None):
+        self.handler = handler
+        self._owns_executor = executor is None
+        self.executor = (ThreadPoolExecutor(max_workers) if executor is None
+                         else executor)
+        self.key = key
+        self._queues: Dict[Hashable, deque] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._slots = (threading.Semaphore(max_pending)
+                       if max_pending is not None else None)
+
+    def submit(self, update) -> Future:
+        """Submit the update to be handled.
+
+        Returns:
+            (Future): future of the result of the handler
+        """
+        if self._slots is not None:
+            self._slots.acquire()
+        key = self.key(update)
+        future = Future()
+        with self._lock:
+            self._pending += 1
+            if key is not None:
+                queue = self._queues.get(key)
+                if queue is not None:  # the chat is busy
+                    queue.append((update, future))
+                    return future
+                self._queues[key] = deque()
+        self._start(key, update, future)
+        return future
+
+    def _start(self, key, update, future: Future):
+        """Start handling the update.
+
+        Notes:
+            1) The following updates of the key are started in a loop, when
+               the update is finished at once, e.g. cancelled or rejected by
+               a shut down executor, so long queues do not nest the calls.
+        """
+        while True:
+            if future.set_running_or_notify_cancel():
+                try:
+                    inner = self.executor.submit(self.handler, update)
+                except Exception as exc:  # pylint: disable=broad-except
+                    # e.g. the executor is shut down
+                    future.set_exception(exc)
+                else:
+                    submission = _Submission()
+                    inner.add_done_callback(
+                        partial(self._done, key, future, submission))
+                    with self._lock:
+                        submission.starting = False
+                        if not submission.finished:
+                            return  # `_done` starts the following update
+            following = self._finish(key)
+            if following is None:
+                return
+            update, future = following
+
+    def _done(self, key, future: Future, submission: '_Submission',
+              inner: Future):
+        _copy_outcome(future, inner)
+        with self._lock:
+            submission.finished = True
+            if submission.starting:
+                return  # `_start` goes on with the following update
+        following = self._finish(key)
+        if following is not None:
+            self._start(key, *following)
+
+    def _finish(self, key):
+        """Count an update of the key as handled.
+
+        Returns:
+            the next update of the key and its future, None if there is none
+        """
+        if self._slots is not None:
+            self._slots.release()
+        with self._lock:
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
+            if key is None:
+                return None
+            queue = self._queues[key]
+            if not queue:
+                del self._queues[key]
+                return None
+            return queue.popleft()
+
+    def pending(self) -> int:
+        """Number of submitted updates, which are not handled yet."""
+        with self._lock:
+            return self._pending
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all submitted updates are handled.
+
+        Returns:
+            (bool): False if the timeout has expired
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def run(self, updates: Iterable):
+        """Submit the updates, e.g. from `UpdatePoller`, and wait until they
+        are handled."""
+        for update in updates:
+            self.submit(update)
+        self.join()
+
+    def shutdown(self, wait: bool = True):
+        """Wait for the submitted updates and shut down the own executor."""
+        if wait:
+            self.join()
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
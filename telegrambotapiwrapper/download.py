@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Streaming download of files.
+
+`Api.get_file` returns a `File` with `file_path`, the content of the file is
+downloaded from https://api.telegram.org/file/bot<token>/<file_path>.
+`Downloader` streams the content to a path or a file object in chunks of
+fixed size over the pooled connections of the api transport, so the memory
+used does not depend on the size of the file. Interrupted downloads are
+resumed with HTTP Range requests.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> bot_api = Api(token="<paste your token here>")
+    >>> bot_api.download_file(message.document, 'report.pdf')
+    'report.pdf'
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Iterable, List, Tuple, Union
+
+import requests
+
+from telegrambotapiwrapper.typelib import File
+
+CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = '.part'
+
+# errors, after which the download is resumed from the received offset
+RESUMABLE_ERRORS = (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError)
+
+Destination = Union[str, os.PathLike, BinaryIO]
+
+
+class Downloader:
+    """Downloader of files of Telegram Bot Api.
+
+    Args:
+        api (Api): client, whose token, proxy and transport are used
+        chunk_size (int): size of the chunks, in which the content is read and
+            written
+        max_workers (int): maximum number of concurrent downloads in
+            `download_many`; keep it not greater than `pool_maxsize` of the
+            transport, so the connections are reused
+        max_resumes (int): maximum number of resumes of an interrupted
+            download
+
+    Notes:
+        1) A download to a path is written to `<path>.part` and renamed when
+           it is complete, so an existing `.part` file is resumed by the
+           next download to the same path, e.g. after a crash.
+    """
+
+    def __init__(self, api, chunk_size: int = CHUNK_SIZE,
+                 max_workers: int = 4, max_resumes: int = 3):
+        self.api = api
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.max_resumes = max_resumes
+
+    def _file(self, file: Union[File, str]) -> File:
+        if isinstance(file, File) and file.file_path is not None:
+            return file
+        file_id = file if isinstance(file, str) else file.file_id
+        return self.api.get_file(file_id=file_id)
+
+    def download(self, file: Union[File, str],
+                 destination: Destination) -> Destination:
+        """Download the file.
+
+        Args:
+            file (File, str): file returned by `get_file`, or any object with
+                `file_id` (e.g. Document, PhotoSize), or `file_id` itself
+            destination (str, os.PathLike, BinaryIO): path of the file to
+                write or a binary file object opened for writing
+
+        Returns:
+            the destination
+        """
+        file = self._file(file)
+        url = self.api._get_tg_file_url(  # pylint: disable=protected-access
+            file.file_path)
+        if hasattr(destination, 'write'):
+            self._stream(url, destination, 0, file.file_size)
+            return destination
+
+        part_path = os.fspath(destination) + PART_SUFFIX
+        with open(part_path, 'ab') as out:
+            self._stream(url, out, out.tell(), file.file_size)
+        os.replace(part_path, destination)
+        return destination
+
+    def _stream(self, url: str, out: BinaryIO, offset: int, size):
+        """Write the content of the url starting from the offset.
+
+        Notes:
+            1) If the server ignores the Range header, the content is written
+               from the beginning, so `out` must be seekable to be resumed.
+        """
+        start = out.tell() - offset
+        resumes = 0
+        while True:
+            headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+            try:
+                offset = self._fetch(url, out, start, offset, headers)
+            except _Interrupted as exc:
+                offset = exc.offset
+                if resumes >= self.max_resumes:
+                    raise exc.error
+                resumes += 1
+                continue
+            if size is None or offset >= size:
+                return
+            if resumes >= self.max_resumes:
+                raise requests.exceptions.ChunkedEncodingError(
+                    'received {} of {} bytes'.format(offset, size))
+            resumes += 1  # the connection was closed before the end
+
+    def _fetch(self, url: str, out: BinaryIO, start: int, offset: int,
+               headers: dict) -> int:
+        """Make one request, return the offset after the written content."""
+        try:
+            response = self.api.transport.get(url, headers=headers,
+                                              stream=True,
+                                              proxies=self.api.proxy)
+        except RESUMABLE_ERRORS as exc:
+            raise _Interrupted(offset, exc)
+        with response:
+            if response.status_code == 416 and offset:
+                return offset  # nothing left to download
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                offset = 0  # the range is ignored, the content is sent again
+                out.seek(start)
+                out.truncate()
+            try:
+                for chunk in response.iter_content(self.chunk_size):
+                    out.write(chunk)
+                    offset += len(chunk)
+            except RESUMABLE_ERRORS as exc:
+                raise _Interrupted(offset, exc)
+        return offset
+
+    def download_many(self, files: Iterable[Tuple[Union[File, str],
+                                                  Destination]]
+                      ) -> List[Future]:
+        """Download the files concurrently.
+
+        Args:
+            files: pairs of a file and its destination, like the arguments of
+                `download`
+
+        Returns:
+            (List[Future]): futures of the destinations in the order of the
+                files; a failed download does not stop the others
+        """
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            return [executor.submit(self.download, file, destination)
+                    for file, destination in files]
+
+
+class _Interrupted(Exception):
+    """The content was interrupted after the offset."""
+
+    def __init__(self, offset: int, error: Exception):
+        super().__init__(offset, error)
+        self.offset = offset
+        self.error = error
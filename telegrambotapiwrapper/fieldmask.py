@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Field masks for partial decoding.
+
+A field mask lists the paths of the fields to decode, e.g.
+`('message.chat.id', 'message.from_.id', 'message.text')` for `Update`.
+The decoders built with a mask (see `Decoders.get`) decode only these paths,
+the subtrees outside the mask, e.g. `reply_to_message`, `entities` or
+`photo`, are skipped without being looked at.
+
+Example:
+    >>> mask = FieldMask(['message.chat.id', 'message.text'])
+    >>> update = webhook_handler(request_body, mask=mask)
+    >>> update.message.text, update.message.chat.id
+    ('Hello', -100123)
+    >>> update.message.reply_to_message is None  # not decoded
+    True
+"""
+
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Union
+
+
+class FieldMask:
+    """Immutable tree of the paths of the fields to decode.
+
+    Args:
+        paths (Iterable[str]): paths of the fields separated by dots; the
+            field `from` can be written as `from` or `from_`
+
+    Attributes:
+        fields (Mapping[str, Optional[FieldMask]]): masks of the fields by
+            their names, None means the whole field is decoded
+
+    Notes:
+        1) A path to an object decodes the whole object, e.g. 'message.chat'
+           decodes all the fields of the chat.
+        2) The masks are equal, if they decode the same fields, so they can
+           be used as keys of the caches of decoders.
+    """
+
+    __slots__ = ('fields', 'paths', '_hash')
+
+    def __init__(self, paths: Iterable[str]):
+        tree = {}
+        for path in paths:
+            names = [('from_' if name == 'from' else name)
+                     for name in path.split('.')]
+            if not all(names):
+                raise ValueError('bad path of a field {!r}'.format(path))
+            node = tree
+            for name in names[:-1]:
+                child = node.get(name, {})
+                if child is None:  # the whole field is decoded already
+                    break
+                node = node.setdefault(name, child)
+            else:
+                node[names[-1]] = None
+        self.fields: Mapping[str, Optional['FieldMask']] = MappingProxyType({
+            name: None if sub is None else FieldMask._from_tree(sub)
+            for name, sub in tree.items()})
+        self.paths = frozenset(_paths(tree))
+        self._hash = hash(self.paths)
+
+    @classmethod
+    def _from_tree(cls, tree: dict) -> 'FieldMask':
+        return cls(_paths(tree))
+
+    def __eq__(self, other):
+        if not isinstance(other, FieldMask):
+            return NotImplemented
+        return self.paths == other.paths
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, sorted(self.paths))
+
+
+def _paths(tree: dict, prefix: str = ''):
+    for name, sub in tree.items():
+        if sub is None:
+            yield prefix + name
+        else:
+            yield from _paths(sub, prefix + name + '.')
+
+
+def field_mask(mask: Union[FieldMask, Iterable[str]]) -> FieldMask:
+    """Get the field mask from the mask or the paths of the fields."""
+    if isinstance(mask, FieldMask):
+        return mask
+    if isinstance(mask, str):
+        return FieldMask((mask,))
+    return FieldMask(mask)
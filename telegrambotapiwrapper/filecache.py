@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Cache of `file_id` of uploaded files.
+
+Once a file is uploaded, Telegram Bot Api allows to send it again by its
+`file_id`. `FileIdCache` remembers the `file_id` of every uploaded stream by
+the hash of its content, so `Api` sends the same bytes again by `file_id`
+instead of uploading them.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> bot_api = Api(token="<paste your token here>",
+    ...               file_cache=FileIdCache(path='file_ids.log'))
+    >>> with open('logo.png', 'rb') as photo:
+    ...     bot_api.send_photo(chat_id=1, photo=photo)  # uploaded
+    >>> with open('logo.png', 'rb') as photo:
+    ...     bot_api.send_photo(chat_id=2, photo=photo)  # sent by file_id
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+
+CHUNK_SIZE = 64 * 1024
+
+# attributes of Message, that can contain the sent file, in order of priority
+MEDIA_ATTRIBUTES = ('photo', 'document', 'video', 'audio', 'animation',
+                    'voice', 'video_note', 'sticker')
+
+_Key = Tuple[str, str]  # kind of media, hex digest of the content
+
+
+def content_digest(stream) -> Optional[str]:
+    """Get sha256 of the rest of the stream and rewind it back.
+
+    Returns:
+        (str): hex digest, None if the stream is not seekable
+    """
+    try:
+        start = stream.tell()
+    except (AttributeError, OSError):
+        return None
+    digest = hashlib.sha256()
+    for chunk in iter(functools.partial(stream.read, CHUNK_SIZE), b''):
+        digest.update(chunk)
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+def sent_file_id(message, kind: str) -> Optional[str]:
+    """Get `file_id` of the file sent with the message.
+
+    Notes:
+        1) For photos the `file_id` of the largest size is taken.
+        2) Telegram can send a file as another kind of media, e.g. a gif sent
+           by `send_document` becomes an animation, so all the media
+           attributes are looked through.
+        3) The message can be a dict, if `Api` returns the results as dicts.
+    """
+    for attr in (kind,) + MEDIA_ATTRIBUTES:
+        if isinstance(message, dict):
+            media = message.get(attr)
+        else:
+            media = getattr(message, attr, None)
+        if isinstance(media, list):
+            media = media[-1] if media else None
+        if isinstance(media, dict):
+            return media.get('file_id')
+        if media is not None:
+            return media.file_id
+    return None
+
+
+class FileIdCache:
+    """LRU cache of `file_id` by the content of the uploaded files.
+
+    Args:
+        maxsize (int): maximum number of remembered files
+        path (str): file, where the cache is kept between runs; if not
+            specified, the cache is kept in memory only
+
+    Notes:
+        1) `file_id` is valid only for the bot, that uploaded the file, so
+           the cache must not be shared by different bots.
+        2) The file on disk is an append-only log of `kind digest file_id`
+           lines; it is compacted when it grows to twice `maxsize` lines.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[_Key, str]' = OrderedDict()
+        self._log_lines = 0
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                parts = line.split()
+                if len(parts) != 3:
+                    continue  # broken by a crash
+                self._log_lines += 1
+                kind, digest, file_id = parts
+                if file_id == '-':  # discarded
+                    self._entries.pop((kind, digest), None)
+                else:
+                    self._set((kind, digest), file_id)
+        if self._log_lines > len(self._entries):
+            self._compact()
+
+    def _set(self, key: _Key, file_id: str):
+        self._entries[key] = file_id
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _append(self, key: _Key, file_id: str):
+        if self.path is None:
+            return
+        if self._log_lines >= 2 * self.maxsize:
+            self._compact()
+            return
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{} {} {}\n'.format(key[0], key[1], file_id))
+        self._log_lines += 1
+
+    def _compact(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for (kind, digest), file_id in self._entries.items():
+                file.write('{} {} {}\n'.format(kind, digest, file_id))
+        os.replace(tmp_path, self.path)
+        self._log_lines = len(self._entries)
+
+    def get(self, kind: str, digest: str) -> Optional[str]:
+        """Get `file_id` of the content, None if it has not been uploaded."""
+        with self._lock:
+            file_id = self._entries.get((kind, digest))
+            if file_id is not None:
+                self._entries.move_to_end((kind, digest))
+            return file_id
+
+    def add(self, kind: str, digest: str, file_id: str):
+        """Remember `file_id` of the uploaded content."""
+        with self._lock:
+            self._set((kind, digest), file_id)
+            self._append((kind, digest), file_id)
+
+    def discard(self, kind: str, digest: str):
+        """Forget the content, e.g. when Telegram rejects its `file_id`."""
+        with self._lock:
+            if self._entries.pop((kind, digest), None) is not None:
+                self._append((kind, digest), '-')
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _is_stale_file_id(exc: UnsuccessfulRequest) -> bool:
+    """Has Telegram rejected the call because of the `file_id`."""
+    return (getattr(exc, 'error_code', None) == 400
+            and 'file' in str(getattr(exc, 'description', '')).lower())
+
+
+def cached_upload(kind: str):
+    """Decorator of `Api` methods, that send the file in the argument `kind`.
+
+    If `Api` has `file_cache`, a stream in the argument is replaced by the
+    cached `file_id` of its content, and `file_id` of an uploaded stream is
+    added to the cache.
+    """
+
+    def decorator(func):
+        # position of the argument without self
+        index = list(inspect.signature(func).parameters).index(kind) - 1
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self.file_cache
+            stream = args[index] if len(args) > index else kwargs.get(kind)
+            if cache is None or stream is None or isinstance(stream, str):
+                return func(self, *args, **kwargs)
+            digest = content_digest(stream)
+            if digest is None:
+                return func(self, *args, **kwargs)
+
+            file_id = cache.get(kind, digest)
+            if file_id is not None:
+                if len(args) > index:
+                    cached_args = args[:index] + (file_id,) + args[index + 1:]
+                    cached_kwargs = kwargs
+                else:
+                    cached_args, cached_kwargs = args, dict(kwargs)
+                    cached_kwargs[kind] = file_id
+                try:
+                    return func(self, *cached_args, **cached_kwargs)
+                except UnsuccessfulRequest as exc:
+                    if not _is_stale_file_id(exc):
+                        raise
+                    # e.g. the file has been deleted, it is uploaded again
+                    cache.discard(kind, digest)
+
+            message = func(self, *args, **kwargs)
+            file_id = sent_file_id(message, kind)
+            if file_id is not None:
+                cache.add(kind, digest, file_id)
+            return message
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""JSON codecs used to encode the requests and to parse the responses.
+
+The fastest installed codec is used by default: `orjson`, then `ujson`, then
+the standard `json`. The requests are encoded and the responses and webhook
+requests are parsed by the module functions `loads` and `dumps`, which are
+rebound by `set_codec`.
+
+Example:
+    >>> from telegrambotapiwrapper import jsoncodec
+    >>> jsoncodec.get_codec().name
+    'orjson'
+    >>> jsoncodec.set_codec('json')  # e.g. to compare the results
+"""
+
+import importlib
+import json
+from typing import Callable, Dict, List, Union
+
+
+class JsonCodec:
+    """Interface of a JSON codec.
+
+    Notes:
+        1) `loads` accepts both bytes and str.
+        2) `dumps` returns compact utf-8 encoded json without escaping of
+           non-ascii characters.
+    """
+
+    name = None
+
+    def loads(self, data: Union[bytes, str]):
+        raise NotImplementedError
+
+    def dumps(self, obj) -> bytes:
+        raise NotImplementedError
+
+
+class StdlibCodec(JsonCodec):
+    """Codec of the standard library `json`."""
+
+    name = 'json'
+    loads = staticmethod(json.loads)
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False,
+                                         separators=(',', ':'))
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj).encode('utf-8')
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec of `orjson`.
+
+    Notes:
+        1) orjson accepts only str keys of dicts and integers within 64 bits,
+           which is enough for Telegram Bot Api.
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        orjson = importlib.import_module('orjson')
+        self.loads = orjson.loads
+        self.dumps = orjson.dumps
+
+
+class UjsonCodec(JsonCodec):
+    """Codec of `ujson`."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        self._ujson = importlib.import_module('ujson')
+        self.loads = self._ujson.loads
+
+    def dumps(self, obj) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False,
+                                 escape_forward_slashes=False).encode('utf-8')
+
+
+# codecs by name in order of preference
+CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    StdlibCodec.name: StdlibCodec,
+}
+
+
+def available_codecs() -> List[str]:
+    """Get names of the codecs, whose libraries are installed."""
+    res = []
+    for name, factory in CODECS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        res.append(name)
+    return res
+
+
+def _detect_codec() -> JsonCodec:
+    for factory in CODECS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return StdlibCodec()
+
+
+_codec = _detect_codec()
+loads = _codec.loads
+dumps = _codec.dumps
+
+
+def get_codec() -> JsonCodec:
+    """Get the codec in use."""
+    return _codec
+
+
+def set_codec(codec: Union[JsonCodec, str]) -> JsonCodec:
+    """Use the codec for all requests and responses.
+
+    Args:
+        codec (JsonCodec, str): codec or name of the codec in `CODECS`
+
+    Returns:
+        (JsonCodec): the previous codec
+
+    Raises:
+        ImportError: if the library of the codec is not installed
+        KeyError: if the name is unknown
+    """
+    global _codec, loads, dumps  # pylint: disable=global-statement
+    if isinstance(codec, str):
+        codec = CODECS[codec]()
+    previous = _codec
+    _codec, loads, dumps = codec, codec.loads, codec.dumps
+    return previous
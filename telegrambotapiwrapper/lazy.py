@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Lazy variants of the api types.
+
+Every type of `typelib` has a variant here, which keeps the nested objects of
+a decoded response (e.g. `Update.message`, `Message.reply_to_message`,
+`Message.entities`) as raw json and decodes them only when they are accessed;
+the decoded value is cached on the parent. So the cost of decoding an update
+is proportional to what the handler actually reads.
+
+Example:
+    >>> from telegrambotapiwrapper.webhooks import webhook_handler
+    >>> from telegrambotapiwrapper import lazy
+    >>> update = webhook_handler(request_body, decoders=lazy.decoders)
+    >>> update.message.text  # only message is decoded, not its chat, etc.
+    'Hello'
+
+Notes:
+    1) The variants are subclasses of the `typelib` types with the same
+       constructor, equality, repr and `_fields_items`; these methods read all
+       the fields, so they decode everything.
+    2) Like the sparse variants, the instances made by the decoders store only
+       the fields present in the json, the class defaults answer for the rest.
+"""
+
+import dataclasses
+from typing import Callable
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper.annotation import TypeNode, type_node
+from telegrambotapiwrapper.base import class_info, types_by_name
+from telegrambotapiwrapper.decoders import Decoders
+
+RAW_PREFIX = '_raw_'
+
+_MISSING = object()
+
+
+class LazyField:
+    """Data descriptor of a field, that is decoded on the first access.
+
+    The raw json of the field is kept in the instance `__dict__` under
+    `_raw_<name>`, the decoded value replaces it under `<name>`.
+    """
+
+    __slots__ = ('name', 'raw_name', 'anno', 'default', 'decoder')
+
+    def __init__(self, name: str, anno: TypeNode, default=None):
+        self.name = name
+        self.raw_name = RAW_PREFIX + name
+        self.anno = anno
+        self.default = default
+        self.decoder = None
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self.default
+        values = obj.__dict__
+        try:
+            return values[self.name]
+        except KeyError:
+            pass
+        # the raw json is removed only after the value is stored, so the
+        # threads reading the field at the same time both get the value
+        raw = values.get(self.raw_name, _MISSING)
+        if raw is _MISSING:
+            return values.get(self.name, self.default)
+        if self.decoder is None:
+            self.decoder = decoders.get(self.anno)
+        value = values[self.name] = None if raw is None else self.decoder(raw)
+        values.pop(self.raw_name, None)
+        return value
+
+    def __set__(self, obj, value):
+        values = obj.__dict__
+        values[self.name] = value
+        values.pop(self.raw_name, None)
+
+
+def make_lazy(cls: type, module: str = __name__) -> type:
+    """Make a lazy variant of the api type.
+
+    Notes:
+        1) Only the fields, that are not int, str, bool, float, are lazy.
+    """
+    namespace = {'__module__': module, '__doc__': cls.__doc__}
+    defaults = {field.name: field.default for field in dataclasses.fields(cls)}
+    for name, anno in class_info(cls).not_simple_fields.items():
+        default = defaults[name]
+        namespace[name] = LazyField(
+            name, type_node(anno),
+            None if default is dataclasses.MISSING else default)
+    return type(cls)(cls.__name__, (cls,), namespace)
+
+
+class LazyDecoders(Decoders):
+    """Decoders into the lazy variants of the api types."""
+
+    def _compile_class(self, cls: type) -> Callable:
+        """Build the decoder of the lazy api type.
+
+        Notes:
+            1) The instance is made without `__init__`: the simple fields
+               are put into its `__dict__` as is, the other ones are put as
+               raw json for `LazyField`.
+            2) Like the dataclass constructor, the decoder raises TypeError,
+               if a required field is absent.
+        """
+        info = class_info(cls)
+        specs = {}
+        for name in info.fields_names:
+            key = name if name in info.simple_fields else RAW_PREFIX + name
+            specs['from' if name == 'from_' else name] = key
+        required = frozenset(
+            'from' if field.name == 'from_' else field.name
+            for field in dataclasses.fields(cls)
+            if field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING)
+        new = object.__new__
+
+        def decode(obj):
+            if not isinstance(obj, dict):
+                return obj
+            if not required.issubset(obj):
+                raise TypeError('{} missing required fields: {}'.format(
+                    cls.__name__, ', '.join(sorted(required.difference(obj)))))
+            instance = new(cls)
+            values = instance.__dict__
+            for key, value in obj.items():
+                name = specs.get(key)
+                if name is not None:
+                    values[name] = value
+            return instance
+
+        self._cache[type_node(cls.__name__)] = decode
+        return decode
+
+
+def _make_all():
+    for name, cls in types_by_name(typelib).items():
+        if dataclasses.is_dataclass(cls):
+            globals()[name] = make_lazy(cls)
+
+
+_make_all()
+
+decoders = LazyDecoders(types=__name__)
+
+
+def get_decoder(anno) -> Callable:
+    """Get the decoder of the type described by the annotation into the lazy
+    variants of the api types."""
+    return decoders.get(anno)
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Scheduler of outgoing requests within Telegram rate limits.
+
+Telegram allows a bot to send about 30 messages per second in total, about one
+message per second to a private chat and 20 messages per minute to a group.
+`Outbox` queues the calls of `Api` methods and runs them as fast as these
+limits allow: every chat has its own token bucket, and all the calls share
+the global one.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> outbox = Outbox(Api(token="<paste your token here>"))
+    >>> outbox.start()
+    >>> future = outbox.send_message(chat_id=-321532153215, text="Hello")
+    >>> future.result()
+    Message(message_id=299, ...)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Dict, Hashable, Optional
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.retry import ChatMigrations, chat_migrations
+from telegrambotapiwrapper.retry import error_parameters
+
+
+class TokenBucket:
+    """Token bucket.
+
+    Args:
+        rate (float): tokens per second
+        capacity (float): maximum number of tokens, i.e. the size of a burst
+        now (float): current time
+
+    Notes:
+        1) The bucket does not read the clock, the time is passed to its
+           methods, so it can be tested with any clock.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'paused_until')
+
+    epsilon = 1e-9  # tolerance of rounding, e.g. after sleeping the delay
+
+    def __init__(self, rate: float, capacity: float = 1, now: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+        self.paused_until = now
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available, 0 if it is available now."""
+        self._refill(now)
+        if self.tokens >= 1 - self.epsilon:
+            wait = 0.0
+        else:
+            wait = (1 - self.tokens) / self.rate
+        return max(wait, self.paused_until - now)
+
+    def consume(self, now: float):
+        """Take a token."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, now: float, seconds: float):
+        """Give no tokens during the seconds, e.g. after `retry_after`."""
+        self.paused_until = max(self.paused_until, now + seconds)
+        self._refill(now)
+        self.tokens = min(self.tokens, 1)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.paused_until <= now
+
+
+def chat_rate(chat_id, private_rate: float, group_rate: float) -> float:
+    """Get the rate limit of the chat.
+
+    Notes:
+        1) Chats with positive ids are private chats, chats with negative ids
+           and usernames (e.g. '@channelusername') are groups and channels.
+    """
+    if isinstance(chat_id, int) and chat_id > 0:
+        return private_rate
+    return group_rate
+
+
+def _copy_outcome(target: Future, source: Future):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class _Call:  # pylint: disable=too-few-public-methods
+    __slots__ = ('method', 'kwargs', 'future')
+
+    def __init__(self, method: str, kwargs: dict, future: Future):
+        self.method = method
+        self.kwargs = kwargs
+        self.future = future
+
+
+class Outbox:
+    """Queue of calls of `Api` methods limited by token buckets.
+
+    Args:
+        api (Api): client, the methods of which are called
+        global_rate (float): calls per second for all chats together
+        private_rate (float): calls per second to one private chat
+        group_rate (float): calls per second to one group or channel
+        clock (Callable): monotonic clock in seconds
+        sleep (Callable): function to sleep for the given seconds
+        handle_retry_after (bool): when a call fails with `retry_after`, pause
+            the bucket of its chat and repeat the call later; other chats are
+            not affected
+        migrations (ChatMigrations): map of migrated chats; calls to a
+            migrated chat are queued and limited as calls to the new one
+
+    Notes:
+        1) Calls to one chat are run in the order they were submitted, chats
+           are served in the order they become allowed to send.
+        2) Calls without `chat_id` are limited only by the global bucket.
+        3) Calls are run by `run_pending`, which can be called by hand (e.g. in
+           tests with a fake clock), or by the thread started with `start`.
+    """
+
+    api = None
+    max_idle_buckets = 10000
+
+    def __init__(self, api,
+                 global_rate: float = 30,
+                 private_rate: float = 1,
+                 group_rate: float = 20 / 60,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 handle_retry_after: bool = True,
+                 migrations: ChatMigrations = chat_migrations):
+        self.api = api
+        self.handle_retry_after = handle_retry_after
+        self.migrations = migrations
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.clock = clock
+        self.sleep = sleep
+        self.global_bucket = TokenBucket(global_rate, global_rate, clock())
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._queues: Dict[Hashable, deque] = {}
+        self._ready = []  # heap of (time, seq, chat_id)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def __getattr__(self, name: str):
+        if name.startswith('_') or not callable(getattr(self.api, name, None)):
+            raise AttributeError(name)
+        return partial(self.submit, name)
+
+    def bucket(self, chat_id) -> TokenBucket:
+        """Get the token bucket of the chat."""
+        try:
+            return self._buckets[chat_id]
+        except KeyError:
+            bucket = TokenBucket(
+                chat_rate(chat_id, self.private_rate, self.group_rate),
+                1, self.clock())
+            self._buckets[chat_id] = bucket
+            return bucket
+
+    def submit(self, method: str, **kwargs) -> Future:
+        """Queue a call of `Api` method.
+
+        Returns:
+            (Future): future of the result of the call
+        """
+        future = Future()
+        kwargs = self.migrations.apply(kwargs)
+        with self._lock:
+            self._enqueue(_Call(method, kwargs, future))
+        self._wakeup.set()
+        return future
+
+    def _enqueue(self, call: '_Call', first: bool = False):
+        chat_id = call.kwargs.get('chat_id')
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = deque()
+            self._schedule(chat_id, self.clock())
+        if first:
+            queue.appendleft(call)
+        else:
+            queue.append(call)
+
+    def pending(self) -> int:
+        """Number of queued calls."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _schedule(self, chat_id, now: float):
+        delay = self.bucket(chat_id).delay(now) if chat_id is not None else 0
+        heapq.heappush(self._ready, (now + delay, next(self._seq), chat_id))
+
+    def _take(self, now: float) -> Optional[_Call]:
+        """Take the next call allowed to run now."""
+        while self._ready and self._ready[0][0] <= now:
+            global_delay = self.global_bucket.delay(now)
+            if global_delay > 0:
+                return None
+            _, _, chat_id = heapq.heappop(self._ready)
+            if chat_id is not None:
+                bucket = self.bucket(chat_id)
+                delay = bucket.delay(now)
+                if delay > 0:  # e.g. the bucket was paused
+                    heapq.heappush(self._ready,
+                                   (now + delay, next(self._seq), chat_id))
+                    continue
+                bucket.consume(now)
+            self.global_bucket.consume(now)
+            queue = self._queues[chat_id]
+            call = queue.popleft()
+            if queue:
+                self._schedule(chat_id, now)
+            else:
+                del self._queues[chat_id]
+            return call
+        return None
+
+    def _run(self, call: _Call):
+        if not call.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = getattr(self.api, call.method)(**call.kwargs)
+        except UnsuccessfulRequest as exc:
+            if not self._retry_later(call, exc):
+                call.future.set_exception(exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            call.future.set_exception(exc)
+        else:
+            call.future.set_result(result)
+
+    def _retry_later(self, call: _Call, exc: UnsuccessfulRequest) -> bool:
+        """Put the call back to its queue, if Telegram asked to wait."""
+        parameters = error_parameters(exc)
+        if not (self.handle_retry_after and parameters is not None
+                and parameters.retry_after):
+            return False
+        # the future is already running, so a fresh one is kept in the queue
+        # and its outcome is passed to the original future
+        future = Future()
+        future.add_done_callback(partial(_copy_outcome, call.future))
+        chat_id = call.kwargs.get('chat_id')
+        with self._lock:
+            now = self.clock()
+            if chat_id is None:
+                self.global_bucket.pause(now, parameters.retry_after)
+            else:
+                self.bucket(chat_id).pause(now, parameters.retry_after)
+            self._enqueue(_Call(call.method, call.kwargs, future), first=True)
+        return True
+
+    def run_pending(self) -> int:
+        """Run the calls allowed by the limits now.
+
+        Returns:
+            (int): number of calls run
+        """
+        count = 0
+        while True:
+            with self._lock:
+                call = self._take(self.clock())
+            if call is None:
+                break
+            self._run(call)
+            count += 1
+        with self._lock:
+            if len(self._buckets) > self.max_idle_buckets:
+                self._prune(self.clock())
+        return count
+
+    def _prune(self, now: float):
+        """Forget the buckets of idle chats, which are full anyway."""
+        for chat_id in [chat_id for chat_id, bucket in self._buckets.items()
+                        if chat_id not in self._queues
+                        and bucket.is_full(now)]:
+            del self._buckets[chat_id]
+
+    def next_delay(self) -> Optional[float]:
+        """Seconds until the next call can run, None if the queue is empty."""
+        with self._lock:
+            if not self._ready:
+                return None
+            now = self.clock()
+            return max(self._ready[0][0] - now,
+                       self.global_bucket.delay(now), 0.0)
+
+    def run(self, until_empty: bool = True):
+        """Run the calls as soon as the limits allow.
+
+        Args:
+            until_empty (bool): return when the queue is empty, otherwise run
+                until `stop` is called
+        """
+        while not self._stopped:
+            self.run_pending()
+            delay = self.next_delay()
+            if delay is None:
+                if until_empty:
+                    return
+                self._wakeup.wait()
+                self._wakeup.clear()
+            elif delay > 0:
+                if until_empty:
+                    self.sleep(delay)
+                else:
+                    self._wakeup.wait(delay)
+                    self._wakeup.clear()
+
+    def start(self):
+        """Run the calls in a background thread."""
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run, args=(False,),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, the queued calls stay in the queue."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Long polling of updates.
+
+`UpdatePoller` calls `Api.get_updates` in a background thread and puts the
+updates into a bounded queue, from which the handlers take them. The next
+long poll is made while the current batch is being handled, so the network
+wait does not add to the handling time. The offset is tracked by the poller.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> poller = UpdatePoller(Api(token="<paste your token here>"))
+    >>> poller.start()
+    >>> for update in poller:
+    ...     handle(update)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterator, List, Optional
+
+from telegrambotapiwrapper.decoders import Decoders, Mask, get_decoder
+from telegrambotapiwrapper.dedupe import UpdateDeduplicator
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.prefilter import Prefilter
+from telegrambotapiwrapper.response import RESULT_DICT
+from telegrambotapiwrapper.retry import error_parameters
+
+MAX_LIMIT = 100  # maximum `limit` of getUpdates
+
+# error codes, after which polling makes no sense: bad token, webhook is set
+FATAL_ERROR_CODES = frozenset((401, 404, 409))
+
+
+def update_id(update) -> int:
+    """Get `update_id` of the update decoded into an object or a dict."""
+    if isinstance(update, dict):
+        return update['update_id']
+    return update.update_id
+
+
+class UpdatePoller:
+    """Poller of updates with a bounded queue.
+
+    Args:
+        api (Api): client, whose `get_updates` is called; its `result_format`
+            must be objects or dicts
+        timeout (int): timeout of long polling in seconds
+        allowed_updates (List[str]): types of updates to receive
+        offset (int): identifier of the first update to receive; by default
+            the updates not confirmed before are received
+        maxsize (int): maximum number of updates in the queue; the poller waits
+            for free space before the next poll
+        min_limit (int): minimum `limit` of getUpdates
+        max_limit (int): maximum `limit` of getUpdates
+        on_error (Callable): called with the exceptions of the polls, e.g. to
+            log them; the failed poll is repeated after `retry_delay`
+        retry_delay (float): initial delay after a failed poll, it is doubled
+            after every next failure up to `max_retry_delay`
+        max_retry_delay (float): maximum delay after a failed poll
+        clock (Callable): monotonic clock in seconds
+        sleep (Callable): function to sleep for the given seconds
+        prefilter (Prefilter): filter of the updates; the updates are
+            received as dicts, and only the ones passing the filter are
+            decoded and queued
+        decoders (Decoders): decoders of the updates passing the prefilter or
+            decoded with the mask; by default the decoders of `api` are used
+        mask (FieldMask, Iterable[str]): fields of the updates to decode, see
+            `fieldmask`; the updates are received as dicts and decoded with
+            the mask
+        dedupe (UpdateDeduplicator): identifiers of the seen updates; the
+            updates received again, e.g. after a restart with an old offset,
+            are not queued
+
+    Notes:
+        1) `limit` is adapted to the speed of handling: a poll fetches about
+           as many updates as are handled during one round trip of a poll,
+           so the next batch arrives when the current one is handled, and
+           no more updates are fetched than fit in the queue.
+        2) Telegram considers the updates confirmed, when getUpdates is
+           called with a greater offset, i.e. the updates are confirmed by
+           the poll after the one they were queued by. `stop` returns the
+           updates left in the queue.
+        3) Errors 401, 404 (bad token) and 409 (a webhook is set or another
+           poller is running) stop the poller, `get` raises them.
+    """
+
+    smoothing = 0.2  # weight of a new sample in the moving averages
+
+    def __init__(self, api,
+                 timeout: int = 30,
+                 allowed_updates: Optional[List[str]] = None,
+                 offset: Optional[int] = None,
+                 maxsize: int = 1000,
+                 min_limit: int = 1,
+                 max_limit: int = MAX_LIMIT,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 retry_delay: float = 1.0,
+                 max_retry_delay: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 prefilter: Optional[Prefilter] = None,
+                 decoders: Optional[Decoders] = None,
+                 mask: Optional[Mask] = None,
+                 dedupe: Optional[UpdateDeduplicator] = None):
+        self.api = api
+        self.timeout = timeout
+        self.allowed_updates = allowed_updates
+        self.offset = offset
+        self.maxsize = maxsize
+        self.min_limit = min_limit
+        self.max_limit = min(max_limit, MAX_LIMIT)
+        self.on_error = on_error
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.prefilter = prefilter
+        self.dedupe = dedupe
+        self._source = api
+        self._decode = None
+        if prefilter is not None or mask is not None:
+            self._source = api.with_result_format(RESULT_DICT)
+            decoders = decoders or getattr(api, 'decoders', None)
+            self._decode = (get_decoder('Update', mask) if decoders is None
+                            else decoders.get('Update', mask))
+        self.round_trip: Optional[float] = None  # seconds per poll
+        self.handling_time: Optional[float] = None  # seconds per update
+        self.error: Optional[Exception] = None  # the fatal error
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._last_get: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = True
+
+    def _average(self, average: Optional[float], sample: float) -> float:
+        if average is None:
+            return sample
+        return average + self.smoothing * (sample - average)
+
+    def limit(self) -> int:
+        """Get `limit` of the next poll."""
+        with self._lock:
+            free = self.maxsize - len(self._queue)
+        if self.round_trip is None or not self.handling_time:
+            limit = self.max_limit
+        else:
+            limit = round(self.round_trip / self.handling_time)
+        return max(self.min_limit, min(limit, self.max_limit, free))
+
+    def poll(self) -> int:
+        """Make one poll and queue the received updates.
+
+        Returns:
+            (int): number of queued updates
+        """
+        limit = self.limit()
+        started = self.clock()
+        updates = self._source.get_updates(
+            offset=self.offset, limit=limit, timeout=self.timeout,
+            allowed_updates=self.allowed_updates)
+        if not updates:
+            return 0
+        # a poll returning updates is answered at once, so it measures the
+        # round trip; an empty one lasts for the timeout of long polling
+        self.round_trip = self._average(self.round_trip,
+                                        self.clock() - started)
+        self.offset = update_id(updates[-1]) + 1
+        if self.dedupe is not None:
+            updates = [update for update in updates
+                       if self.dedupe.add(update_id(update))]
+        if self.prefilter is not None:
+            updates = [self._decode(update) for update in updates
+                       if self.prefilter(update)]
+        elif self._decode is not None:
+            updates = [self._decode(update) for update in updates]
+        with self._lock:
+            self._queue.extend(updates)
+            self._not_empty.notify_all()
+        return len(updates)
+
+    def _wait_for_space(self):
+        with self._lock:
+            while len(self._queue) >= self.maxsize and not self._stopped:
+                self._not_full.wait()
+
+    def run(self):
+        """Poll until `stop` is called or a fatal error occurs."""
+        delay = self.retry_delay
+        while True:
+            self._wait_for_space()
+            if self._stopped:
+                return
+            try:
+                self.poll()
+            except Exception as exc:  # pylint: disable=broad-except
+                if self._handle_error(exc, delay):
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+            else:
+                delay = self.retry_delay
+
+    def _handle_error(self, exc: Exception, delay: float) -> bool:
+        """Report the error and wait before the next poll.
+
+        Returns:
+            (bool): is the error fatal
+        """
+        if (isinstance(exc, UnsuccessfulRequest)
+                and getattr(exc, 'error_code', None) in FATAL_ERROR_CODES):
+            with self._lock:
+                self.error = exc
+                self._stopped = True
+                self._not_empty.notify_all()
+            return True
+        if self.on_error is not None:
+            self.on_error(exc)
+        parameters = error_parameters(exc)
+        if parameters is not None and parameters.retry_after:
+            delay = parameters.retry_after
+        self.sleep(delay)
+        return False
+
+    def get(self, timeout: Optional[float] = None):
+        """Take the next update from the queue.
+
+        Args:
+            timeout (float): seconds to wait for an update, None means to wait
+                until the poller is stopped
+
+        Returns:
+            the update, None if there is no update within the timeout or the
+            poller is stopped
+
+        Raises:
+            UnsuccessfulRequest: if the poller is stopped by a fatal error
+        """
+        with self._lock:
+            now = self.clock()
+            if self._queue:
+                # the update was waiting, so the time since the previous one
+                # was taken was spent handling it
+                if self._last_get is not None:
+                    self.handling_time = self._average(
+                        self.handling_time, now - self._last_get)
+            elif not self._stopped:
+                self._not_empty.wait_for(
+                    lambda: self._queue or self._stopped, timeout)
+            if not self._queue:
+                self._last_get = None
+                if self.error is not None:
+                    raise self.error
+                return None
+            update = self._queue.popleft()
+            self._last_get = self.clock()
+            self._not_full.notify()
+            return update
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the updates until the poller is stopped."""
+        while True:
+            update = self.get()
+            if update is None:
+                return
+            yield update
+
+    def pending(self) -> int:
+        """Number of queued updates."""
+        with self._lock:
+            return len(self._queue)
+
+    def start(self):
+        """Poll in a background thread."""
+        self.error = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = False) -> list:
+        """Stop polling.
+
+        Args:
+            wait (bool): wait for the current poll to finish; it lasts up to
+                the timeout of long polling, and its updates are queued
+
+        Returns:
+            (list): the updates left in the queue
+        """
+        with self._lock:
+            self._stopped = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if wait and self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            updates = list(self._queue)
+            self._queue.clear()
+            return updates
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
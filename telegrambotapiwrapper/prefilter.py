@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Filtering of updates before they are decoded.
+
+Busy groups send many updates a bot does not react to, e.g. plain chatter
+when it handles only commands. A `Prefilter` drops them by cheap checks of
+the json dict of the update, or even of the raw body of a webhook request,
+so only the updates that pass are decoded into `Update` objects.
+
+Example:
+    >>> bot_filter = kinds('callback_query') | (commands() & chats(-100123))
+    >>> update = webhook_handler(request_body, prefilter=bot_filter)
+    >>> update is None  # dropped without decoding
+    True
+
+Notes:
+    1) A filter checks the raw body first by regular expressions, which can
+       only reject: if the body can match, it is parsed and the dict is
+       checked. Filters combined with `~` skip the check of the raw body.
+"""
+
+import re
+from typing import Callable, Optional, Pattern, Union
+
+from telegrambotapiwrapper import jsoncodec
+from telegrambotapiwrapper.dispatch import MESSAGE_KINDS, UPDATE_KINDS
+from telegrambotapiwrapper.dispatch import chat_id, update_kind
+
+RawPredicate = Callable[[bytes], bool]
+
+
+def _search(pattern: Pattern) -> RawPredicate:
+    return lambda raw: pattern.search(raw) is not None
+
+
+class Prefilter:
+    """Predicate of the json dict of an update.
+
+    Args:
+        predicate (Callable): function of the json dict of the update
+        raw_predicate (Callable): function of the raw json of the update,
+            which returns False only if `predicate` is False for the update,
+            None means the raw json can match
+
+    Notes:
+        1) Filters are combined by `&`, `|` and `~`.
+    """
+
+    __slots__ = ('predicate', 'raw_predicate')
+
+    def __init__(self, predicate: Callable[[dict], bool],
+                 raw_predicate: Optional[RawPredicate] = None):
+        self.predicate = predicate
+        self.raw_predicate = raw_predicate
+
+    def __call__(self, update: dict) -> bool:
+        return self.predicate(update)
+
+    def might_match(self, raw: bytes) -> bool:
+        """Can the update with the raw json match."""
+        return self.raw_predicate is None or self.raw_predicate(raw)
+
+    def parse(self, raw: Union[bytes, str]) -> Optional[dict]:
+        """Get the json dict of the update, None if the update does not
+        match."""
+        if isinstance(raw, str):
+            raw = raw.encode('utf-8')
+        if not self.might_match(raw):
+            return None
+        update = jsoncodec.loads(raw)
+        return update if self.predicate(update) else None
+
+    def __and__(self, other: 'Prefilter') -> 'Prefilter':
+        first, second = self.predicate, other.predicate
+        if self.raw_predicate is None or other.raw_predicate is None:
+            raw_predicate = self.raw_predicate or other.raw_predicate
+        else:
+            raw_first, raw_second = self.raw_predicate, other.raw_predicate
+            raw_predicate = lambda raw: raw_first(raw) and raw_second(raw)
+        return Prefilter(lambda update: first(update) and second(update),
+                         raw_predicate)
+
+    def __or__(self, other: 'Prefilter') -> 'Prefilter':
+        first, second = self.predicate, other.predicate
+        raw_predicate = None
+        if self.raw_predicate is not None and other.raw_predicate is not None:
+            raw_first, raw_second = self.raw_predicate, other.raw_predicate
+            raw_predicate = lambda raw: raw_first(raw) or raw_second(raw)
+        return Prefilter(lambda update: first(update) or second(update),
+                         raw_predicate)
+
+    def __invert__(self) -> 'Prefilter':
+        predicate = self.predicate
+        return Prefilter(lambda update: not predicate(update))
+
+
+def kinds(*names: str) -> Prefilter:
+    """Pass the updates of the kinds, e.g. 'message', 'callback_query'."""
+    for name in names:
+        if name not in UPDATE_KINDS:
+            raise ValueError('unknown kind of updates {!r}'.format(name))
+    allowed = frozenset(names)
+    pattern = re.compile(b'"(?:' + b'|'.join(
+        re.escape(name.encode('ascii')) for name in names) + b')"\\s*:')
+    return Prefilter(lambda update: update_kind(update) in allowed,
+                     _search(pattern))
+
+
+def chats(*ids: int) -> Prefilter:
+    """Pass the updates of the chats, see `dispatch.chat_id`."""
+    allowed = frozenset(ids)
+    pattern = re.compile(b'(?<![0-9-])(?:' + b'|'.join(
+        str(int(id_)).encode('ascii') for id_ in ids) + b')(?![0-9])')
+    return Prefilter(lambda update: chat_id(update) in allowed,
+                     _search(pattern))
+
+
+def _text_pattern(prefix: str) -> Optional[Pattern]:
+    """Pattern of the text starting with the prefix in raw json.
+
+    Notes:
+        1) Json allows to escape '/' as '\\/', other printable ascii
+           characters except quotes and backslashes are not escaped.
+    """
+    if not all(' ' <= char <= '~' and char not in '"\\' for char in prefix):
+        return None
+    parts = []
+    for char in prefix:
+        if char == '/':
+            parts.append(b'\\\\?/')
+        else:
+            parts.append(re.escape(char.encode('ascii')))
+    return re.compile(b'"text"\\s*:\\s*"' + b''.join(parts))
+
+
+def text_startswith(prefix: str) -> Prefilter:
+    """Pass the updates with a message, whose text starts with the prefix."""
+    pattern = _text_pattern(prefix)
+
+    def predicate(update: dict) -> bool:
+        kind = update_kind(update)
+        if kind not in MESSAGE_KINDS:
+            return False
+        text = update[kind].get('text')
+        return text is not None and text.startswith(prefix)
+
+    return Prefilter(predicate,
+                     _search(pattern) if pattern is not None else None)
+
+
+def commands() -> Prefilter:
+    """Pass the updates with a message, whose text starts with '/'."""
+    return text_startswith('/')
+
+
+def has_callback() -> Prefilter:
+    """Pass the callback queries."""
+    return kinds('callback_query')
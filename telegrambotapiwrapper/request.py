@@ -3,7 +3,11 @@
 
 """The functionality associated with requests to Telegram Bot Api."""
 
-import jsonpickle
+import dataclasses
+from functools import lru_cache
+from typing import Tuple
+
+from telegrambotapiwrapper import jsoncodec
 
 
 def replace__from___to__from(d: dict):
@@ -22,29 +26,53 @@ def replace__from___to__from(d: dict):
     return res
 
 
-def json_payload(args: dict) -> str:
-    """Get the string containing the object to send to Telegram Bot Api.
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Get names of the dataclass fields."""
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
+_PRIMITIVES = (str, int, float, bool)
+
+
+def to_jsonable(obj):
+    """Convert the object into json-compatible python objects.
+
+    The object graph is walked once. In the same pass None values are dropped
+    from dicts and dataclasses, and the keys `from_` are renamed to `from`.
+
+    Notes:
+        1) None values inside lists are kept, as before.
+        2) Objects, that are not dataclasses, dicts, lists or primitives, are
+           converted by their `__dict__`.
+    """
+    if obj is None or isinstance(obj, _PRIMITIVES):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(item) for item in obj]
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif dataclasses.is_dataclass(obj):
+        items = ((name, getattr(obj, name))
+                 for name in _field_names(type(obj)))
+    else:
+        items = vars(obj).items()
+    res = {}
+    for key, value in items:
+        if value is None:
+            continue
+        if key == 'from_':
+            key = 'from'
+        res[key] = to_jsonable(value)
+    return res
+
+
+def json_payload(args) -> bytes:
+    """Get the compact json containing the object to send to Telegram Bot Api.
     Args:
         args(dict): data dictionary to send
     Returns:
-        (str): a json-string containing the object to be sent to Telegram Bot
-            Api.
+        (bytes): utf-8 encoded json containing the object to be sent to
+            Telegram Bot Api.
     """
-
-    def remove_none_values(d):
-        """Delete None values."""
-        if not isinstance(d, (dict, list)):
-            return d
-        if isinstance(d, list):
-            return [remove_none_values(v) for v in d]
-        return {
-            k: remove_none_values(v)
-            for k, v in d.items() if v is not None
-        }
-
-    jstr = jsonpickle.encode(args, unpicklable=False)
-    py_obj = jsonpickle.decode(jstr)
-    py_obj = remove_none_values(py_obj)
-    py_obj = replace__from___to__from(py_obj)
-    jstr = jsonpickle.dumps(py_obj)
-    return jstr
\ No newline at end of file
+    return jsoncodec.dumps(to_jsonable(args))
@@ -2,15 +2,33 @@
 # Copyright (c) 2019 Dzmitry Maliuzhenets; MIT License
 
 """Response functionality from Telegram Bot Api."""
-import jsonpickle
+import json
+import re
+from typing import Union
 
 import telegrambotapiwrapper.typelib as types_module
-from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper import jsoncodec
+from telegrambotapiwrapper.annotation import TypeNode, type_node
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.decoders import Decoders, get_decoder
 from telegrambotapiwrapper.errors import UnsuccessfulRequest
 from telegrambotapiwrapper.request import json_payload
 from telegrambotapiwrapper.typelib import ResponseParameters
 
 
+api_types = types_by_name(types_module)
+
+# formats of the results of `Api` methods
+RESULT_OBJECTS = 'objects'  # api types
+RESULT_DICT = 'dict'  # parsed json, e.g. dicts with `from` keys
+RESULT_BYTES = 'bytes'  # json bytes sliced from the response body
+RESULT_FORMATS = (RESULT_OBJECTS, RESULT_DICT, RESULT_BYTES)
+
+_ok_result_re = re.compile(rb'^\s*\{\s*"ok"\s*:\s*true\s*,\s*"result"\s*:')
+_end_re = re.compile(r'\s*\}\s*$')
+_raw_decode = json.JSONDecoder().raw_decode
+
+
 def is_str_int_float_bool(value):
     """Is value str, int, float, bool."""
     return isinstance(value, (int, str, float))
@@ -19,7 +37,7 @@ def is_str_int_float_bool(value):
 def dataclass_fields_to_jdict(fields: dict) -> dict:
     """Get a json-like dict from the dataclass fields."""
     jstr = json_payload(fields)
-    res = jsonpickle.decode(jstr)
+    res = jsoncodec.loads(jstr)
     return res
 
 
@@ -39,7 +57,7 @@ def replace__from__by__from_(d: dict):
     return res
 
 
-def to_api_type(obj, anno: AnnotationWrapper):
+def to_api_type(obj, anno):
     """Convert object to api type
     Convert the result of the request to the Telegram Bot API into the
     appropriate type.
@@ -82,13 +100,13 @@ def to_api_type(obj, anno: AnnotationWrapper):
             For the current version of Telegram Bot Api (4.2), return values ​​
             may have the following `union`- annotations:
                 'Union [Message, bool]'
-        2)
+        2) `anno` can be a string, `AnnotationWrapper` or `TypeNode`, it is
+           parsed once into `TypeNode`.
     """
 
-    def list_to_api_type(obj: list, anno: AnnotationWrapper) -> list:
+    def list_to_api_type(obj: list, anno: TypeNode) -> list:
         """Convert list to api type."""
-        inner_part = anno.inner_part_of_list.sanitized.data
-        api_type = getattr(types_module, inner_part)
+        api_type = api_types[anno.inner.text]
 
         res = []
         for item in obj:
@@ -96,31 +114,32 @@ def to_api_type(obj, anno: AnnotationWrapper):
             for field_name, field_type in api_type._annotations().items():
                 try:
                     to_type[field_name] = to_api_type(
-                        item[field_name], AnnotationWrapper(field_type))
+                        item[field_name], type_node(field_type))
                 except KeyError:
                     continue
             res.append(api_type(**to_type))
         return res
 
-    def list_of_list_to_api_type(obj: list, anno: AnnotationWrapper):
+    def list_of_list_to_api_type(obj: list, anno: TypeNode):
         """Convert list of list to api type."""
         res = []
         for lst in obj:
-            res.append(list_to_api_type(lst, anno.inner_part_of_list))
+            res.append(list_to_api_type(lst, anno.inner))
         return res
 
-    def union_to_api_type(obj, anno: AnnotationWrapper):
+    def union_to_api_type(obj, anno: TypeNode):
         """Convert union to api type."""
-        if anno == 'Union[Message, bool]':
-            return to_api_type(obj, AnnotationWrapper('Message'))
-        elif anno == 'Union[InputFile, str]]':
-            return to_api_type(obj, AnnotationWrapper('InputFile'))
+        if anno.text == 'Union[Message, bool]':
+            return to_api_type(obj, type_node('Message'))
+        elif anno.text == 'Union[InputFile, str]]':
+            return to_api_type(obj, type_node('InputFile'))
 
     if is_str_int_float_bool(obj):
         return obj
 
+    anno = type_node(anno)
     if anno.is_optional:
-        anno = anno.inner_part_of_optional
+        anno = anno.inner
 
     if anno.is_list:
         return list_to_api_type(obj, anno)
@@ -131,27 +150,29 @@ def to_api_type(obj, anno: AnnotationWrapper):
 
     if isinstance(obj, dict):
         to_type = {}
-        api_type = getattr(types_module, anno.sanitized.data)
+        api_type = api_types[anno.text]
 
         for field_name, field_type in api_type._annotations().items():
             try:
                 to_type[field_name] = to_api_type(
-                    obj[field_name], AnnotationWrapper(field_type))
+                    obj[field_name], type_node(field_type))
             except KeyError:
                 continue
         return api_type(**to_type)
 
-def get_result(raw_response: str):
+def get_result(raw_response: Union[bytes, str]):
     """Extract the result from the raw response from the Bot API telegram.
     Args:
-        raw_response (str): `raw` response from Bot API telegram
+        raw_response (bytes, str): `raw` response from Bot API telegram
     Raises:
         RequestResultIsNotOk: if the answer contains no result
     Note:
         If raw_response does not contain an `ok` field, then we assume that this
         is an extracted result, for example, for testing purposes.
     """
-    response = jsonpickle.loads(raw_response)
+    response = jsoncodec.loads(raw_response)
+    if 'ok' not in response:
+        return response
     ok_field = response['ok']
     if ok_field: # TODO: проверить тип ok_field т.е. что это булевское значение, а не строка
         return response['result']
@@ -175,16 +196,67 @@ def get_result(raw_response: str):
 
 
 
-def handle_response(raw_response: str,
-                    method_response_type: AnnotationWrapper):
+def handle_response(raw_response: Union[bytes, str],
+                    method_response_type, mask=None):
     """Parse a string that is a response from the Telegram Bot API.
     Args:
-        raw_response (str): response from Telegram Bot API
-        method_response_type (AnnotationWrapper): annotation of the expected
-            response
+        raw_response (bytes, str): response from Telegram Bot API
+        method_response_type (TypeNode, AnnotationWrapper, str): annotation
+            of the expected response
+        mask (FieldMask, Iterable[str]): fields to decode, e.g.
+            ['message.chat.id', 'message.text']; by default all the fields
     Raises:
         RequestResultIsNotOk: if the answer contains no result
+    Notes:
+        1) The result is converted by the compiled decoder of the annotation
+           (see `decoders` module), `to_api_type` is not used.
+    """
+    return get_decoder(method_response_type, mask)(get_result(raw_response))
+
+
+def get_result_bytes(raw_response: bytes) -> bytes:
+    """Get the result from the response as json bytes.
+
+    Notes:
+        1) Telegram Bot Api sends successful responses as
+           `{"ok":true,"result":...}`, so the json of the result is sliced
+           from the body, when it is the last field. Responses of another
+           layout, e.g. `{"ok":true,"result":true,"description":"..."}` or
+           unsuccessful ones, are parsed: `get_result` raises the error.
+    """
+    match = _ok_result_re.match(raw_response)
+    if match is not None:
+        text = raw_response[match.end():].decode('utf-8')
+        start = len(text) - len(text.lstrip())
+        try:
+            _, end = _raw_decode(text, start)
+        except ValueError:
+            end = None
+        if end is not None and _end_re.match(text, end):
+            return text[start:end].encode('utf-8')
+    return jsoncodec.dumps(get_result(raw_response))
+
+
+def decode_result(raw, anno, decoders: Decoders = None, mask=None):
+    """Decode the raw result into the api type on demand.
+
+    Args:
+        raw (bytes, dict, list, ...): result returned with `RESULT_BYTES` or
+            `RESULT_DICT` format
+        anno (str, TypeNode): annotation of the result, e.g. 'List[Update]'
+        decoders (Decoders): decoders, e.g. `slotted.decoders`; by default
+            the result is decoded into the types of `typelib`
+        mask (FieldMask, Iterable[str]): fields to decode, by default all the
+            fields
+
+    Example:
+        >>> raw = bot_api.with_result_format(RESULT_BYTES).get_updates()
+        >>> queue.put(raw)
+        ...
+        >>> updates = decode_result(queue.get(), 'List[Update]')
     """
-    res = get_result(raw_response)
-    res = replace__from__by__from_(res)
-    return to_api_type(res, method_response_type)
\ No newline at end of file
+    if isinstance(raw, (bytes, bytearray)):
+        raw = jsoncodec.loads(raw)
+    decoder = (get_decoder(anno, mask) if decoders is None
+               else decoders.get(anno, mask))
+    return decoder(raw)
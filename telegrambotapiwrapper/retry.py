@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Automatic handling of `retry_after` and `migrate_to_chat_id`.
+
+When a request is unsuccessful, Telegram Bot Api can return
+`ResponseParameters`, which tell how to handle the error:
+    * retry_after - the number of seconds to wait before the request can be
+      repeated (flood control);
+    * migrate_to_chat_id - the group has been migrated to a supergroup with
+      the specified id.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> bot_api = Api(token="<paste your token here>",
+    ...               retry_policy=RetryPolicy(max_retries=3))
+    >>> bot_api.send_message(chat_id=-321532153215, text="Hello")
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+
+CHAT_ID_PARAMS = ('chat_id', 'from_chat_id')
+
+
+class ChatMigrations:
+    """Map of migrated group ids to the ids of the new supergroups."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._migrations: Dict[int, int] = {}
+
+    def add(self, old_chat_id: int, new_chat_id: int):
+        """Remember the migration."""
+        with self._lock:
+            self._migrations[old_chat_id] = new_chat_id
+
+    def get(self, chat_id):
+        """Get the current id of the chat."""
+        return self._migrations.get(chat_id, chat_id)
+
+    def apply(self, args: dict) -> dict:
+        """Replace the ids of migrated chats in the arguments of a call.
+
+        Returns:
+            (dict): the same dict if no chat has been migrated, a new dict
+                otherwise
+        """
+        if not self._migrations:
+            return args
+        for name in CHAT_ID_PARAMS:
+            chat_id = args.get(name)
+            if chat_id is not None and chat_id in self._migrations:
+                args = dict(args)
+                args[name] = self._migrations[chat_id]
+        return args
+
+    def __len__(self):
+        return len(self._migrations)
+
+
+chat_migrations = ChatMigrations()  # shared by all the clients of the process
+
+
+def error_parameters(exc: UnsuccessfulRequest):
+    """Get `ResponseParameters` of the error, None if there are no ones."""
+    return getattr(exc, 'parameters', None)
+
+
+class RetryPolicy:
+    """Policy of repeating unsuccessful requests.
+
+    Args:
+        max_retries (int): maximum number of repeats of one call
+        handle_retry_after (bool): sleep `retry_after` seconds and repeat the
+            call; the sleep blocks only the thread making the call. Disable it,
+            when the calls are made by `Outbox`, which pauses only the bucket
+            of the chat instead.
+        handle_migration (bool): repeat the call to the new supergroup
+        migrations (ChatMigrations): map of migrations, by default the one
+            shared by the process
+        sleep (Callable): function to sleep for the given seconds
+
+    Notes:
+        1) Before every call the ids of the already known migrated chats are
+           replaced, so the failing round-trip is made only once per chat.
+        2) Only the calls without files are repeated, since the files can be
+           read only once.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 handle_retry_after: bool = True,
+                 handle_migration: bool = True,
+                 migrations: ChatMigrations = chat_migrations,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_retries = max_retries
+        self.handle_retry_after = handle_retry_after
+        self.handle_migration = handle_migration
+        self.migrations = migrations
+        self.sleep = sleep
+
+    def call(self, request: Callable[[dict], object], args: dict):
+        """Make the request with the arguments according to the policy."""
+        if self.handle_migration:
+            args = self.migrations.apply(args)
+        retries = 0
+        while True:
+            try:
+                return request(args)
+            except UnsuccessfulRequest as exc:
+                parameters = error_parameters(exc)
+                if parameters is None or retries >= self.max_retries:
+                    raise
+                if (self.handle_migration and parameters.migrate_to_chat_id
+                        and args.get('chat_id') is not None):
+                    self.migrations.add(args['chat_id'],
+                                        parameters.migrate_to_chat_id)
+                    args = dict(args, chat_id=parameters.migrate_to_chat_id)
+                elif self.handle_retry_after and parameters.retry_after:
+                    self.sleep(parameters.retry_after)
+                else:
+                    raise
+                retries += 1
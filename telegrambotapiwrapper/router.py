@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Routing of updates to their handlers.
+
+`Router` finds the handler of an update by lookups instead of trying the
+handlers one by one: the kind of the update (the field of `Update`, that is
+set) is looked up in a dict, bot commands and `callback_data` are looked up
+in prefix tries, so the cost of routing does not depend on the number of
+handlers.
+
+Example:
+    >>> router = Router(username='somebot')
+    >>> @router.command('start')
+    ... def start(update):
+    ...     return MethodCall('send_message', chat_id=update.message.chat.id,
+    ...                       text='Hello')
+    >>> @router.callback('vote:')
+    ... def vote(update):
+    ...     ...
+    >>> @router.on('message')
+    ... def echo(update):
+    ...     ...
+    >>> server = WebhookServer(router, reply_in_response=True)
+"""
+
+from typing import Callable, Dict, Iterable, Optional
+
+from telegrambotapiwrapper.dispatch import UPDATE_KINDS, get_field
+from telegrambotapiwrapper.dispatch import update_kind
+
+Handler = Callable
+
+
+class PrefixTrie:
+    """Trie of strings with values.
+
+    Notes:
+        1) Lookups take time proportional to the length of the looked up
+           string, not to the number of the strings in the trie.
+    """
+
+    __slots__ = ('_root', '_size')
+
+    _VALUE = ''  # key of the value in a node, no character is empty
+
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def __setitem__(self, key: str, value):
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        if self._VALUE not in node:
+            self._size += 1
+        node[self._VALUE] = value
+
+    def get(self, key: str, default=None):
+        """Get the value of the string."""
+        node = self._root
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return default
+        return node.get(self._VALUE, default)
+
+    def longest_prefix(self, key: str, default=None):
+        """Get the value of the longest string in the trie, that is a prefix
+        of the key."""
+        node = self._root
+        value = node.get(self._VALUE, default)
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            value = node.get(self._VALUE, value)
+        return value
+
+    def __len__(self):
+        return self._size
+
+
+def message_command(message) -> Optional[tuple]:
+    """Get the bot command, with which the message starts.
+
+    Returns:
+        (Tuple[str, str]): the command without '/' and the username of the
+            bot it is addressed to (empty if it is not specified), e.g.
+            ('start', 'somebot') for '/start@somebot', None if the message
+            does not start with a command
+
+    Notes:
+        1) The command is found by the entity of type `bot_command` at offset
+           0, so a text like '/ 2' is not a command.
+        2) Commands consist of latin letters, digits and underscores, so the
+           offsets in UTF-16 units, which Telegram uses, are the offsets in
+           the string.
+    """
+    entities = get_field(message, 'entities')
+    if not entities:
+        return None
+    entity = entities[0]
+    if (get_field(entity, 'type') != 'bot_command'
+            or get_field(entity, 'offset')):
+        return None
+    text = get_field(message, 'text')
+    command, _, username = text[1:get_field(entity, 'length')].partition('@')
+    return command, username
+
+
+def _check_kinds(kinds: Iterable[str]):
+    for kind in kinds:
+        if kind not in UPDATE_KINDS:
+            raise ValueError('unknown kind of updates {!r}'.format(kind))
+
+
+class Router:
+    """Router of updates.
+
+    Args:
+        username (str): username of the bot; commands addressed to other
+            bots, e.g. '/start@otherbot', are routed as plain messages
+
+    Notes:
+        1) The router is a handler itself: calling it routes the update and
+           returns the result of its handler, so it can be passed to
+           `ChatDispatcher`, `WebhookServer`, etc.
+        2) The handlers are looked up in order: a command, a `callback_data`
+           prefix, the kind of the update, the default handler.
+        3) Updates can be `Update` objects or their json dicts.
+    """
+
+    def __init__(self, username: Optional[str] = None):
+        self.username = username.lower().lstrip('@') if username else None
+        self._kinds: Dict[str, Handler] = {}
+        self._commands: Dict[str, PrefixTrie] = {}
+        self._callbacks = PrefixTrie()
+        self._default: Optional[Handler] = None
+
+    def add(self, kind: str, handler: Handler):
+        """Route the updates of the kind, e.g. 'inline_query'."""
+        _check_kinds((kind,))
+        self._kinds[kind] = handler
+
+    def add_command(self, name: str, handler: Handler,
+                    kinds: Iterable[str] = ('message',)):
+        """Route the messages starting with the command, e.g. 'start'.
+
+        Args:
+            name (str): command without '/'
+            kinds (Iterable[str]): kinds of updates with the messages, e.g.
+                ('message', 'channel_post')
+        """
+        _check_kinds(kinds)
+        for kind in kinds:
+            commands = self._commands.setdefault(kind, PrefixTrie())
+            commands[name.lower()] = handler
+
+    def add_callback(self, prefix: str, handler: Handler):
+        """Route the callback queries, whose data starts with the prefix.
+
+        Notes:
+            1) The handler of the longest matching prefix is chosen, so e.g.
+               'vote:' and 'vote:cancel' can be routed to different handlers.
+        """
+        self._callbacks[prefix] = handler
+
+    def set_default(self, handler: Handler):
+        """Route the updates, for which there is no other route."""
+        self._default = handler
+
+    def on(self, kind: str) -> Callable[[Handler], Handler]:
+        """Decorator of the handler of the kind of updates."""
+        _check_kinds((kind,))
+        return self._decorator(self.add, kind)
+
+    def command(self, name: str, kinds: Iterable[str] = ('message',)
+                ) -> Callable[[Handler], Handler]:
+        """Decorator of the handler of the command."""
+        _check_kinds(kinds)
+        return self._decorator(self.add_command, name, kinds=kinds)
+
+    def callback(self, prefix: str) -> Callable[[Handler], Handler]:
+        """Decorator of the handler of the callback data prefix."""
+        return self._decorator(self.add_callback, prefix)
+
+    def default(self, handler: Handler) -> Handler:
+        """Decorator of the default handler."""
+        self.set_default(handler)
+        return handler
+
+    @staticmethod
+    def _decorator(add: Callable, *args, **kwargs):
+        def decorator(handler: Handler) -> Handler:
+            add(*args, handler, **kwargs)
+            return handler
+
+        return decorator
+
+    def route(self, update) -> Optional[Handler]:
+        """Find the handler of the update, None if there is no route."""
+        kind = update_kind(update)
+        if kind is None:
+            return self._default
+        value = get_field(update, kind)
+        commands = self._commands.get(kind)
+        if commands is not None:
+            command = message_command(value)
+            if command is not None and (
+                    not command[1] or self.username is None
+                    or command[1].lower() == self.username):
+                handler = commands.get(command[0].lower())
+                if handler is not None:
+                    return handler
+        elif kind == 'callback_query' and len(self._callbacks):
+            data = get_field(value, 'data')
+            if data is not None:
+                handler = self._callbacks.longest_prefix(data)
+                if handler is not None:
+                    return handler
+        return self._kinds.get(kind, self._default)
+
+    def __call__(self, update):
+        """Handle the update with its handler.
+
+        Returns:
+            the result of the handler, None if there is no route
+        """
+        handler = self.route(update)
+        if handler is None:
+            return None
+        return handler(update)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Slotted variants of the api types.
+
+Every type of `typelib` has a variant here with the same name, fields,
+constructor, equality and `from_` field, but its instances keep the fields in
+`__slots__` instead of a per-instance `__dict__`, so they take much less
+memory, e.g. when the recent updates are kept in memory.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> from telegrambotapiwrapper import slotted
+    >>> bot_api = Api(token="<paste your token here>",
+    ...               decoders=slotted.decoders)
+    >>> updates = bot_api.get_updates()
+    >>> type(updates[0])
+    <class 'telegrambotapiwrapper.slotted.Update'>
+"""
+
+import dataclasses
+from typing import Callable
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.decoders import Decoders
+
+
+def make_slotted(cls: type, module: str = __name__) -> type:
+    """Make a variant of the dataclass with `__slots__`.
+
+    Notes:
+        1) The class is recreated the same way as `dataclass(slots=True)` of
+           Python 3.10 does it: the generated methods are reused, the class
+           attributes holding the defaults are dropped (the defaults are kept
+           by `__init__` and the fields).
+    """
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+    namespace['__slots__'] = names
+    namespace['__module__'] = module
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _make_all():
+    for name, cls in types_by_name(typelib).items():
+        if dataclasses.is_dataclass(cls):
+            globals()[name] = make_slotted(cls)
+
+
+_make_all()
+
+decoders = Decoders(types=__name__)
+
+
+def get_decoder(anno) -> Callable:
+    """Get the decoder of the type described by the annotation into the
+    slotted variants of the api types."""
+    return decoders.get(anno)
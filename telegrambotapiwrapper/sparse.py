@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""Sparse variants of the api types.
+
+Most fields of the api types are optional, and a typical object sets only a
+few of them, e.g. a text message sets five of about sixty fields of `Message`.
+Every type of `typelib` has a variant here, whose instances store only the
+fields that differ from their defaults; the other fields are answered by the
+class attributes holding the defaults. The variants are subclasses of the
+`typelib` types with the same constructor, equality, repr and
+`_fields_items`.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> from telegrambotapiwrapper import sparse
+    >>> bot_api = Api(token="<paste your token here>",
+    ...               decoders=sparse.decoders)
+    >>> message = bot_api.send_message(chat_id=1, text='Hello')
+    >>> message.text, message.photo
+    ('Hello', None)
+    >>> len(vars(message))
+    5
+"""
+
+import dataclasses
+from typing import Callable
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.decoders import Decoders
+
+
+def _sparse_init(cls: type) -> Callable:
+    """Build `__init__`, which stores only the fields with values other than
+    the defaults.
+
+    Notes:
+        1) Like `dataclass` does it, the source of `__init__` is generated, so
+           the fields are assigned without loops and lookups.
+        2) The defaults are compared by identity, as they are None for all
+           the api types.
+    """
+    params, body, namespace = [], [], {}
+    for field in dataclasses.fields(cls):
+        if field.default is dataclasses.MISSING:
+            params.append(field.name)
+            body.append('    self.{0} = {0}'.format(field.name))
+        else:
+            default = '_dflt_' + field.name
+            namespace[default] = field.default
+            params.append('{}={}'.format(field.name, default))
+            body.append('    if {0} is not {1}:\n'
+                        '        self.{0} = {0}'.format(field.name, default))
+    source = 'def __init__(self, {}):\n{}\n'.format(
+        ', '.join(params), '\n'.join(body) or '    pass')
+    exec(source, namespace)  # pylint: disable=exec-used
+    init = namespace['__init__']
+    init.__qualname__ = cls.__qualname__ + '.__init__'
+    return init
+
+
+def make_sparse(cls: type, module: str = __name__) -> type:
+    """Make a sparse variant of the api type."""
+    return type(cls)(cls.__name__, (cls,), {
+        '__init__': _sparse_init(cls),
+        '__module__': module,
+        '__doc__': cls.__doc__,
+    })
+
+
+def _make_all():
+    for name, cls in types_by_name(typelib).items():
+        if dataclasses.is_dataclass(cls):
+            globals()[name] = make_sparse(cls)
+
+
+_make_all()
+
+decoders = Decoders(types=__name__)
+
+
+def get_decoder(anno) -> Callable:
+    """Get the decoder of the type described by the annotation into the
+    sparse variants of the api types."""
+    return decoders.get(anno)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""HTTP transport with a persistent pool of connections to Telegram Bot Api.
+
+Example:
+    >>> from telegrambotapiwrapper import Api
+    >>> from telegrambotapiwrapper.transport import Transport
+    >>> transport = Transport(pool_maxsize=20)
+    >>> first_bot_api = Api(token="<first token>", transport=transport)
+    >>> second_bot_api = Api(token="<second token>", transport=transport)
+    >>> transport.stats
+    TransportStats(requests=0, new_connections=0, reused_connections=0)
+"""
+
+import functools
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class TransportStats:
+    """Counters of requests and connections of a transport.
+
+    Attributes:
+        requests (int): number of requests sent through the transport
+        new_connections (int): number of request attempts, for which a new
+            connection was opened
+        reused_connections (int): number of request attempts sent over an
+            already opened connection
+
+    Notes:
+        1) Retries are separate attempts, so with `max_retries` > 0
+           `new_connections + reused_connections` can exceed `requests`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_attempt(self, reused: bool):
+        with self._lock:
+            if reused:
+                self.reused_connections += 1
+            else:
+                self.new_connections += 1
+
+    def __repr__(self):
+        return "{}(requests={}, new_connections={}, reused_connections={})" \
+            .format(self.__class__.__name__, self.requests,
+                    self.new_connections, self.reused_connections)
+
+
+def _is_closed(conn) -> bool:
+    """Is the connection not opened yet or already closed."""
+    try:
+        return conn.is_closed
+    except AttributeError:  # urllib3 < 2
+        return conn.sock is None
+
+
+class _CountingPoolMixin:
+    """Pool of connections that counts new and reused connections."""
+
+    def __init__(self, *args, stats: TransportStats, **kwargs):
+        self.stats = stats
+        super().__init__(*args, **kwargs)
+
+    def _make_request(self, conn, *args, **kwargs):
+        self.stats.count_attempt(reused=not _is_closed(conn))
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+def _counting_pool_classes(stats: TransportStats) -> dict:
+    """Pool classes for `PoolManager.pool_classes_by_scheme`."""
+    return {
+        'http': functools.partial(_CountingHTTPConnectionPool, stats=stats),
+        'https': functools.partial(_CountingHTTPSConnectionPool, stats=stats),
+    }
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests and connections."""
+
+    def __init__(self, stats: TransportStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(
+            self.stats)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        is_new = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if is_new:
+            manager.pool_classes_by_scheme = _counting_pool_classes(
+                self.stats)
+        return manager
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        self.stats.count_request()
+        return super().send(request, **kwargs)
+
+
+class Transport:
+    """Long-lived pool of HTTP connections.
+
+    One transport can be shared by several `Api` instances. It is safe to use
+    it from several threads.
+
+    Args:
+        pool_connections (int): number of hosts, for which pools of
+            connections are kept
+        pool_maxsize (int): maximum number of connections kept to one host
+        pool_block (bool): wait for a free connection instead of opening an
+            extra one, when all `pool_maxsize` connections are busy
+        keep_alive (bool): keep connections open between requests
+        max_retries (int): number of retries of failed connection attempts
+        timeout (float): timeout of requests in seconds, None means no timeout
+
+    Attributes:
+        session (requests.Session): underlying session
+        stats (TransportStats): counters of requests and connections
+    """
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 max_retries: int = 0,
+                 timeout: Optional[float] = None):
+        self.stats = TransportStats()
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = _CountingAdapter(self.stats,
+                                   pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block,
+                                   max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request over the pooled connections."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send POST request over the pooled connections."""
+        return self.request('POST', url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send GET request over the pooled connections."""
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        """Close all connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
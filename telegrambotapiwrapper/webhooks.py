@@ -1,19 +1,166 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2019 Dzmitry Maliuzhenets; MIT License
 
-from telegrambotapiwrapper.annotation import AnnotationWrapper
-from telegrambotapiwrapper.response import handle_response
+from typing import Iterable, List, Optional, Tuple, Union
+
+from telegrambotapiwrapper import Api
+from telegrambotapiwrapper.annotation import type_node
+from telegrambotapiwrapper.callplan import get_call_plan
+from telegrambotapiwrapper.decoders import Decoders, Mask, get_decoder
+from telegrambotapiwrapper.dedupe import UpdateDeduplicator
+from telegrambotapiwrapper.prefilter import Prefilter
+from telegrambotapiwrapper.request import json_payload
+from telegrambotapiwrapper.response import get_result
 from telegrambotapiwrapper.typelib import Update
 
 
-def webhook_handler(request: str) -> Update:
+def webhook_handler(request: Union[bytes, str],
+                    decoders: Optional[Decoders] = None,
+                    prefilter: Optional[Prefilter] = None,
+                    mask: Optional[Mask] = None,
+                    dedupe: Optional[UpdateDeduplicator] = None
+                    ) -> Optional[Update]:
     """Process a request from Telegram Bot Api containing Update.
 
     Args:
-        request (str): string representing a request from Telegra Bot Api
+        request (bytes, str): body of a request from Telegram Bot Api; it is
+            parsed by the codec of `jsoncodec`
+        decoders (Decoders): decoders of the update, e.g. `slotted.decoders`;
+            by default the update is decoded into `typelib.Update`
+        prefilter (Prefilter): filter of the raw update; the updates, that do
+            not pass it, are not decoded
+        mask (FieldMask, Iterable[str]): fields of the update to decode, e.g.
+            ['message.chat.id', 'message.text']; by default all the fields
+        dedupe (UpdateDeduplicator): identifiers of the seen updates; the
+            repeated updates are not decoded
     Return:
-        (Update): update object
+        (Update): update object, None if it does not pass the prefilter or
+            has been seen
     Raises:
         RequestResultIsNotOk: if the answer contains no result
     """
-    return handle_response(request, AnnotationWrapper("Update"))
+    if dedupe is not None and not dedupe.is_new_raw(request):
+        return None
+    if prefilter is not None:
+        update = prefilter.parse(request)
+        if update is None:
+            return None
+    else:
+        update = get_result(request)
+    if decoders is None:
+        return get_decoder(type_node("Update"), mask)(update)
+    return decoders.get(type_node("Update"), mask)(update)
+
+
+class MethodCall:
+    """Call of `Api` method, which a webhook handler returns to be made.
+
+    Telegram Bot Api allows to make one call in the response to a webhook
+    request, which saves a request of the bot to Telegram.
+
+    Args:
+        method (str): name of `Api` method, e.g. 'send_message'
+        **kwargs: arguments of the method
+
+    Raises:
+        TypeError: if `Api` has no such method or it takes no such arguments
+
+    Example:
+        >>> def handle(update):
+        ...     return MethodCall('send_message',
+        ...                       chat_id=update.message.chat.id, text='Hi')
+    """
+
+    __slots__ = ('method', 'kwargs', 'tg_method_name')
+
+    def __init__(self, method: str, **kwargs):
+        func = getattr(Api, method, None)
+        if method.startswith('_') or not callable(func):
+            raise TypeError('Api has no method {!r}'.format(method))
+        plan = get_call_plan(Api, method)
+        unexpected = kwargs.keys() - plan.param_names
+        if unexpected:
+            raise TypeError('{}() got unexpected arguments {}'.format(
+                method, sorted(unexpected)))
+        missing = plan.required_names - kwargs.keys()
+        if missing:
+            raise TypeError('{}() missing required arguments {}'.format(
+                method, sorted(missing)))
+        self.method = method
+        self.kwargs = kwargs
+        self.tg_method_name = plan.tg_method_name
+
+    @property
+    def can_reply(self) -> bool:
+        """Can the call be made in the response to a webhook request.
+
+        Notes:
+            1) Files to upload can not be sent in the response, which is
+               json, so the calls uploading streams are made by the client.
+        """
+        return not any(hasattr(value, 'read')
+                       for value in self.kwargs.values())
+
+    def payload(self) -> bytes:
+        """Get the body of the response to a webhook request."""
+        return json_payload({'method': self.tg_method_name, **self.kwargs})
+
+    def __call__(self, api):
+        """Make the call with the client, e.g. `Api` or `AsyncApi`."""
+        return getattr(api, self.method)(**self.kwargs)
+
+    def __eq__(self, other):
+        if not isinstance(other, MethodCall):
+            return NotImplemented
+        return (self.method, self.kwargs) == (other.method, other.kwargs)
+
+    def __repr__(self):
+        return '{}({!r}, {})'.format(
+            self.__class__.__name__, self.method,
+            ', '.join('{}={!r}'.format(k, v) for k, v in self.kwargs.items()))
+
+
+def method_calls(result) -> List[MethodCall]:
+    """Get the calls returned by a webhook handler.
+
+    Args:
+        result: None, a `MethodCall` or an iterable of them
+    """
+    if result is None:
+        return []
+    if isinstance(result, MethodCall):
+        return [result]
+    return list(result)
+
+
+def webhook_reply(result: Union[None, MethodCall, Iterable[MethodCall]]
+                  ) -> Tuple[bytes, List[MethodCall]]:
+    """Split the calls returned by a webhook handler.
+
+    Args:
+        result: None, a `MethodCall` or an iterable of them
+
+    Returns:
+        (bytes, List[MethodCall]): body of the response to the webhook
+            request with the first call, that can be made in the response,
+            (empty if there is none) and the other calls, which must be
+            made by the client in the order they were returned
+
+    Notes:
+        1) Telegram does not report the result of the call made in the
+           response, so calls, whose result is needed, should be made by the
+           client.
+        2) Telegram makes the call from the response after it receives the
+           response, so it is not ordered with the calls made by the client.
+
+    Example:
+        >>> body, calls = webhook_reply(handle(webhook_handler(request)))
+        >>> # respond to the request with `body` as application/json
+        >>> for call in calls:
+        ...     call(bot_api)
+    """
+    calls = method_calls(result)
+    for i, call in enumerate(calls):
+        if call.can_reply:
+            return call.payload(), calls[:i] + calls[i + 1:]
+    return b'', calls
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Dzmitry Maliuzhenets; MIT License
+
+"""HTTP server receiving updates sent to a webhook.
+
+The server is built on asyncio streams only and implements the part of
+HTTP/1.1, that Telegram uses to deliver updates: POST requests with a body of
+known length over keep-alive connections. A request is acknowledged as soon
+as its body is queued, the updates are decoded by `webhook_handler` and
+handled by a bounded pool of workers. Handlers can return `MethodCall`s to be
+made, one of them can be made in the response to the request (see
+`webhooks.webhook_reply`).
+
+Example:
+    >>> async def handle(update):
+    ...     print(update.message.text)
+    >>> server = WebhookServer(handle, port=8443, path='/<secret path>')
+    >>> asyncio.run(server.serve_forever())
+
+Notes:
+    1) Telegram sends updates over https only, so the server is meant to
+       run behind a TLS terminating proxy, or `ssl_context` must be set.
+"""
+
+import asyncio
+import inspect
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from telegrambotapiwrapper.aiotransport import _read_headers
+from telegrambotapiwrapper.decoders import Decoders, Mask
+from telegrambotapiwrapper.dedupe import UpdateDeduplicator
+from telegrambotapiwrapper.prefilter import Prefilter
+from telegrambotapiwrapper.webhooks import method_calls, webhook_handler
+from telegrambotapiwrapper.webhooks import webhook_reply
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HEAD_SIZE = 16 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 411: 'Length Required',
+            413: 'Payload Too Large', 431: 'Request Header Fields Too Large'}
+
+
+def _response(status: int, body: bytes = b'', keep_alive: bool = True,
+              content_type: str = 'application/json') -> bytes:
+    lines = ['HTTP/1.1 {} {}'.format(status, _REASONS[status]),
+             'Content-Length: {}'.format(len(body))]
+    if body:
+        lines.append('Content-Type: {}'.format(content_type))
+    if not keep_alive:
+        lines.append('Connection: close')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+_FILTERED = object()  # the result of the update dropped by the prefilter
+
+
+class _BadRequest(Exception):
+    """The request is rejected with the status, the connection is closed."""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+class WebhookServer:
+    """Server of a webhook.
+
+    Args:
+        handler (Callable): function or coroutine function, which is called
+            with every update and returns None, a `MethodCall` or a list of
+            them
+        host (str): interface to listen on
+        port (int): port to listen on, 0 means any free port
+        path (str): path of the webhook; requests to other paths get 404, so
+            a secret path keeps off the updates not sent by Telegram
+        workers (int): number of updates handled at the same time
+        max_pending (int): maximum number of received updates waiting for a
+            worker; when it is reached, the requests are acknowledged only
+            after an update is taken by a worker, so Telegram slows down
+        max_body_size (int): requests with a larger body get 413
+        keep_alive_timeout (float): seconds an idle connection is kept open
+        decoders (Decoders): decoders of the updates, e.g. `lazy.decoders`
+        mask (FieldMask, Iterable[str]): fields of the updates to decode, see
+            `fieldmask`
+        on_error (Callable): called with the exceptions raised while decoding
+            or handling the updates
+        ssl_context (ssl.SSLContext): context for https
+        prefilter (Prefilter): filter of the raw updates; the updates, that
+            do not pass it, are acknowledged, but not decoded and handled
+        api (Api, AsyncApi): client making the calls returned by the handler
+        reply_in_response (bool): make the first call returned by the
+            handler, that can be made so, in the response to the request;
+            the request is then answered after the handler returns instead
+            of at once
+        dedupe (UpdateDeduplicator): identifiers of the seen updates; the
+            updates delivered again, e.g. after a timed out request, are
+            acknowledged, but not decoded and handled
+
+    Attributes:
+        port (int): port the server listens on, after `start`
+        received (int): number of acknowledged updates
+        handled (int): number of handled updates
+        failed (int): number of updates, whose decoding or handling failed
+        filtered (int): number of updates dropped by the prefilter or as
+            duplicates
+
+    Notes:
+        1) Coroutine functions are awaited by the workers on the event loop,
+           other functions are run with the decoding in a thread pool of
+           `workers` threads.
+        2) The calls are made by the worker, which has handled the update,
+           in the order they were returned; the methods of `Api` are run in
+           the thread pool.
+    """
+
+    def __init__(self, handler: Callable,
+                 host: str = '127.0.0.1',
+                 port: int = 8443,
+                 path: str = '/',
+                 workers: int = 8,
+                 max_pending: int = 1000,
+                 max_body_size: int = MAX_BODY_SIZE,
+                 keep_alive_timeout: float = 75.0,
+                 decoders: Optional[Decoders] = None,
+                 mask: Optional[Mask] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 ssl_context: Optional[ssl.SSLContext] = None,
+                 prefilter: Optional[Prefilter] = None,
+                 api=None,
+                 reply_in_response: bool = False,
+                 dedupe: Optional[UpdateDeduplicator] = None):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_body_size = max_body_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self.decoders = decoders
+        self.mask = mask
+        self.on_error = on_error
+        self.ssl_context = ssl_context
+        self.prefilter = prefilter
+        self.api = api
+        self.reply_in_response = reply_in_response
+        self.dedupe = dedupe
+        self.received = 0
+        self.handled = 0
+        self.failed = 0
+        self.filtered = 0
+        self._is_async = inspect.iscoroutinefunction(handler)
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks = []
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self):
+        """Start listening and handling."""
+        self._queue = asyncio.Queue(self.max_pending)
+        if not self._is_async:
+            self._executor = ThreadPoolExecutor(self.workers)
+        self._tasks = [asyncio.ensure_future(self._work())
+                       for _ in range(self.workers)]
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, ssl=self.ssl_context,
+            limit=MAX_HEAD_SIZE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self, drain: bool = True):
+        """Stop listening and close the connections.
+
+        Args:
+            drain (bool): handle the received updates before stopping
+        """
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        if drain:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def serve_forever(self):
+        """Start and serve until cancelled."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter):
+        """Serve the requests of one connection."""
+        self._writers.add(writer)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request_line = await asyncio.wait_for(
+                        reader.readuntil(b'\r\n'), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    return  # idle or closed by the client
+                try:
+                    keep_alive = await self._serve_request(
+                        request_line, reader, writer)
+                except _BadRequest as exc:
+                    writer.write(_response(exc.status, keep_alive=False))
+                    keep_alive = False
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, ValueError):
+            pass  # the client has gone or sent garbage
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _serve_request(self, request_line: bytes,
+                             reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> bool:
+        """Serve one request.
+
+        Returns:
+            (bool): is the connection kept open for the next request
+        """
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise _BadRequest(400)
+        method, path, version = parts
+        try:
+            headers = await _read_headers(reader)
+        except (asyncio.LimitOverrunError, ValueError):
+            raise _BadRequest(431)
+        connection = headers.get('connection', '').lower()
+        if version == b'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise _BadRequest(411)
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise _BadRequest(400)
+        if length > self.max_body_size:
+            raise _BadRequest(413)  # the body is not read
+        body = await reader.readexactly(length) if length else b''
+
+        if path.decode('latin-1').split('?', 1)[0] != self.path:
+            writer.write(_response(404, keep_alive=keep_alive))
+        elif method != b'POST':
+            writer.write(_response(405, keep_alive=keep_alive))
+        elif self.reply_in_response:
+            reply = asyncio.get_event_loop().create_future()
+            await self._queue.put((body, reply))
+            self.received += 1
+            writer.write(_response(200, await reply, keep_alive=keep_alive))
+        else:
+            await self._queue.put((body, None))
+            self.received += 1
+            writer.write(_response(200, keep_alive=keep_alive))
+        return keep_alive
+
+    def _decode(self, body: bytes):
+        return webhook_handler(body, self.decoders, self.prefilter, self.mask,
+                               self.dedupe)
+
+    def _handle_sync(self, body: bytes):
+        update = self._decode(body)
+        if update is None:
+            return _FILTERED
+        return self.handler(update)
+
+    async def _work(self):
+        """Take the received updates and handle them."""
+        loop = asyncio.get_event_loop()
+        while True:
+            body, reply = await self._queue.get()
+            try:
+                if self._is_async:
+                    update = self._decode(body)
+                    result = (_FILTERED if update is None
+                              else await self.handler(update))
+                else:
+                    result = await loop.run_in_executor(
+                        self._executor, self._handle_sync, body)
+                if result is _FILTERED:
+                    self.filtered += 1
+                    continue
+                if reply is not None:
+                    content, calls = webhook_reply(result)
+                    reply.set_result(content)
+                else:
+                    calls = method_calls(result)
+                await self._make_calls(calls)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.failed += 1
+                if self.on_error is not None:
+                    self.on_error(exc)
+            else:
+                self.handled += 1
+            finally:
+                if reply is not None and not reply.done():
+                    reply.set_result(b'')  # the request is acknowledged
+                self._queue.task_done()
+
+    async def _make_calls(self, calls):
+        if calls and self.api is None:
+            raise ValueError('the calls {} are returned by the handler, but '
+                             'the server has no api'.format(calls))
+        loop = asyncio.get_event_loop()
+        for call in calls:
+            if inspect.iscoroutinefunction(getattr(self.api, call.method)):
+                await call(self.api)
+            else:
+                await loop.run_in_executor(self._executor, call, self.api)
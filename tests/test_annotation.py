@@ -1,6 +1,9 @@
+import dataclasses
+import typing
 import unittest
 
-from telegrambotapiwrapper.annotation import AnnotationWrapper
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper.annotation import AnnotationWrapper, type_node
 
 
 class TestAnnotationWrapper(unittest.TestCase):
@@ -703,3 +706,46 @@ class TestAnnotationWrapper(unittest.TestCase):
         }
         for k, v in data_to_test.items():
             self.assertEqual(AnnotationWrapper(k).is_union, v)
+
+
+class TestTypeNode(unittest.TestCase):
+
+    def test_same_as_annotation_wrapper(self):
+        annotations = {field.type for cls in vars(typelib).values()
+                       if isinstance(cls, type)
+                       and dataclasses.is_dataclass(cls)
+                       for field in dataclasses.fields(cls)}
+        self.assertGreater(len(annotations), 50)
+        for anno in annotations:
+            wrapper, node = AnnotationWrapper(anno), type_node(anno)
+            for attr in ('is_optional', 'is_list', 'is_list_of_list',
+                         'is_union', 'is_simple',
+                         'is_simple_in_opt_and_not_opt'):
+                self.assertEqual(getattr(node, attr), getattr(wrapper, attr),
+                                 (anno, attr))
+            if wrapper.is_optional:
+                self.assertEqual(node.inner.text,
+                                 wrapper.inner_part_of_optional)
+            if wrapper.is_list or wrapper.is_list_of_list:
+                self.assertEqual(node.inner.text, wrapper.inner_part_of_list)
+
+    def test_interned(self):
+        node = type_node('Optional[List[PhotoSize]]')
+        self.assertIs(node, type_node('typing.Optional[typing.List['
+                                      'telegrambotapiwrapper.typelib.'
+                                      'PhotoSize]]'))
+        self.assertIs(node.inner.inner, type_node('PhotoSize'))
+        self.assertIs(type_node(typelib.User), type_node('User'))
+        self.assertIs(type_node(typing.List[int]), type_node('List[int]'))
+        self.assertIs(type_node(node), node)
+
+    def test_union(self):
+        node = type_node('Union[List[List[KeyboardButton]], str]')
+        self.assertTrue(node.is_union)
+        self.assertEqual([member.text for member in node.members],
+                         ['List[List[KeyboardButton]]', 'str'])
+        self.assertTrue(node.members[0].is_list_of_list)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            type_node('User').name = 'Chat'
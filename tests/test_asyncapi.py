@@ -0,0 +1,142 @@
+import asyncio
+import io
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegrambotapiwrapper import Api
+from telegrambotapiwrapper.aiotransport import AsyncTransport
+from telegrambotapiwrapper.asyncapi import AsyncApi
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.typelib import Message
+
+MESSAGE = {'message_id': 1, 'date': 2,
+           'chat': {'id': 3, 'type': 'private'}, 'text': 'hi'}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        method = self.path.rsplit('/', 1)[-1]
+        self.requests.append((method, self.headers['Content-Type'], body))
+        if method == 'sendMessage':
+            res = {'ok': True, 'result': MESSAGE}
+        elif method == 'getChat':
+            res = {'ok': False, 'error_code': 400,
+                   'description': 'Bad Request: chat not found'}
+        else:
+            res = {'ok': True, 'result': True}
+        content = json.dumps(res).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+class LocalAsyncApi(AsyncApi):
+    """AsyncApi sending requests to the local server."""
+
+    def __init__(self, url, **kwargs):
+        super().__init__(token='123:abc', **kwargs)
+        self.url = url
+
+    def _get_tg_api_method_url(self, api_method_name: str):
+        return self.url + api_method_name
+
+
+class TestAsyncApi(unittest.TestCase):
+
+    def setUp(self):
+        Handler.requests = []
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def run_with_api(self, coro_func, **kwargs):
+        async def main():
+            async with LocalAsyncApi(self.url, **kwargs) as api:
+                return await coro_func(api)
+
+        return asyncio.run(main())
+
+    def test_mirrors_api_methods(self):
+        api_methods = {name for name in vars(Api) if not name.startswith('_')}
+        for name in api_methods:
+            self.assertTrue(
+                asyncio.iscoroutinefunction(getattr(AsyncApi, name)), name)
+
+    def test_send_message(self):
+        async def send(api):
+            return await api.send_message(chat_id=3, text='hi')
+
+        res = self.run_with_api(send)
+        self.assertIsInstance(res, Message)
+        self.assertEqual(res.text, 'hi')
+        method, content_type, body = Handler.requests[0]
+        self.assertEqual(method, 'sendMessage')
+        self.assertEqual(content_type, 'application/json')
+        self.assertEqual(json.loads(body), {'chat_id': 3, 'text': 'hi'})
+
+    def test_connections_are_reused(self):
+        transport = AsyncTransport()
+
+        async def send(api):
+            for _ in range(3):
+                await api.delete_message(1, 2)
+            return await asyncio.gather(
+                *[api.leave_chat(chat_id=i) for i in range(10)])
+
+        self.assertEqual(self.run_with_api(send, transport=transport),
+                         [True] * 10)
+        self.assertEqual(transport.stats.requests, 13)
+        self.assertEqual(transport.stats.new_connections
+                         + transport.stats.reused_connections, 13)
+        self.assertGreaterEqual(transport.stats.reused_connections, 2)
+
+    def test_upload(self):
+        async def send(api):
+            return await api.send_photo(chat_id=3, photo=io.BytesIO(b'img'),
+                                        caption='look')
+
+        self.assertTrue(self.run_with_api(send))
+        method, content_type, body = Handler.requests[0]
+        self.assertEqual(method, 'sendPhoto')
+        self.assertTrue(content_type.startswith('multipart/form-data'))
+        self.assertIn(b'img', body)
+        self.assertIn(b'look', body)
+
+    def test_unsuccessful_request(self):
+        async def get_chat(api):
+            return await api.get_chat(chat_id=1)
+
+        with self.assertRaises(UnsuccessfulRequest) as cm:
+            self.run_with_api(get_chat)
+        self.assertEqual(cm.exception.error_code, 400)
+
+    def test_wrong_arguments(self):
+        async def send(api):
+            return await api.send_message(chat_id=3)
+
+        with self.assertRaises(TypeError):
+            self.run_with_api(send)
+        self.assertEqual(Handler.requests, [])
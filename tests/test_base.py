@@ -0,0 +1,45 @@
+import unittest
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.typelib import Document, Message, User
+
+
+class TestClassInfo(unittest.TestCase):
+
+    def test_fields(self):
+        self.assertEqual(User._fields_names()[:3],
+                         ('id', 'is_bot', 'first_name'))
+        self.assertEqual(Document._field_type('thumb'), 'Optional[PhotoSize]')
+        self.assertIsNone(Document._field_type('no_such_field'))
+        self.assertIn('Optional[str]', User._used_annotations())
+
+    def test_simple_fields(self):
+        self.assertTrue(User._is_simple_type())
+        self.assertFalse(Document._is_simple_type())
+        self.assertEqual(dict(Document._get_not_simple_fields()),
+                         {'thumb': 'Optional[PhotoSize]'})
+        self.assertIn('file_id', Document._get_simple_fields())
+
+    def test_computed_once_and_read_only(self):
+        self.assertIs(Message._annotations(), Message._annotations())
+        with self.assertRaises(TypeError):
+            Message._annotations()['text'] = 'int'
+        with self.assertRaises(AttributeError):
+            Message._used_annotations().add('int')
+
+
+class TestTypesByName(unittest.TestCase):
+
+    def test_registry(self):
+        types = types_by_name(typelib)
+        self.assertIs(types['Message'], Message)
+        self.assertIs(types_by_name('telegrambotapiwrapper.typelib')['User'],
+                      User)
+        self.assertNotIn('Optional', types)
+        with self.assertRaises(TypeError):
+            types['User'] = Message
+
+
+if __name__ == '__main__':
+    unittest.main()
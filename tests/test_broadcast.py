@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from telegrambotapiwrapper.broadcast import (BLOCKED, FAILED, MIGRATED, SENT,
+                                             Broadcast, BroadcastStats,
+                                             Checkpoint)
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.retry import ChatMigrations
+from telegrambotapiwrapper.typelib import ResponseParameters
+
+
+class FakeApi:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = []
+        self.blocked = {2}
+        self.migrated = {-3: -1003}
+        self.flood = {4}
+        self.broken = {5}
+
+    def send_message(self, chat_id, text):
+        with self.lock:
+            if chat_id in self.blocked:
+                raise UnsuccessfulRequest(
+                    description='Forbidden: bot was blocked by the user',
+                    error_code=403)
+            if chat_id in self.migrated:
+                raise UnsuccessfulRequest(
+                    description='Bad Request: group chat was upgraded',
+                    error_code=400, parameters=ResponseParameters(
+                        migrate_to_chat_id=self.migrated[chat_id]))
+            if chat_id in self.flood:
+                self.flood.discard(chat_id)
+                raise UnsuccessfulRequest(
+                    description='Too Many Requests', error_code=429,
+                    parameters=ResponseParameters(retry_after=1))
+            if chat_id in self.broken:
+                raise UnsuccessfulRequest(
+                    description='Bad Request: chat not found', error_code=400)
+            self.sent.append((chat_id, text))
+
+
+class TestBroadcast(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi()
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'broadcast.log')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def broadcast(self, **kwargs):
+        return Broadcast(self.api, migrations=ChatMigrations(),
+                         checkpoint=self.path, rate=1000, **kwargs)
+
+    def test_outcomes(self):
+        results = {}
+        stats = self.broadcast().run(
+            [1, 2, -3, 4, 5, 6], text='hi',
+            on_result=lambda chat_id, outcome, _: results.update(
+                {chat_id: outcome}))
+        self.assertEqual(results, {1: SENT, 2: BLOCKED, -3: MIGRATED,
+                                   4: SENT, 5: FAILED, 6: SENT})
+        self.assertEqual((stats.sent, stats.blocked, stats.migrated,
+                          stats.failed), (3, 1, 1, 1))
+        self.assertEqual(sorted(self.api.sent),
+                         [(-1003, 'hi'), (1, 'hi'), (4, 'hi'), (6, 'hi')])
+        self.assertEqual(Checkpoint(self.path).load(), results)
+
+    def test_resume(self):
+        with open(self.path, 'w') as file:
+            file.write('[1, "sent", null]\n[2, "blocked", "Forbidden"]\n'
+                       '[6, "se')  # broken by a crash
+        stats = self.broadcast().run(iter([1, 2, 6, 7]), text='hi')
+        self.assertEqual(stats.skipped, 2)
+        self.assertEqual(sorted(self.api.sent), [(6, 'hi'), (7, 'hi')])
+        self.assertEqual(Checkpoint(self.path).load(),
+                         {1: SENT, 2: BLOCKED, 6: SENT, 7: SENT})
+
+    def test_transport_errors_are_not_checkpointed(self):
+        api = self.api
+        send_message = api.send_message
+        outage = {'on': True}
+
+        def flaky_send_message(chat_id, text):
+            if outage['on'] and chat_id in (4, 6):
+                raise ConnectionError('network is unreachable')
+            if outage['on'] and chat_id == 1:
+                raise UnsuccessfulRequest(description='Bad Gateway',
+                                          error_code=502)
+            return send_message(chat_id, text)
+
+        api.send_message = flaky_send_message
+        api.flood = set()
+        stats = self.broadcast().run([1, 2, 4, 5, 6], text='hi')
+        self.assertEqual((stats.blocked, stats.failed), (1, 4))
+        self.assertEqual(Checkpoint(self.path).load(), {2: BLOCKED, 5: FAILED})
+
+        outage['on'] = False
+        stats = self.broadcast().run([1, 2, 4, 5, 6], text='hi')
+        self.assertEqual((stats.skipped, stats.sent), (2, 3))
+        self.assertEqual(sorted(api.sent), [(1, 'hi'), (4, 'hi'), (6, 'hi')])
+
+    def test_flood_after_retries_is_not_checkpointed(self):
+        class FloodApi:
+            def send_message(self, chat_id, text):
+                raise UnsuccessfulRequest(
+                    description='Too Many Requests', error_code=429,
+                    parameters=ResponseParameters(retry_after=0))
+
+        stats = Broadcast(FloodApi(), migrations=ChatMigrations(),
+                          checkpoint=self.path, rate=1000,
+                          max_retries=1).run([1], text='hi')
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(Checkpoint(self.path).load(), {})
+
+    def test_concurrency(self):
+        in_flight = []
+        peak = []
+        event = threading.Event()
+
+        class SlowApi:
+            def send_message(self, chat_id, text):
+                in_flight.append(chat_id)
+                peak.append(len(in_flight))
+                event.wait(0.01)
+                in_flight.remove(chat_id)
+
+        stats = Broadcast(SlowApi(), concurrency=3, rate=1000).run(
+            range(1, 31), text='hi')
+        self.assertEqual(stats.sent, 30)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_rate(self):
+        now = [0.0]
+        broadcast = Broadcast(self.api, rate=10, concurrency=1,
+                              migrations=ChatMigrations(),
+                              clock=lambda: now[0],
+                              sleep=lambda s: now.__setitem__(0, now[0] + s))
+        broadcast.run(range(100, 130), text='hi')
+        # a burst of 10 messages, then 10 messages per second
+        self.assertAlmostEqual(now[0], 2)
+
+
+class TestBroadcastStats(unittest.TestCase):
+
+    def test_eta(self):
+        now = [0.0]
+        stats = BroadcastStats(total=100, clock=lambda: now[0])
+        self.assertIsNone(stats.eta)
+        for _ in range(20):
+            stats.count(SENT)
+        now[0] = 10
+        self.assertEqual(stats.throughput, 2)
+        self.assertEqual(stats.eta, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import json
+import unittest
+
+from telegrambotapiwrapper import Api
+from telegrambotapiwrapper.callplan import get_call_plan, tg_method_name
+from telegrambotapiwrapper.typelib import Message
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class RecordingApi(Api):
+    """Api that does not send requests, but records them."""
+
+    response = b'{"ok": true, "result": true}'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def _make_post_request(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return FakeResponse(self.response)
+
+
+class TestCallPlan(unittest.TestCase):
+
+    def test_tg_method_name(self):
+        self.assertEqual(tg_method_name('send_message'), 'sendMessage')
+        self.assertEqual(tg_method_name('get_me'), 'getMe')
+        self.assertEqual(tg_method_name('set_chat_administrator_custom_title'),
+                         'setChatAdministratorCustomTitle')
+
+    def test_plan(self):
+        plan = get_call_plan(Api, 'send_message')
+        self.assertEqual(plan.name, 'send_message')
+        self.assertEqual(plan.tg_method_name, 'sendMessage')
+        self.assertEqual(plan.param_names[:3],
+                         ('chat_id', 'text', 'parse_mode'))
+        self.assertNotIn('self', plan.param_names)
+        self.assertEqual(str(plan.result_type), 'Message')
+        self.assertIs(plan, get_call_plan(Api, 'send_message'))
+
+    def test_plan_of_method_without_params(self):
+        plan = get_call_plan(Api, 'get_webhook_info')
+        self.assertEqual(plan.param_names, ())
+        self.assertEqual(str(plan.result_type), 'WebhookInfo')
+
+    def test_make_request(self):
+        api = RecordingApi(token='123:abc')
+        api.response = (b'{"ok": true, "result": {"message_id": 1, '
+                        b'"date": 2, "chat": {"id": 3, "type": "private"}, '
+                        b'"text": "hi"}}')
+
+        for _ in range(2):
+            res = api.send_message(chat_id=3, text='hi')
+            self.assertIsInstance(res, Message)
+            self.assertEqual(res.text, 'hi')
+            self.assertEqual(res.chat.id, 3)
+
+        url, kwargs = api.requests[-1]
+        self.assertEqual(url, 'https://api.telegram.org/bot123:abc/sendMessage')
+        self.assertEqual(json.loads(kwargs['data']),
+                         {'chat_id': 3, 'text': 'hi'})
+
+    def test_make_request_positional_args(self):
+        api = RecordingApi(token='123:abc')
+        self.assertTrue(api.delete_message(-100, 15))
+        url, kwargs = api.requests[-1]
+        self.assertEqual(url,
+                         'https://api.telegram.org/bot123:abc/deleteMessage')
+        self.assertEqual(json.loads(kwargs['data']),
+                         {'chat_id': -100, 'message_id': 15})
+
+    def test_delegating_subclass_does_not_break_plan(self):
+        class DelegatingApi(RecordingApi):
+            def delete_message(self, *args, **kwargs):
+                return super().delete_message(*args, **kwargs)
+
+        delegating = DelegatingApi(token='123:abc')
+        self.assertTrue(delegating.delete_message(-100, 15))
+        self.assertEqual(json.loads(delegating.requests[-1][1]['data']),
+                         {'chat_id': -100, 'message_id': 15})
+
+        api = RecordingApi(token='123:abc')
+        self.assertTrue(api.delete_message(1, 2))
+        self.assertEqual(json.loads(api.requests[-1][1]['data']),
+                         {'chat_id': 1, 'message_id': 2})
+        self.assertEqual(get_call_plan(Api, 'delete_message').param_names,
+                         ('chat_id', 'message_id'))
+
+    def test_upload_args(self):
+        api = RecordingApi(token='123:abc')
+        photo = io.BytesIO(b'image')
+        api.send_photo(chat_id=3, photo=photo, caption='hi')
+        url, kwargs = api.requests[-1]
+        self.assertEqual(url, 'https://api.telegram.org/bot123:abc/sendPhoto')
+        self.assertIs(kwargs['files']['photo'], photo)
+        self.assertEqual(kwargs['data']['chat_id'], 3)
+        self.assertEqual(kwargs['data']['caption'], 'hi')
+        self.assertNotIn('photo', kwargs['data'])
+
+    def test_set_webhook_with_certificate(self):
+        api = RecordingApi(token='123:abc')
+        api.set_webhook(url='https://example.com/hook',
+                        certificate=io.BytesIO(b'cert'))
+        url, kwargs = api.requests[-1]
+        self.assertEqual(url, 'https://api.telegram.org/bot123:abc/setWebhook')
+        self.assertEqual(kwargs['data']['url'], 'https://example.com/hook')
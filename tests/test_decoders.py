@@ -0,0 +1,87 @@
+import unittest
+
+from telegrambotapiwrapper.annotation import AnnotationWrapper
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.response import handle_response
+from telegrambotapiwrapper.response import replace__from__by__from_
+from telegrambotapiwrapper.response import to_api_type
+from telegrambotapiwrapper.typelib import *
+from telegrambotapiwrapper.webhooks import webhook_handler
+
+USER = {'id': 1, 'is_bot': False, 'first_name': 'John'}
+CHAT = {'id': -100, 'type': 'supergroup', 'title': 'group'}
+MESSAGE = {
+    'message_id': 10,
+    'date': 1600000000,
+    'chat': CHAT,
+    'from': USER,
+    'text': '/start',
+    'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+    'reply_to_message': {'message_id': 9, 'date': 1599999999, 'chat': CHAT},
+}
+
+
+class TestDecoders(unittest.TestCase):
+
+    def test_message(self):
+        message = get_decoder('Message')(MESSAGE)
+        self.assertIsInstance(message, Message)
+        self.assertEqual(message.from_, User(**USER))
+        self.assertEqual(message.entities[0].type, 'bot_command')
+        self.assertIsInstance(message.reply_to_message, Message)
+        self.assertEqual(
+            message,
+            to_api_type(replace__from__by__from_(MESSAGE),
+                        AnnotationWrapper('Message')))
+
+    def test_decoder_is_cached(self):
+        self.assertIs(get_decoder('Message'), get_decoder('Message'))
+        self.assertIs(get_decoder('Optional[Message]'), get_decoder('Message'))
+
+    def test_unknown_keys_are_skipped(self):
+        user = get_decoder('User')(dict(USER, some_new_field=1))
+        self.assertEqual(user, User(**USER))
+
+    def test_list_of_list(self):
+        markup = get_decoder('InlineKeyboardMarkup')({'inline_keyboard': [
+            [{'text': 'a', 'callback_data': 'x'}],
+            [{'text': 'b', 'url': 'http://example.com'}],
+        ]})
+        self.assertEqual(markup.inline_keyboard[1][0],
+                         InlineKeyboardButton(text='b',
+                                              url='http://example.com'))
+
+    def test_list_of_simple_type(self):
+        poll = get_decoder('Poll')({
+            'id': '1', 'question': 'q', 'options': [], 'total_voter_count': 0,
+            'is_closed': False, 'is_anonymous': True, 'type': 'regular',
+            'allows_multiple_answers': False})
+        self.assertEqual(poll.options, [])
+
+    def test_union(self):
+        decoder = get_decoder('Union[Message, bool]')
+        self.assertIs(decoder(True), True)
+        self.assertIsInstance(decoder(MESSAGE), Message)
+
+    def test_list_of_updates(self):
+        updates = get_decoder('List[Update]')([
+            {'update_id': 1, 'message': MESSAGE},
+            {'update_id': 2, 'callback_query': {
+                'id': '1', 'from': USER, 'chat_instance': '2',
+                'data': 'vote:yes'}},
+        ])
+        self.assertEqual(updates[0].message.text, '/start')
+        self.assertEqual(updates[1].callback_query.from_.first_name, 'John')
+
+    def test_handle_response(self):
+        res = handle_response(
+            '{"ok": true, "result": {"id": 1, "is_bot": true, '
+            '"first_name": "bot"}}', AnnotationWrapper('User'))
+        self.assertEqual(res, User(id=1, is_bot=True, first_name='bot'))
+
+    def test_webhook_handler(self):
+        update = webhook_handler(
+            '{"update_id": 5, "message": {"message_id": 1, "date": 2, '
+            '"chat": {"id": 3, "type": "private"}, "text": "hi"}}')
+        self.assertEqual(update.update_id, 5)
+        self.assertEqual(update.message.text, 'hi')
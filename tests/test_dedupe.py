@@ -0,0 +1,124 @@
+import json
+import threading
+import unittest
+
+from telegrambotapiwrapper.dedupe import UpdateDeduplicator
+from telegrambotapiwrapper.polling import UpdatePoller
+from telegrambotapiwrapper.typelib import Update
+from telegrambotapiwrapper.webhooks import webhook_handler
+from tests.test_outbox import FakeClock
+from tests.test_polling import FakeApi
+
+
+class TestUpdateDeduplicator(unittest.TestCase):
+
+    def test_add(self):
+        dedupe = UpdateDeduplicator(window=8)
+        self.assertEqual([dedupe.add(i) for i in (5, 6, 5, 3, 3, 9, 6, 2)],
+                         [True, True, False, True, False, True, False, True])
+        self.assertEqual(dedupe.duplicates, 3)
+        self.assertIn(9, dedupe)
+        self.assertIn(2, dedupe)
+        self.assertNotIn(4, dedupe)
+        self.assertNotIn(10, dedupe)
+
+    def test_window_moves(self):
+        dedupe = UpdateDeduplicator(window=8)
+        for i in range(100, 120):
+            self.assertTrue(dedupe.add(i))
+        # the slots of the older identifiers are reused by the newer ones
+        self.assertEqual([i in dedupe for i in range(110, 121)],
+                         [False] * 2 + [True] * 8 + [False])
+        self.assertTrue(dedupe.add(123))  # 120..122 are skipped
+        self.assertEqual([i in dedupe for i in range(116, 124)],
+                         [True] * 4 + [False] * 3 + [True])
+        self.assertTrue(dedupe.add(121))
+        self.assertFalse(dedupe.add(121))
+
+    def test_old_identifiers(self):
+        dedupe = UpdateDeduplicator(window=1000)
+        self.assertTrue(all(map(dedupe.add, range(5000, 5100))))
+        self.assertFalse(dedupe.add(3000))  # a late redelivery
+        self.assertFalse(dedupe.add(5099))
+        self.assertFalse(dedupe.add(5050))
+        self.assertEqual(dedupe.duplicates, 3)
+        self.assertNotIn(3000, dedupe)
+
+    def test_new_sequence(self):
+        dedupe = UpdateDeduplicator(window=8)
+        dedupe.add(1000)
+        self.assertTrue(dedupe.add(10 ** 6))  # far ahead
+        self.assertNotIn(1000, dedupe)
+        dedupe.clear()  # Telegram started a new sequence
+        self.assertTrue(dedupe.add(7))
+        self.assertFalse(dedupe.add(7))
+        self.assertNotIn(10 ** 6, dedupe)
+
+    def test_large_window(self):
+        dedupe = UpdateDeduplicator()
+        self.assertEqual(len(dedupe._bits), 8192)
+        self.assertTrue(all(map(dedupe.add, range(0, 200000, 3))))
+        self.assertFalse(any(map(dedupe.add, range(150000, 200000, 3))))
+        self.assertTrue(all(map(dedupe.add, range(150001, 200000, 3))))
+
+    def test_updates(self):
+        dedupe = UpdateDeduplicator()
+        self.assertTrue(dedupe.is_new(Update(update_id=1)))
+        self.assertFalse(dedupe.is_new({'update_id': 1}))
+        self.assertTrue(dedupe.is_new_raw(b'{"update_id":2}'))
+        self.assertFalse(dedupe.is_new_raw('{"update_id": 2}'))
+        body = json.dumps({'message': {'text': '"update_id": 9'},
+                           'update_id': 3}).encode('utf-8')
+        self.assertTrue(dedupe.is_new_raw(body))
+        self.assertIn(3, dedupe)
+        self.assertNotIn(9, dedupe)
+
+    def test_threads(self):
+        dedupe = UpdateDeduplicator(window=1024)
+        new = []
+
+        def add():
+            new.extend(i for i in range(1000) if dedupe.add(i))
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(new), list(range(1000)))
+        self.assertEqual(dedupe.duplicates, 3000)
+
+    def test_bad_window(self):
+        with self.assertRaises(ValueError):
+            UpdateDeduplicator(window=0)
+
+
+class TestDedupeStages(unittest.TestCase):
+
+    def test_webhook_handler(self):
+        dedupe = UpdateDeduplicator()
+        body = b'{"update_id": 5, "message": {"message_id": 1, "date": 2, ' \
+               b'"chat": {"id": 3, "type": "private"}}}'
+        self.assertEqual(webhook_handler(body, dedupe=dedupe).update_id, 5)
+        self.assertIsNone(webhook_handler(body, dedupe=dedupe))
+        self.assertEqual(dedupe.duplicates, 1)
+
+    def test_poller(self):
+        clock = FakeClock()
+        dedupe = UpdateDeduplicator()
+        api = FakeApi(5, clock)
+        poller = UpdatePoller(api, clock=clock, sleep=clock.sleep,
+                              dedupe=dedupe)
+        self.assertEqual(poller.poll(), 5)
+        # restarted with an old offset, e.g. before the updates were confirmed
+        api.backlog = [{'update_id': i} for i in range(3, 9)]
+        restarted = UpdatePoller(api, clock=clock, sleep=clock.sleep,
+                                 dedupe=dedupe)
+        self.assertEqual(restarted.poll(), 3)
+        self.assertEqual(restarted.offset, 9)
+        self.assertEqual([restarted.get()['update_id'] for _ in range(3)],
+                         [6, 7, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
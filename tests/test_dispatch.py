@@ -0,0 +1,178 @@
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError, Executor, Future
+from concurrent.futures import ProcessPoolExecutor
+
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.dispatch import ChatDispatcher, chat_id
+from telegrambotapiwrapper.dispatch import update_kind
+
+USER = {'id': 7, 'is_bot': False, 'first_name': 'A'}
+CHAT = {'id': -100, 'type': 'supergroup'}
+MESSAGE = {'message_id': 1, 'date': 2, 'chat': CHAT, 'from': USER}
+UPDATES = {
+    -100: {'update_id': 1, 'message': MESSAGE},
+    -101: {'update_id': 2, 'edited_channel_post': dict(
+        MESSAGE, chat={'id': -101, 'type': 'channel'})},
+    -102: {'update_id': 3, 'callback_query': {
+        'id': 'q', 'from': USER, 'chat_instance': 'i',
+        'message': dict(MESSAGE, chat={'id': -102, 'type': 'group'})}},
+    7: {'update_id': 4, 'inline_query': {'id': 'q', 'from': USER,
+                                         'query': '', 'offset': ''}},
+    8: {'update_id': 5, 'poll_answer': {
+        'poll_id': 'p', 'user': dict(USER, id=8), 'option_ids': [0]}},
+    None: {'update_id': 6},
+}
+
+
+def double(update):
+    return update['update_id'] * 2
+
+
+class InlineExecutor(Executor):
+    """Executor running the functions at once in the submitting thread."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class TestChatId(unittest.TestCase):
+
+    def test_dicts_and_objects(self):
+        decode = get_decoder('Update')
+        for expected, update in UPDATES.items():
+            with self.subTest(update=update):
+                self.assertEqual(chat_id(update), expected)
+                self.assertEqual(chat_id(decode(update)), expected)
+
+    def test_update_kind(self):
+        self.assertEqual(update_kind(UPDATES[-102]), 'callback_query')
+        self.assertIsNone(update_kind(UPDATES[None]))
+
+
+class TestChatDispatcher(unittest.TestCase):
+
+    def test_order_within_chat_and_concurrency_across_chats(self):
+        log = []
+        running = set()
+        overlapped = threading.Event()
+        lock = threading.Lock()
+
+        def handle(update):
+            chat = update['chat']
+            with lock:
+                self.assertNotIn(chat, running)
+                running.add(chat)
+                if len(running) > 1:
+                    overlapped.set()
+            time.sleep(0.002)
+            with lock:
+                running.discard(chat)
+                log.append((chat, update['n']))
+
+        with ChatDispatcher(handle, max_workers=4,
+                            key=lambda update: update['chat']) as dispatcher:
+            for n in range(20):
+                for chat in range(4):
+                    dispatcher.submit({'chat': chat, 'n': n})
+        self.assertEqual(len(log), 80)
+        for chat in range(4):
+            self.assertEqual([n for c, n in log if c == chat],
+                             list(range(20)))
+        self.assertTrue(overlapped.is_set())
+
+    def test_results_and_errors(self):
+        def handle(update):
+            if update['update_id'] == 2:
+                raise ValueError()
+            return update['update_id']
+
+        with ChatDispatcher(handle) as dispatcher:
+            futures = [dispatcher.submit(UPDATES[-100]),
+                       dispatcher.submit(UPDATES[-101])]
+        self.assertEqual(futures[0].result(), 1)
+        self.assertIsInstance(futures[1].exception(), ValueError)
+        self.assertEqual(dispatcher.pending(), 0)
+
+    def test_cancel_queued(self):
+        release = threading.Event()
+        handled = []
+
+        def handle(update):
+            release.wait(5)
+            handled.append(update['n'])
+
+        with ChatDispatcher(handle, key=lambda update: 1) as dispatcher:
+            futures = [dispatcher.submit({'n': n}) for n in range(3)]
+            self.assertTrue(futures[1].cancel())
+            release.set()
+        self.assertEqual(handled, [0, 2])
+        with self.assertRaises(CancelledError):
+            futures[1].result()
+
+    def test_max_pending(self):
+        release = threading.Event()
+        dispatcher = ChatDispatcher(lambda update: release.wait(5),
+                                    max_pending=2, key=lambda update: None)
+        dispatcher.submit({})
+        dispatcher.submit({})
+        submitted = threading.Event()
+        thread = threading.Thread(
+            target=lambda: (dispatcher.submit({}), submitted.set()))
+        thread.start()
+        self.assertFalse(submitted.wait(0.05))
+        release.set()
+        self.assertTrue(submitted.wait(5))
+        thread.join()
+        dispatcher.shutdown()
+        self.assertEqual(dispatcher.pending(), 0)
+
+    def test_executor_shut_down_with_long_queue(self):
+        release = threading.Event()
+        dispatcher = ChatDispatcher(lambda update: release.wait(5),
+                                    max_workers=1, key=lambda update: 1)
+        futures = [dispatcher.submit({}) for _ in range(3000)]
+        dispatcher.executor.shutdown(wait=False)
+        release.set()
+        self.assertTrue(dispatcher.join(5))
+        self.assertIs(futures[0].result(), True)
+        for future in futures[1:]:
+            self.assertIsInstance(future.exception(0), RuntimeError)
+        self.assertEqual(dispatcher.pending(), 0)
+
+    def test_inline_executor(self):
+        release = threading.Event()
+        handled = []
+
+        def handle(update):
+            if not handled:
+                release.wait(5)  # the others are queued behind the first
+            handled.append(update['n'])
+
+        dispatcher = ChatDispatcher(handle, executor=InlineExecutor(),
+                                    key=lambda update: 1)
+        thread = threading.Thread(target=dispatcher.submit, args=({'n': 0},))
+        thread.start()
+        while not dispatcher.pending():
+            time.sleep(0.001)
+        for n in range(1, 3000):
+            dispatcher.submit({'n': n})
+        release.set()
+        thread.join()
+        self.assertTrue(dispatcher.join(5))
+        self.assertEqual(handled, list(range(3000)))
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            with ChatDispatcher(double, executor=executor) as dispatcher:
+                futures = [dispatcher.submit(update)
+                           for update in UPDATES.values()]
+        self.assertEqual([future.result() for future in futures],
+                         [2, 4, 6, 8, 10, 12])
+
+
+if __name__ == '__main__':
+    unittest.main()
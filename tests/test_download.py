@@ -0,0 +1,137 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from telegrambotapiwrapper.download import Downloader
+from telegrambotapiwrapper.transport import Transport
+from telegrambotapiwrapper.typelib import Document, File
+from tests.test_transport import LocalApi, Server
+
+CONTENT = bytes(range(256)) * 1000
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 5
+    cut_after = None  # bytes of the first response sent before disconnect
+    ignore_range = False
+    ranges = []
+
+    def do_GET(self):
+        start = 0
+        header = self.headers.get('Range')
+        self.ranges.append(header)
+        if header and not self.ignore_range:
+            start = int(header[len('bytes='):-1])
+        body = CONTENT[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        cut_after = type(self).cut_after
+        if cut_after is not None:
+            type(self).cut_after = None
+            self.wfile.write(body[:cut_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = ('{"ok": true, "result": {"file_id": "id", '
+                '"file_unique_id": "u", "file_path": "docs/file_%s"}}'
+                % self.path.rsplit('/', 1)[-1]).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FileApi(LocalApi):
+
+    def _get_tg_file_url(self, file_path: str):
+        return self.url + 'file/' + file_path
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        FileHandler.cut_after = None
+        FileHandler.ignore_range = False
+        FileHandler.ranges = []
+        self.server = Server(('127.0.0.1', 0), FileHandler)
+        url = 'http://127.0.0.1:{}/'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.api = FileApi(url, transport=Transport())
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = File(file_id='id', file_unique_id='u',
+                         file_size=len(CONTENT), file_path='docs/file')
+
+    def tearDown(self):
+        self.api.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.dir.cleanup()
+
+    def path(self, name='file'):
+        return os.path.join(self.dir.name, name)
+
+    def read(self, path):
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def test_to_path(self):
+        self.assertEqual(self.api.download_file(self.file, self.path()),
+                         self.path())
+        self.assertEqual(self.read(self.path()), CONTENT)
+        self.assertFalse(os.path.exists(self.path() + '.part'))
+
+    def test_to_file_object(self):
+        out = io.BytesIO()
+        Downloader(self.api, chunk_size=1000).download(self.file, out)
+        self.assertEqual(out.getvalue(), CONTENT)
+
+    def test_by_file_id(self):
+        document = Document(file_id='id', file_unique_id='u')
+        self.api.download_file(document, self.path())
+        self.assertEqual(self.read(self.path()), CONTENT)
+
+    def test_resume_interrupted(self):
+        FileHandler.cut_after = 5000
+        out = io.BytesIO()
+        self.api.download_file(self.file, out, chunk_size=1000)
+        self.assertEqual(out.getvalue(), CONTENT)
+        self.assertEqual(FileHandler.ranges, [None, 'bytes=5000-'])
+
+    def test_resume_part_file(self):
+        with open(self.path() + '.part', 'wb') as part:
+            part.write(CONTENT[:1234])
+        self.api.download_file(self.file, self.path())
+        self.assertEqual(self.read(self.path()), CONTENT)
+        self.assertEqual(FileHandler.ranges, ['bytes=1234-'])
+
+    def test_range_ignored(self):
+        FileHandler.ignore_range = True
+        with open(self.path() + '.part', 'wb') as part:
+            part.write(b'garbage')
+        self.api.download_file(self.file, self.path())
+        self.assertEqual(self.read(self.path()), CONTENT)
+
+    def test_download_many(self):
+        files = [(self.file, self.path(str(i))) for i in range(8)]
+        futures = Downloader(self.api, max_workers=4).download_many(files)
+        for i, future in enumerate(futures):
+            self.assertEqual(future.result(), self.path(str(i)))
+            self.assertEqual(self.read(self.path(str(i))), CONTENT)
+        self.assertLessEqual(self.api.transport.stats.new_connections, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import unittest
+
+from telegrambotapiwrapper import lazy, slotted, sparse
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.fieldmask import FieldMask, field_mask
+from telegrambotapiwrapper.response import decode_result, handle_response
+from telegrambotapiwrapper.typelib import Message, Update
+from telegrambotapiwrapper.webhooks import webhook_handler
+
+CHAT = {'id': -100, 'type': 'supergroup', 'title': 'Group'}
+MESSAGE = {
+    'message_id': 2, 'date': 3, 'chat': CHAT, 'text': 'hi',
+    'from': {'id': 7, 'is_bot': False, 'first_name': 'A'},
+    'entities': [{'type': 'bold', 'offset': 0, 'length': 2}],
+    'reply_to_message': {'message_id': 1, 'date': 1, 'chat': CHAT},
+}
+UPDATE = {'update_id': 5, 'message': MESSAGE}
+PATHS = ['message.chat.id', 'message.from.id', 'message.text']
+
+
+class TestFieldMask(unittest.TestCase):
+
+    def test_tree(self):
+        mask = FieldMask(PATHS + ['message.chat'])
+        self.assertEqual(set(mask.fields), {'message'})
+        message = mask.fields['message']
+        self.assertIsNone(message.fields['chat'])  # the whole chat
+        self.assertEqual(set(message.fields['from_'].fields), {'id'})
+        self.assertEqual(mask, FieldMask(['message.text', 'message.chat',
+                                          'message.from_.id']))
+        self.assertEqual(hash(mask), hash(field_mask(list(mask.paths))))
+
+    def test_bad_path(self):
+        with self.assertRaises(ValueError):
+            FieldMask(['message..text'])
+
+
+class TestMaskedDecoding(unittest.TestCase):
+
+    def check(self, update, cls=Update):
+        self.assertIsInstance(update, cls)
+        self.assertEqual(update.message.chat.id, -100)
+        self.assertEqual(update.message.from_.id, 7)
+        self.assertEqual(update.message.text, 'hi')
+        self.assertIsNone(update.message.chat.title)
+        self.assertIsNone(update.message.entities)
+        self.assertIsNone(update.message.reply_to_message)
+        self.assertIsNone(update.update_id)
+        repr(update)
+
+    def test_variants(self):
+        for module in (None, slotted, sparse, lazy):
+            with self.subTest(module=module):
+                if module is None:
+                    decode, cls = get_decoder('Update', PATHS), Update
+                else:
+                    decode = module.decoders.get('Update', PATHS)
+                    cls = module.Update
+                self.check(decode(UPDATE), cls)
+
+    def test_entry_points(self):
+        raw = json.dumps(UPDATE).encode('utf-8')
+        self.check(webhook_handler(raw, mask=PATHS))
+        self.check(decode_result(raw, 'Update', mask=PATHS))
+        response = json.dumps({'ok': True, 'result': [UPDATE]})
+        self.check(handle_response(response, 'List[Update]', PATHS)[0])
+
+    def test_whole_field(self):
+        update = get_decoder('Update', ['message.chat'])(UPDATE)
+        self.assertEqual(update.message.chat.title, 'Group')
+        self.assertIsNone(update.message.text)
+
+    def test_lists_and_unions(self):
+        photo = {'file_id': 'f', 'file_unique_id': 'u', 'width': 1,
+                 'height': 2}
+        message = get_decoder('Message', ['photo.file_id'])(
+            dict(MESSAGE, photo=[photo, photo]))
+        self.assertEqual([size.file_id for size in message.photo],
+                         ['f', 'f'])
+        self.assertIsNone(message.photo[0].width)
+        decode = get_decoder('Union[Message, bool]', ['text'])
+        self.assertIsInstance(decode(MESSAGE), Message)
+        self.assertIs(decode(True), True)
+
+    def test_absent_fields(self):
+        update = get_decoder('Update', PATHS)({'update_id': 1})
+        self.assertIsNone(update.message)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            get_decoder('Update', ['message.txt'])
+        with self.assertRaises(ValueError):
+            get_decoder('Update', ['message.text.length'])
+
+    def test_cached(self):
+        self.assertIs(get_decoder('Update', PATHS),
+                      get_decoder('Update', FieldMask(reversed(PATHS))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from telegrambotapiwrapper.filecache import FileIdCache, content_digest
+from tests.test_callplan import FakeResponse, RecordingApi
+
+PHOTO_MESSAGE = json.dumps({'ok': True, 'result': {
+    'message_id': 1, 'date': 2, 'chat': {'id': 3, 'type': 'private'},
+    'photo': [
+        {'file_id': 'small', 'file_unique_id': 's', 'width': 90,
+         'height': 90},
+        {'file_id': 'large', 'file_unique_id': 'l', 'width': 800,
+         'height': 800}]}}).encode()
+DOCUMENT_MESSAGE = json.dumps({'ok': True, 'result': {
+    'message_id': 1, 'date': 2, 'chat': {'id': 3, 'type': 'private'},
+    'animation': {'file_id': 'gif', 'file_unique_id': 'g', 'width': 1,
+                  'height': 1, 'duration': 1}}}).encode()
+WRONG_FILE_ID = (b'{"ok": false, "error_code": 400, '
+                 b'"description": "Bad Request: wrong file identifier"}')
+
+
+class ScriptedApi(RecordingApi):
+
+    def __init__(self, responses, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses = list(responses)
+
+    def _make_post_request(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return FakeResponse(self.responses.pop(0))
+
+    def uploaded(self):
+        return ['files' in kwargs for _, kwargs in self.requests]
+
+
+class TestFileIdCache(unittest.TestCase):
+
+    def test_digest_rewinds(self):
+        stream = io.BytesIO(b'header' + b'x' * 100000)
+        stream.read(6)
+        digest = content_digest(stream)
+        self.assertEqual(stream.tell(), 6)
+        self.assertEqual(digest, content_digest(io.BytesIO(b'x' * 100000)))
+
+    def test_lru(self):
+        cache = FileIdCache(maxsize=2)
+        cache.add('photo', 'a', 'A')
+        cache.add('photo', 'b', 'B')
+        cache.get('photo', 'a')
+        cache.add('photo', 'c', 'C')
+        self.assertEqual(cache.get('photo', 'a'), 'A')
+        self.assertIsNone(cache.get('photo', 'b'))
+        self.assertIsNone(cache.get('document', 'a'))
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'file_ids.log')
+            cache = FileIdCache(maxsize=3, path=path)
+            for name in 'abcdefgh':
+                cache.add('photo', name, name.upper())
+            cache.discard('photo', 'h')
+            with open(path, 'a') as file:
+                file.write('photo broken-by-crash')
+
+            cache = FileIdCache(maxsize=3, path=path)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.get('photo', 'g'), 'G')
+            self.assertIsNone(cache.get('photo', 'h'))
+            with open(path) as file:
+                self.assertEqual(len(file.readlines()), 2)
+
+
+class TestCachedUpload(unittest.TestCase):
+
+    def test_no_cache(self):
+        api = ScriptedApi([PHOTO_MESSAGE] * 2, token='123:abc')
+        for _ in range(2):
+            api.send_photo(chat_id=3, photo=io.BytesIO(b'png'))
+        self.assertEqual(api.uploaded(), [True, True])
+
+    def test_send_by_file_id(self):
+        api = ScriptedApi([PHOTO_MESSAGE] * 3, token='123:abc',
+                          file_cache=FileIdCache())
+        api.send_photo(chat_id=3, photo=io.BytesIO(b'png'))
+        api.send_photo(3, io.BytesIO(b'png'), caption='again')
+        api.send_photo(chat_id=3, photo=io.BytesIO(b'other png'))
+        self.assertEqual(api.uploaded(), [True, False, True])
+        data = json.loads(api.requests[1][1]['data'])
+        self.assertEqual(data['photo'], 'large')
+        self.assertEqual(data['caption'], 'again')
+
+    def test_other_kind_of_media(self):
+        api = ScriptedApi([DOCUMENT_MESSAGE] * 2, token='123:abc',
+                          file_cache=FileIdCache())
+        for _ in range(2):
+            api.send_document(chat_id=3, document=io.BytesIO(b'gif'))
+        self.assertEqual(api.uploaded(), [True, False])
+        self.assertEqual(json.loads(api.requests[1][1]['data'])['document'],
+                         'gif')
+
+    def test_stale_file_id(self):
+        cache = FileIdCache()
+        api = ScriptedApi([PHOTO_MESSAGE, WRONG_FILE_ID, PHOTO_MESSAGE],
+                          token='123:abc', file_cache=cache)
+        api.send_photo(chat_id=3, photo=io.BytesIO(b'png'))
+        api.send_photo(chat_id=3, photo=io.BytesIO(b'png'))
+        self.assertEqual(api.uploaded(), [True, False, True])
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from telegrambotapiwrapper import jsoncodec
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.request import json_payload
+from telegrambotapiwrapper.response import get_result
+from telegrambotapiwrapper.typelib import Update
+from telegrambotapiwrapper.webhooks import webhook_handler
+
+UPDATE = ('{"update_id": 5, "message": {"message_id": 1, "date": 2, '
+          '"chat": {"id": -1001234567890, "type": "supergroup"}, '
+          '"from": {"id": 4, "is_bot": false, "first_name": "Дзмітрый"}, '
+          '"text": "привет / hi"}}')
+
+
+class TestJsonCodecs(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = jsoncodec.get_codec()
+
+    def tearDown(self):
+        jsoncodec.set_codec(self.previous)
+
+    def test_stdlib_is_available(self):
+        self.assertIn('json', jsoncodec.available_codecs())
+
+    def test_default_is_fastest_available(self):
+        self.assertEqual(self.previous.name,
+                         jsoncodec.available_codecs()[0])
+
+    def test_unknown(self):
+        with self.assertRaises(KeyError):
+            jsoncodec.set_codec('xml')
+
+    def test_codecs(self):
+        for name in jsoncodec.available_codecs():
+            with self.subTest(codec=name):
+                jsoncodec.set_codec(name)
+                for request in (UPDATE, UPDATE.encode('utf-8')):
+                    update = webhook_handler(request)
+                    self.assertIsInstance(update, Update)
+                    self.assertEqual(update.message.from_.first_name,
+                                     'Дзмітрый')
+                payload = json_payload({'chat_id': 1, 'text': 'привет / hi',
+                                        'reply_markup': None})
+                self.assertEqual(payload, '{"chat_id":1,"text":"привет / hi"}'
+                                 .encode('utf-8'))
+                with self.assertRaises(UnsuccessfulRequest):
+                    get_result(b'{"ok": false, "error_code": 400, '
+                               b'"description": "Bad Request"}')
+
+    def test_custom_codec(self):
+        calls = []
+
+        class Codec(jsoncodec.StdlibCodec):
+            name = 'custom'
+
+            def loads(self, data):
+                calls.append(data)
+                return super().loads(data)
+
+        jsoncodec.set_codec(Codec())
+        self.assertTrue(get_result(b'{"ok": true, "result": true}'))
+        self.assertEqual(calls, [b'{"ok": true, "result": true}'])
+
+
+if __name__ == '__main__':
+    unittest.main()
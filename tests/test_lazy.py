@@ -0,0 +1,67 @@
+import copy
+import pickle
+import unittest
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper import lazy
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.webhooks import webhook_handler
+from tests.test_slotted import MESSAGE
+
+UPDATE = {'update_id': 7, 'message': dict(
+    MESSAGE, reply_to_message=dict(MESSAGE, message_id=0))}
+
+
+class TestLazy(unittest.TestCase):
+
+    def test_decoded_on_access(self):
+        update = lazy.get_decoder('Update')(UPDATE)
+        self.assertEqual(set(vars(update)), {'update_id', '_raw_message'})
+        message = update.message
+        self.assertIsInstance(message, lazy.Message)
+        self.assertIsInstance(message, typelib.Message)
+        self.assertIs(update.message, message)  # cached on the parent
+        self.assertIn('_raw_reply_to_message', vars(message))
+        self.assertEqual(message.text, 'hi')
+        self.assertEqual(message.chat.id, 3)
+        self.assertEqual(message.from_.first_name, 'John')
+        self.assertIsInstance(message.entities[0], lazy.MessageEntity)
+        self.assertIn('_raw_reply_to_message', vars(message))
+        self.assertIsNone(message.photo)
+        self.assertIsNone(update.callback_query)
+
+    def test_same_as_eager(self):
+        update = lazy.get_decoder('Update')(UPDATE)
+        eager = get_decoder('Update')(UPDATE)
+        self.assertEqual(repr(update), repr(eager))
+        self.assertEqual(update._fields_items, eager._fields_items)
+        self.assertEqual(update, lazy.get_decoder('Update')(UPDATE))
+
+    def test_missing_required_field(self):
+        with self.assertRaises(TypeError):
+            lazy.get_decoder('Message')({'message_id': 1})
+
+    def test_constructor_and_assignment(self):
+        chat = lazy.Chat(id=1, type='private')
+        message = lazy.Message(message_id=1, date=2, chat=chat)
+        self.assertIs(message.chat, chat)
+        update = lazy.get_decoder('Update')(UPDATE)
+        update.message = None
+        self.assertIsNone(update.message)
+        self.assertNotIn('_raw_message', vars(update))
+
+    def test_copy_and_pickle(self):
+        update = lazy.get_decoder('Update')(UPDATE)
+        for other in (copy.deepcopy(update),
+                      pickle.loads(pickle.dumps(update))):
+            self.assertEqual(other.message.chat.id, 3)
+
+    def test_webhook(self):
+        update = webhook_handler('{"update_id": 1, "message": {"message_id": '
+                                 '1, "date": 2, "chat": {"id": 3, "type": '
+                                 '"private"}}}', decoders=lazy.decoders)
+        self.assertEqual(update.message.chat.type, 'private')
+
+
+if __name__ == '__main__':
+    unittest.main()
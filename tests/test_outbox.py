@@ -0,0 +1,147 @@
+import unittest
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.outbox import Outbox, TokenBucket
+from telegrambotapiwrapper.retry import ChatMigrations
+from telegrambotapiwrapper.typelib import ResponseParameters
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeApi:
+    def __init__(self):
+        self.sent = []
+        self.flood = set()
+
+    def send_message(self, chat_id, text):
+        if chat_id in self.flood:
+            self.flood.discard(chat_id)
+            raise UnsuccessfulRequest(
+                description='Too Many Requests', error_code=429,
+                parameters=ResponseParameters(retry_after=10))
+        self.sent.append((chat_id, text))
+        return text
+
+    def get_me(self):
+        return 'me'
+
+    def leave_chat(self, chat_id):
+        raise UnsuccessfulRequest(description='Forbidden', error_code=403)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_bucket(self):
+        bucket = TokenBucket(rate=2, capacity=2)
+        self.assertEqual(bucket.delay(0), 0)
+        bucket.consume(0)
+        bucket.consume(0)
+        self.assertEqual(bucket.delay(0), 0.5)
+        self.assertEqual(bucket.delay(0.5), 0)
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.pause(0, 5)
+        self.assertEqual(bucket.delay(1), 4)
+        self.assertEqual(bucket.delay(5), 0)
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.api = FakeApi()
+        self.migrations = ChatMigrations()
+        self.outbox = Outbox(self.api, clock=self.clock,
+                             sleep=self.clock.sleep,
+                             migrations=self.migrations)
+
+    def test_global_limit(self):
+        for chat_id in range(1, 101):
+            self.outbox.send_message(chat_id=chat_id, text='hi')
+        self.assertEqual(self.outbox.run_pending(), 30)
+        self.clock.now = 0.5
+        self.assertEqual(self.outbox.run_pending(), 15)
+        self.clock.now = 1.5
+        self.assertEqual(self.outbox.run_pending(), 30)
+        self.assertEqual(self.outbox.pending(), 25)
+        self.assertEqual([chat_id for chat_id, _ in self.api.sent],
+                         list(range(1, 76)))
+
+    def test_private_chat_limit(self):
+        futures = [self.outbox.send_message(chat_id=1, text=str(i))
+                   for i in range(3)]
+        self.outbox.send_message(chat_id=2, text='other')
+        self.assertEqual(self.outbox.run_pending(), 2)
+        self.assertEqual(self.outbox.next_delay(), 1)
+        self.clock.now = 1
+        self.assertEqual(self.outbox.run_pending(), 1)
+        self.outbox.run()
+        self.assertEqual(self.clock.now, 2)
+        self.assertEqual([future.result() for future in futures],
+                         ['0', '1', '2'])
+
+    def test_group_limit(self):
+        for i in range(21):
+            self.outbox.send_message(chat_id=-100, text=str(i))
+        self.outbox.run()
+        self.assertEqual(len(self.api.sent), 21)
+        self.assertAlmostEqual(self.clock.now, 60)
+
+    def test_calls_without_chat(self):
+        future = self.outbox.get_me()
+        self.outbox.run_pending()
+        self.assertEqual(future.result(), 'me')
+
+    def test_exception(self):
+        future = self.outbox.leave_chat(chat_id=-1)
+        self.outbox.run_pending()
+        self.assertIsInstance(future.exception(), UnsuccessfulRequest)
+
+    def test_retry_after(self):
+        self.api.flood.add(-1)
+        first = self.outbox.send_message(chat_id=-1, text='first')
+        second = self.outbox.send_message(chat_id=-1, text='second')
+        other = self.outbox.send_message(chat_id=-2, text='other')
+        self.outbox.run_pending()
+        # only the flooded chat waits, its calls keep their order
+        self.assertEqual(other.result(), 'other')
+        self.assertFalse(first.done())
+        self.clock.now = 9
+        self.assertEqual(self.outbox.run_pending(), 0)
+        self.outbox.run()
+        self.assertGreaterEqual(self.clock.now, 10)
+        self.assertEqual(first.result(), 'first')
+        self.assertEqual(second.result(), 'second')
+        self.assertEqual(self.api.sent,
+                         [(-2, 'other'), (-1, 'first'), (-1, 'second')])
+
+    def test_migrated_chat(self):
+        self.migrations.add(-1, -100)
+        self.outbox.send_message(chat_id=-1, text='hi')
+        self.outbox.run_pending()
+        self.assertEqual(self.api.sent, [(-100, 'hi')])
+
+    def test_unknown_method(self):
+        with self.assertRaises(AttributeError):
+            self.outbox.no_such_method(chat_id=1)
+
+    def test_thread(self):
+        outbox = Outbox(self.api, global_rate=1000, private_rate=1000)
+        outbox.start()
+        try:
+            futures = [outbox.send_message(chat_id=1, text=str(i))
+                       for i in range(10)]
+            self.assertEqual([future.result(timeout=5) for future in futures],
+                             [str(i) for i in range(10)])
+        finally:
+            outbox.stop()
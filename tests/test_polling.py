@@ -0,0 +1,133 @@
+import threading
+import unittest
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.polling import UpdatePoller
+from telegrambotapiwrapper.typelib import ResponseParameters, Update
+from tests.test_outbox import FakeClock
+
+
+class FakeApi:
+    """Api with a backlog of updates, taking `delay` seconds per poll."""
+
+    def __init__(self, count=0, clock=None, delay=0.1):
+        self.backlog = [{'update_id': i} for i in range(1, count + 1)]
+        self.calls = []
+        self.errors = []
+        self.clock = clock
+        self.delay = delay
+
+    def get_updates(self, offset=None, limit=None, timeout=None,
+                    allowed_updates=None):
+        self.calls.append({'offset': offset, 'limit': limit,
+                           'timeout': timeout})
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.clock is not None:
+            self.clock.sleep(self.delay)
+        if offset is not None:
+            self.backlog = [update for update in self.backlog
+                            if update['update_id'] >= offset]
+        return self.backlog[:limit or 100]
+
+
+class TestUpdatePoller(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def poller(self, api, **kwargs):
+        return UpdatePoller(api, clock=self.clock, sleep=self.clock.sleep,
+                            **kwargs)
+
+    def test_offset(self):
+        api = FakeApi(150, self.clock)
+        poller = self.poller(api)
+        self.assertEqual(poller.poll(), 100)
+        self.assertEqual(poller.offset, 101)
+        self.assertEqual(poller.poll(), 50)
+        self.assertEqual(poller.poll(), 0)
+        self.assertEqual([call['offset'] for call in api.calls],
+                         [None, 101, 151])
+        self.assertEqual([poller.get()['update_id'] for _ in range(150)],
+                         list(range(1, 151)))
+        self.assertIsNone(poller.get())
+
+    def test_objects(self):
+        api = FakeApi(2, self.clock)
+        api.backlog = [Update(update_id=7), Update(update_id=8)]
+        poller = self.poller(api)
+        poller.poll()
+        self.assertEqual(poller.offset, 9)
+
+    def test_limit_follows_handling_speed(self):
+        api = FakeApi(1000, self.clock, delay=0.5)
+        poller = self.poller(api)
+        self.assertEqual(poller.limit(), 100)
+        poller.poll()
+        for _ in range(50):
+            poller.get()
+            self.clock.sleep(0.05)  # handling
+        # 10 updates are handled during a round trip of 0.5 seconds
+        self.assertEqual(poller.limit(), 10)
+
+    def test_limit_by_free_space(self):
+        api = FakeApi(1000, self.clock)
+        poller = self.poller(api, maxsize=150)
+        poller.poll()
+        self.assertEqual(poller.limit(), 50)
+        poller = self.poller(api, min_limit=5, max_limit=20)
+        self.assertEqual(poller.limit(), 20)
+
+    def test_backpressure(self):
+        api = FakeApi(1000)
+        poller = UpdatePoller(api, maxsize=30, timeout=0)
+        poller.start()
+        try:
+            first = poller.get(timeout=5)
+            self.assertEqual(first['update_id'], 1)
+            for _ in range(20):
+                self.assertIsNotNone(poller.get(timeout=5))
+            self.assertLessEqual(poller.pending(), 30)
+        finally:
+            left = poller.stop(wait=True)
+        self.assertLessEqual(len(left), 30)
+        self.assertTrue(all(call['limit'] <= 30 for call in api.calls))
+        self.assertEqual(poller.pending(), 0)
+
+    def test_next_poll_while_handling(self):
+        handling = threading.Event()
+        polled = threading.Event()
+
+        class Api(FakeApi):
+            def get_updates(self, offset=None, **kwargs):
+                if offset is not None and handling.is_set():
+                    polled.set()
+                return super().get_updates(offset=offset, **kwargs)
+
+        poller = UpdatePoller(Api(1), timeout=0)
+        with poller:
+            self.assertEqual(poller.get(timeout=5)['update_id'], 1)
+            handling.set()
+            self.assertTrue(polled.wait(5))
+
+    def test_errors(self):
+        api = FakeApi(1, self.clock)
+        errors = []
+        api.errors = [ConnectionError(), ConnectionError(),
+                      UnsuccessfulRequest(
+                          description='Too Many Requests', error_code=429,
+                          parameters=ResponseParameters(retry_after=5)),
+                      UnsuccessfulRequest(description='Conflict',
+                                          error_code=409)]
+        poller = self.poller(api, on_error=errors.append)
+        poller._stopped = False
+        poller.run()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(self.clock.now, 1 + 2 + 5)
+        with self.assertRaises(UnsuccessfulRequest):
+            poller.get()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import unittest
+
+from telegrambotapiwrapper import jsoncodec, slotted
+from telegrambotapiwrapper.polling import UpdatePoller
+from telegrambotapiwrapper.prefilter import (Prefilter, chats, commands,
+                                             has_callback, kinds,
+                                             text_startswith)
+from telegrambotapiwrapper.typelib import Update
+from telegrambotapiwrapper.webhooks import webhook_handler
+from tests.test_retry import ScriptedApi
+
+USER = {'id': 7, 'is_bot': False, 'first_name': 'A'}
+
+
+def message(text, chat=-100, update_id=1):
+    return {'update_id': update_id, 'message': {
+        'message_id': 1, 'date': 2, 'from': USER, 'text': text,
+        'chat': {'id': chat, 'type': 'supergroup'}}}
+
+
+CALLBACK = {'update_id': 3, 'callback_query': {
+    'id': 'q', 'from': USER, 'chat_instance': 'i', 'data': 'vote:yes'}}
+
+
+def encodings(update):
+    """Compact json, json with spaces and escaped slashes."""
+    compact = jsoncodec.StdlibCodec().dumps(update)
+    spaced = json.dumps(update, indent=1).encode('utf-8')
+    return compact, spaced, compact.replace(b'/', b'\\/')
+
+
+class TestPrefilter(unittest.TestCase):
+
+    def check(self, prefilter, update, expected):
+        self.assertEqual(prefilter(update), expected)
+        for raw in encodings(update):
+            with self.subTest(raw=raw):
+                parsed = prefilter.parse(raw)
+                self.assertEqual(parsed is not None, expected)
+                if not expected:
+                    continue
+                self.assertTrue(prefilter.might_match(raw))
+
+    def test_kinds(self):
+        self.check(kinds('message'), message('hi'), True)
+        self.check(kinds('message'), CALLBACK, False)
+        self.check(has_callback(), CALLBACK, True)
+        with self.assertRaises(ValueError):
+            kinds('mesage')
+
+    def test_chats(self):
+        self.check(chats(-100, 5), message('hi', chat=-100), True)
+        self.check(chats(-100), message('hi', chat=-1001), False)
+        self.check(chats(100), message('hi', chat=-100), False)
+        self.check(chats(7), CALLBACK, True)  # callback without a message
+
+    def test_text(self):
+        self.check(commands(), message('/start'), True)
+        self.check(commands(), message('hi /start'), False)
+        self.check(commands(), CALLBACK, False)
+        self.check(text_startswith('привет'), message('привет всем'), True)
+
+    def test_raw_check_rejects_without_parsing(self):
+        raw = jsoncodec.StdlibCodec().dumps(message('just chatter'))
+        self.assertFalse(commands().might_match(raw))
+        self.assertFalse(kinds('callback_query').might_match(raw))
+        self.assertTrue((~commands()).might_match(raw))
+
+    def test_combinations(self):
+        bot_filter = has_callback() | (commands() & chats(-100))
+        self.check(bot_filter, CALLBACK, True)
+        self.check(bot_filter, message('/start', chat=-100), True)
+        self.check(bot_filter, message('/start', chat=-200), False)
+        self.check(bot_filter, message('hi', chat=-100), False)
+        self.check(~commands(), message('hi'), True)
+        self.check(~commands() & kinds('message'), message('/start'), False)
+        custom = Prefilter(lambda update: update['update_id'] > 2)
+        self.check(custom | commands(), CALLBACK, True)
+        self.check(custom & commands(), CALLBACK, False)
+
+
+class TestIntegration(unittest.TestCase):
+
+    def test_webhook_handler(self):
+        raw = json.dumps(message('/start')).encode('utf-8')
+        self.assertIsInstance(webhook_handler(raw, prefilter=commands()),
+                              Update)
+        self.assertIsInstance(webhook_handler(raw, slotted.decoders,
+                                              commands()), slotted.Update)
+        self.assertIsNone(webhook_handler(raw, prefilter=has_callback()))
+
+    def test_poller(self):
+        response = json.dumps({'ok': True, 'result': [
+            message('hi', update_id=1), message('/start', update_id=2),
+            message('hi', update_id=3)]}).encode('utf-8')
+        api = ScriptedApi([response], token='123:abc',
+                          decoders=slotted.decoders)
+        poller = UpdatePoller(api, prefilter=commands())
+        self.assertEqual(poller.poll(), 1)
+        self.assertEqual(poller.offset, 4)
+        update = poller.get()
+        self.assertIsInstance(update, slotted.Update)
+        self.assertEqual(update.update_id, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import unittest
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.response import (RESULT_BYTES, RESULT_DICT,
+                                            decode_result, get_result_bytes)
+from telegrambotapiwrapper.typelib import Message, Update
+from telegrambotapiwrapper import slotted
+from tests.test_retry import FORBIDDEN, MESSAGE, ScriptedApi
+
+UPDATES = (b'{"ok":true,"result":[{"update_id":5,"message":{"message_id":1,'
+           b'"date":2,"chat":{"id":3,"type":"private"},'
+           b'"from":{"id":4,"is_bot":false,"first_name":"A"},'
+           b'"text":"hi"}}]}')
+
+
+class TestGetResultBytes(unittest.TestCase):
+
+    def test_slice(self):
+        result = get_result_bytes(UPDATES)
+        self.assertTrue(result.startswith(b'[{"update_id":5'))
+        self.assertEqual(json.loads(result),
+                         json.loads(UPDATES)['result'])
+
+    def test_whitespace(self):
+        self.assertEqual(get_result_bytes(b' { "ok" : true , "result" : '
+                                          b'true }\n'), b'true')
+
+    def test_other_layout(self):
+        raw = b'{"result": {"a": 1}, "ok": true}'
+        self.assertEqual(json.loads(get_result_bytes(raw)), {'a': 1})
+
+    def test_unsuccessful(self):
+        with self.assertRaises(UnsuccessfulRequest):
+            get_result_bytes(FORBIDDEN)
+
+    def test_result_followed_by_fields(self):
+        raw = b'{"ok":true,"result":true,"description":"Webhook was set"}'
+        self.assertEqual(get_result_bytes(raw), b'true')
+        self.assertIs(decode_result(get_result_bytes(raw), 'bool'), True)
+        raw = b'{"ok":true,"result":{"a":"}"},"description":"b"}'
+        self.assertEqual(json.loads(get_result_bytes(raw)), {'a': '}'})
+
+    def test_non_ascii(self):
+        raw = '{"ok":true,"result":{"text":"\u00e9 }"}}'.encode('utf-8')
+        self.assertEqual(get_result_bytes(raw),
+                         '{"text":"\u00e9 }"}'.encode('utf-8'))
+
+
+class TestResultFormat(unittest.TestCase):
+
+    def test_dict(self):
+        api = ScriptedApi([UPDATES], token='123:abc', result_format=RESULT_DICT)
+        updates = api.get_updates()
+        self.assertEqual(updates[0]['message']['from']['id'], 4)
+
+    def test_bytes(self):
+        api = ScriptedApi([UPDATES], token='123:abc',
+                          result_format=RESULT_BYTES)
+        raw = api.get_updates()
+        self.assertIsInstance(raw, bytes)
+        updates = decode_result(raw, 'List[Update]')
+        self.assertIsInstance(updates[0], Update)
+        self.assertEqual(updates[0].message.from_.id, 4)
+
+    def test_bytes_of_upload_method(self):
+        api = ScriptedApi([MESSAGE], token='123:abc',
+                          result_format=RESULT_BYTES)
+        raw = api.send_photo(chat_id=1, photo='file-id')
+        self.assertEqual(json.loads(raw)['text'], 'hi')
+
+    def test_per_call(self):
+        api = ScriptedApi([MESSAGE, MESSAGE], token='123:abc')
+        raw_api = api.with_result_format(RESULT_DICT)
+        self.assertEqual(raw_api.send_message(chat_id=1, text='hi')['text'],
+                         'hi')
+        self.assertIsInstance(api.send_message(chat_id=1, text='hi'),
+                              Message)
+        self.assertIs(raw_api.transport, api.transport)
+
+    def test_errors(self):
+        api = ScriptedApi([FORBIDDEN], token='123:abc',
+                          result_format=RESULT_BYTES)
+        with self.assertRaises(UnsuccessfulRequest):
+            api.send_message(chat_id=1, text='hi')
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ScriptedApi([], token='123:abc', result_format='xml')
+
+    def test_decode_result_with_decoders(self):
+        message = decode_result(json.loads(MESSAGE)['result'], 'Message',
+                                decoders=slotted.decoders)
+        self.assertIsInstance(message, slotted.Message)
+
+
+if __name__ == '__main__':
+    unittest.main()
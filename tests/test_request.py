@@ -1,7 +1,6 @@
+import json
 import unittest
 
-import jsonpickle
-
 from telegrambotapiwrapper.request import json_payload
 from telegrambotapiwrapper.typelib import *
 
@@ -32,4 +31,27 @@ class TestRequest(unittest.TestCase):
                 }]]
         }
 
-        self.assertEqual(jsonpickle.loads(payload), res)
+        self.assertEqual(json.loads(payload), res)
+
+    def test_json_payload_is_compact_bytes(self):
+        payload = json_payload({'chat_id': 1, 'text': 'привет'})
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(payload,
+                         '{"chat_id":1,"text":"привет"}'.encode('utf-8'))
+
+    def test_json_payload_drops_none_and_renames_from_(self):
+        user = User(id=1, is_bot=False, first_name='John')
+        message = Message(message_id=2, date=3,
+                          chat=Chat(id=4, type='private'), from_=user)
+        res = json.loads(json_payload({'message': message,
+                                             'reply_markup': None,
+                                             'items': [None, 1]}))
+        self.assertEqual(res, {
+            'message': {
+                'message_id': 2,
+                'date': 3,
+                'chat': {'id': 4, 'type': 'private'},
+                'from': {'id': 1, 'is_bot': False, 'first_name': 'John'},
+            },
+            'items': [None, 1],
+        })
@@ -0,0 +1,98 @@
+import json
+import unittest
+
+from telegrambotapiwrapper.errors import UnsuccessfulRequest
+from telegrambotapiwrapper.retry import ChatMigrations, RetryPolicy
+from telegrambotapiwrapper.typelib import Message
+from tests.test_callplan import FakeResponse, RecordingApi
+
+MESSAGE = (b'{"ok": true, "result": {"message_id": 1, "date": 2, '
+           b'"chat": {"id": -100123, "type": "supergroup"}, "text": "hi"}}')
+MIGRATED = (b'{"ok": false, "error_code": 400, "description": "Bad Request: '
+            b'group chat was upgraded to a supergroup chat", '
+            b'"parameters": {"migrate_to_chat_id": -100123}}')
+TOO_MANY = (b'{"ok": false, "error_code": 429, "description": "Too Many '
+            b'Requests: retry after 7", "parameters": {"retry_after": 7}}')
+FORBIDDEN = (b'{"ok": false, "error_code": 403, '
+             b'"description": "Forbidden: bot was blocked by the user"}')
+
+
+class ScriptedApi(RecordingApi):
+    """Api answering the requests with the given responses."""
+
+    def __init__(self, responses, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses = list(responses)
+
+    def _make_post_request(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return FakeResponse(self.responses.pop(0))
+
+    def sent_chat_ids(self):
+        return [json.loads(kwargs['data'])['chat_id']
+                for _, kwargs in self.requests]
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.sleeps = []
+        self.migrations = ChatMigrations()
+        self.policy = RetryPolicy(migrations=self.migrations,
+                                  sleep=self.sleeps.append)
+
+    def test_no_policy(self):
+        api = ScriptedApi([TOO_MANY], token='123:abc')
+        with self.assertRaises(UnsuccessfulRequest) as cm:
+            api.send_message(chat_id=-1, text='hi')
+        self.assertEqual(cm.exception.parameters.retry_after, 7)
+
+    def test_retry_after(self):
+        api = ScriptedApi([TOO_MANY, MESSAGE], token='123:abc',
+                          retry_policy=self.policy)
+        self.assertIsInstance(api.send_message(chat_id=-1, text='hi'),
+                              Message)
+        self.assertEqual(self.sleeps, [7])
+        self.assertEqual(len(api.requests), 2)
+
+    def test_migration(self):
+        api = ScriptedApi([MIGRATED, MESSAGE, MESSAGE], token='123:abc',
+                          retry_policy=self.policy)
+        api.send_message(chat_id=-123, text='hi')
+        self.assertEqual(self.migrations.get(-123), -100123)
+        # the known migration is applied without the failing round-trip
+        api.send_message(chat_id=-123, text='hi')
+        self.assertEqual(api.sent_chat_ids(), [-123, -100123, -100123])
+        self.assertEqual(self.sleeps, [])
+
+    def test_migration_of_from_chat_id(self):
+        self.migrations.add(-123, -100123)
+        args = self.migrations.apply({'chat_id': 1, 'from_chat_id': -123})
+        self.assertEqual(args, {'chat_id': 1, 'from_chat_id': -100123})
+
+    def test_max_retries(self):
+        policy = RetryPolicy(max_retries=2, migrations=self.migrations,
+                             sleep=self.sleeps.append)
+        api = ScriptedApi([TOO_MANY] * 3, token='123:abc',
+                          retry_policy=policy)
+        with self.assertRaises(UnsuccessfulRequest):
+            api.send_message(chat_id=-1, text='hi')
+        self.assertEqual(self.sleeps, [7, 7])
+
+    def test_other_errors(self):
+        api = ScriptedApi([FORBIDDEN], token='123:abc',
+                          retry_policy=self.policy)
+        with self.assertRaises(UnsuccessfulRequest):
+            api.send_message(chat_id=1, text='hi')
+        self.assertEqual(len(api.requests), 1)
+
+    def test_disabled(self):
+        policy = RetryPolicy(handle_retry_after=False,
+                             migrations=self.migrations)
+        api = ScriptedApi([TOO_MANY], token='123:abc', retry_policy=policy)
+        with self.assertRaises(UnsuccessfulRequest):
+            api.send_message(chat_id=-1, text='hi')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.router import PrefixTrie, Router, message_command
+
+USER = {'id': 7, 'is_bot': False, 'first_name': 'A'}
+CHAT = {'id': 7, 'type': 'private'}
+
+
+def message(text, entities=None, kind='message'):
+    value = {'message_id': 1, 'date': 2, 'chat': CHAT, 'from': USER,
+             'text': text}
+    if entities is not None:
+        value['entities'] = entities
+    return {'update_id': 1, kind: value}
+
+
+def command(text, kind='message'):
+    length = len(text.split()[0])
+    return message(text, [{'type': 'bot_command', 'offset': 0,
+                           'length': length}], kind)
+
+
+def callback(data):
+    return {'update_id': 2, 'callback_query': {
+        'id': 'q', 'from': USER, 'chat_instance': 'i', 'data': data}}
+
+
+class TestPrefixTrie(unittest.TestCase):
+
+    def test_trie(self):
+        trie = PrefixTrie()
+        trie['vote:'] = 1
+        trie['vote:cancel'] = 2
+        trie['vote:'] = 3
+        self.assertEqual(len(trie), 2)
+        self.assertEqual(trie.get('vote:'), 3)
+        self.assertIsNone(trie.get('vote'))
+        self.assertEqual(trie.longest_prefix('vote:yes'), 3)
+        self.assertEqual(trie.longest_prefix('vote:cancel:1'), 2)
+        self.assertEqual(trie.longest_prefix('poll', 0), 0)
+        trie[''] = 4
+        self.assertEqual(trie.longest_prefix('poll'), 4)
+
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        router = self.router = Router(username='@SomeBot')
+        router.command('start')(lambda update: 'start')
+        router.command('help', kinds=('message', 'channel_post'))(
+            lambda update: 'help')
+        router.callback('vote:')(lambda update: 'vote')
+        router.callback('vote:cancel')(lambda update: 'cancel')
+        router.on('message')(lambda update: 'message')
+        router.on('callback_query')(lambda update: 'callback')
+        router.default(lambda update: 'default')
+
+    def check(self, update, expected):
+        self.assertEqual(self.router(update), expected)
+        self.assertEqual(self.router(get_decoder('Update')(update)), expected)
+
+    def test_commands(self):
+        self.check(command('/start'), 'start')
+        self.check(command('/START now'), 'start')
+        self.check(command('/start@somebot'), 'start')
+        self.check(command('/start@otherbot'), 'message')
+        self.check(command('/unknown'), 'message')
+        self.check(command('/help', kind='channel_post'), 'help')
+        self.check(command('/start', kind='channel_post'), 'default')
+
+    def test_not_commands(self):
+        self.check(message('/start'), 'message')  # no entity
+        self.check(message('hi /start', [{'type': 'bot_command', 'offset': 3,
+                                          'length': 6}]), 'message')
+        self.check(message('https://x.y', [{'type': 'url', 'offset': 0,
+                                            'length': 11}]), 'message')
+
+    def test_callbacks(self):
+        self.check(callback('vote:yes'), 'vote')
+        self.check(callback('vote:cancel'), 'cancel')
+        self.check(callback('other'), 'callback')
+        self.check({'update_id': 3, 'inline_query': {
+            'id': 'q', 'from': USER, 'query': '', 'offset': ''}}, 'default')
+
+    def test_no_route(self):
+        self.assertIsNone(Router()(callback('vote:yes')))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            self.router.on('mesage')
+
+    def test_message_command(self):
+        self.assertEqual(message_command(command('/start@bot x')['message']),
+                         ('start', 'bot'))
+        self.assertIsNone(message_command(message('hi')['message']))
+
+
+if __name__ == '__main__':
+    unittest.main()
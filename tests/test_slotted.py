@@ -0,0 +1,64 @@
+import dataclasses
+import pickle
+import unittest
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper import slotted
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.decoders import get_decoder
+from telegrambotapiwrapper.webhooks import webhook_handler
+from tests.test_callplan import RecordingApi
+
+MESSAGE = {'message_id': 1, 'date': 2, 'text': 'hi',
+           'chat': {'id': 3, 'type': 'private'},
+           'from': {'id': 3, 'is_bot': False, 'first_name': 'John'},
+           'entities': [{'offset': 0, 'length': 2, 'type': 'bold'}]}
+
+
+class TestSlotted(unittest.TestCase):
+
+    def test_all_types(self):
+        types = types_by_name(typelib)
+        slotted_types = types_by_name(slotted.__name__)
+        self.assertEqual(len(slotted_types), 98)
+        self.assertEqual(set(slotted_types), set(types))
+        for name, cls in slotted_types.items():
+            self.assertEqual(
+                [(f.name, f.type, f.default) for f in dataclasses.fields(cls)],
+                [(f.name, f.type, f.default)
+                 for f in dataclasses.fields(types[name])])
+            self.assertEqual(cls.__doc__, types[name].__doc__)
+
+    def test_instance(self):
+        user = slotted.User(id=1, is_bot=False, first_name='John')
+        self.assertFalse(hasattr(user, '__dict__'))
+        self.assertIsNone(user.last_name)
+        self.assertEqual(user, slotted.User(1, False, 'John'))
+        self.assertNotEqual(user, slotted.User(2, False, 'John'))
+        with self.assertRaises(AttributeError):
+            user.no_such_field = 1
+        self.assertEqual(pickle.loads(pickle.dumps(user)), user)
+
+    def test_decode(self):
+        message = slotted.get_decoder('Message')(MESSAGE)
+        self.assertIsInstance(message, slotted.Message)
+        self.assertIsInstance(message.from_, slotted.User)
+        self.assertIsInstance(message.entities[0], slotted.MessageEntity)
+        self.assertEqual(message._fields_items,
+                         get_decoder('Message')(MESSAGE)._fields_items)
+
+    def test_api(self):
+        api = RecordingApi(token='123:abc', decoders=slotted.decoders)
+        api.response = (b'{"ok": true, "result": {"id": 1, "is_bot": true, '
+                        b'"first_name": "bot"}}')
+        self.assertIsInstance(api.get_me(), slotted.User)
+
+    def test_webhook(self):
+        update = webhook_handler('{"update_id": 1, "message": {"message_id": '
+                                 '1, "date": 2, "chat": {"id": 3, "type": '
+                                 '"private"}}}', decoders=slotted.decoders)
+        self.assertIsInstance(update.message.chat, slotted.Chat)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import dataclasses
+import unittest
+
+import telegrambotapiwrapper.typelib as typelib
+from telegrambotapiwrapper import sparse
+from telegrambotapiwrapper.base import types_by_name
+from telegrambotapiwrapper.decoders import get_decoder
+from tests.test_slotted import MESSAGE
+
+
+class TestSparse(unittest.TestCase):
+
+    def test_all_types(self):
+        sparse_types = types_by_name(sparse.__name__)
+        self.assertEqual(set(sparse_types), set(types_by_name(typelib)))
+        for name, cls in sparse_types.items():
+            self.assertTrue(issubclass(cls, getattr(typelib, name)))
+
+    def test_stores_only_present_fields(self):
+        message = sparse.get_decoder('Message')(MESSAGE)
+        self.assertEqual(set(vars(message)),
+                         {'message_id', 'date', 'text', 'chat', 'from_',
+                          'entities'})
+        self.assertIsNone(message.photo)
+        self.assertIsInstance(message.chat, sparse.Chat)
+        self.assertIsInstance(message, typelib.Message)
+
+    def test_behaves_like_dataclass(self):
+        message = sparse.get_decoder('Message')(MESSAGE)
+        dense = get_decoder('Message')(MESSAGE)
+        self.assertEqual(message._fields_items, dense._fields_items)
+        self.assertEqual(repr(message), repr(dense))
+        self.assertEqual(message, sparse.get_decoder('Message')(MESSAGE))
+        self.assertNotEqual(message, sparse.get_decoder('Message')(
+            dict(MESSAGE, text='other')))
+
+    def test_constructor(self):
+        user = sparse.User(1, False, 'John', username='john')
+        self.assertEqual(vars(user), {'id': 1, 'is_bot': False,
+                                      'first_name': 'John',
+                                      'username': 'john'})
+        self.assertEqual(user, sparse.User(id=1, is_bot=False,
+                                           first_name='John',
+                                           username='john', last_name=None))
+        self.assertEqual([f.name for f in dataclasses.fields(user)],
+                         [f.name for f in dataclasses.fields(typelib.User)])
+        with self.assertRaises(TypeError):
+            sparse.User(1, False)
+
+    def test_assignment(self):
+        user = sparse.User(1, False, 'John')
+        user.username = 'john'
+        self.assertEqual(user.username, 'john')
+        self.assertIsNone(sparse.User(2, False, 'Jane').username)
+
+
+if __name__ == '__main__':
+    unittest.main()
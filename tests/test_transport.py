@@ -0,0 +1,82 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegrambotapiwrapper import Api
+from telegrambotapiwrapper.transport import Transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'{"ok": true, "result": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    timeout = 5
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalApi(Api):
+    """Api sending requests to the local server."""
+
+    def __init__(self, url, **kwargs):
+        super().__init__(token='123:abc', **kwargs)
+        self.url = url
+
+    def _get_tg_api_method_url(self, api_method_name: str):
+        return self.url + api_method_name
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_connection_is_reused(self):
+        with Transport() as transport:
+            api = LocalApi(self.url, transport=transport)
+            for _ in range(5):
+                self.assertTrue(api.delete_chat_photo(chat_id=1))
+            self.assertEqual(transport.stats.requests, 5)
+            self.assertEqual(transport.stats.new_connections, 1)
+            self.assertEqual(transport.stats.reused_connections, 4)
+
+    def test_shared_transport(self):
+        with Transport() as transport:
+            first = LocalApi(self.url, transport=transport)
+            second = LocalApi(self.url, transport=transport)
+            first.leave_chat(chat_id=1)
+            second.leave_chat(chat_id=2)
+            self.assertIs(first.transport, second.transport)
+            self.assertEqual(transport.stats.new_connections, 1)
+            self.assertEqual(transport.stats.reused_connections, 1)
+
+    def test_without_keep_alive(self):
+        with Transport(keep_alive=False) as transport:
+            api = LocalApi(self.url, transport=transport)
+            for _ in range(3):
+                api.leave_chat(chat_id=1)
+            self.assertEqual(transport.stats.requests, 3)
+            self.assertEqual(transport.stats.new_connections, 3)
+            self.assertEqual(transport.stats.reused_connections, 0)
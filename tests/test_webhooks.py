@@ -0,0 +1,64 @@
+import io
+import json
+import unittest
+
+from telegrambotapiwrapper.typelib import (InlineKeyboardButton,
+                                           InlineKeyboardMarkup)
+from telegrambotapiwrapper.webhooks import MethodCall, webhook_reply
+
+
+class TestMethodCall(unittest.TestCase):
+
+    def test_payload(self):
+        markup = InlineKeyboardMarkup(inline_keyboard=[[
+            InlineKeyboardButton(text='Yes', callback_data='yes')]])
+        call = MethodCall('send_message', chat_id=1, text='hi',
+                          reply_markup=markup, reply_to_message_id=None)
+        self.assertEqual(json.loads(call.payload()), {
+            'method': 'sendMessage', 'chat_id': 1, 'text': 'hi',
+            'reply_markup': {'inline_keyboard': [[
+                {'text': 'Yes', 'callback_data': 'yes'}]]}})
+
+    def test_validation(self):
+        with self.assertRaises(TypeError):
+            MethodCall('send_mesage', chat_id=1, text='hi')
+        with self.assertRaises(TypeError):
+            MethodCall('send_message', chat_id=1, txt='hi')
+        with self.assertRaises(TypeError):
+            MethodCall('_make_request')
+        with self.assertRaises(TypeError):
+            MethodCall('send_message', text='hi')  # no chat_id
+
+    def test_call(self):
+        class FakeApi:
+            def answer_callback_query(self, callback_query_id):
+                return callback_query_id
+
+        call = MethodCall('answer_callback_query', callback_query_id='q')
+        self.assertEqual(call(FakeApi()), 'q')
+
+
+class TestWebhookReply(unittest.TestCase):
+
+    def test_nothing(self):
+        self.assertEqual(webhook_reply(None), (b'', []))
+
+    def test_one(self):
+        call = MethodCall('answer_callback_query', callback_query_id='q')
+        body, calls = webhook_reply(call)
+        self.assertEqual(json.loads(body), {'method': 'answerCallbackQuery',
+                                            'callback_query_id': 'q'})
+        self.assertEqual(calls, [])
+
+    def test_first_call_that_can_reply(self):
+        upload = MethodCall('send_photo', chat_id=1, photo=io.BytesIO(b'png'))
+        first = MethodCall('send_message', chat_id=1, text='first')
+        second = MethodCall('send_message', chat_id=1, text='second')
+        body, calls = webhook_reply([upload, first, second])
+        self.assertEqual(json.loads(body)['text'], 'first')
+        self.assertEqual(calls, [upload, second])
+        self.assertEqual(webhook_reply([upload]), (b'', [upload]))
+
+
+if __name__ == '__main__':
+    unittest.main()
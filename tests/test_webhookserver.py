@@ -0,0 +1,262 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from telegrambotapiwrapper import lazy
+from telegrambotapiwrapper.aiotransport import AsyncTransport
+from telegrambotapiwrapper.dedupe import UpdateDeduplicator
+from telegrambotapiwrapper.prefilter import chats
+from telegrambotapiwrapper.typelib import Update
+from telegrambotapiwrapper.webhooks import MethodCall
+from telegrambotapiwrapper.webhookserver import WebhookServer
+
+
+def update_body(update_id: int) -> bytes:
+    return json.dumps({'update_id': update_id, 'message': {
+        'message_id': update_id, 'date': 2, 'text': 'hi',
+        'chat': {'id': 3, 'type': 'private'}}}).encode('utf-8')
+
+
+async def raw_exchange(port: int, data: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+class TestWebhookServer(unittest.TestCase):
+
+    def run_server(self, handler, client, **kwargs):
+        async def main():
+            server = WebhookServer(handler, port=0, path='/hook', **kwargs)
+            async with server:
+                result = await client(server)
+            return server, result
+
+        return asyncio.run(main())
+
+    def test_async_handler(self):
+        updates = []
+
+        async def handle(update):
+            updates.append(update)
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport(pool_maxsize=1) as transport:
+                statuses = [(await transport.request(
+                    'POST', url, update_body(i))).status for i in range(10)]
+            return statuses, transport.stats
+
+        server, (statuses, stats) = self.run_server(handle, client)
+        self.assertEqual(statuses, [200] * 10)
+        self.assertEqual(stats.new_connections, 1)  # keep-alive
+        self.assertEqual(sorted(update.update_id for update in updates),
+                         list(range(10)))
+        self.assertIsInstance(updates[0], Update)
+        self.assertEqual((server.received, server.handled), (10, 10))
+
+    def test_sync_handler_with_decoders(self):
+        threads = set()
+        updates = []
+
+        def handle(update):
+            threads.add(threading.current_thread())
+            updates.append(update)
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                await asyncio.gather(*(transport.request(
+                    'POST', url, update_body(i)) for i in range(5)))
+
+        self.run_server(handle, client, decoders=lazy.decoders, workers=2)
+        self.assertEqual(len(updates), 5)
+        self.assertIsInstance(updates[0], lazy.Update)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_acknowledges_before_handling(self):
+        release = None
+
+        async def handle(update):
+            await release.wait()
+
+        async def client(server):
+            nonlocal release
+            release = asyncio.Event()
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                response = await transport.request('POST', url,
+                                                   update_body(1))
+            handled = server.handled
+            release.set()
+            return response.status, handled
+
+        server, result = self.run_server(handle, client)
+        self.assertEqual(result, (200, 0))
+        self.assertEqual(server.handled, 1)
+
+    def test_errors_of_handler(self):
+        errors = []
+
+        async def handle(update):
+            raise RuntimeError(update.update_id)
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                ok = await transport.request('POST', url, update_body(1))
+                bad = await transport.request('POST', url, b'not json')
+            return ok.status, bad.status
+
+        server, statuses = self.run_server(handle, client,
+                                           on_error=errors.append)
+        self.assertEqual(statuses, (200, 200))
+        self.assertEqual(server.failed, 2)
+        self.assertEqual(len(errors), 2)
+
+    def test_rejected_requests(self):
+        async def handle(update):
+            pass
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}'.format(server.port)
+            async with AsyncTransport() as transport:
+                not_found = await transport.request('POST', url + '/other',
+                                                    update_body(1))
+                get = await transport.request('GET', url + '/hook')
+            too_large = await raw_exchange(
+                server.port, b'POST /hook HTTP/1.1\r\n'
+                b'Content-Length: 2000\r\n\r\n')
+            garbage = await raw_exchange(server.port, b'HELLO\r\n\r\n')
+            return not_found.status, get.status, too_large, garbage
+
+        server, result = self.run_server(handle, client, max_body_size=1000)
+        not_found, get, too_large, garbage = result
+        self.assertEqual((not_found, get), (404, 405))
+        self.assertTrue(too_large.startswith(b'HTTP/1.1 413 '))
+        self.assertIn(b'Connection: close', too_large)
+        self.assertTrue(garbage.startswith(b'HTTP/1.1 400 '))
+        self.assertEqual(server.received, 0)
+
+    def test_connection_close(self):
+        async def handle(update):
+            pass
+
+        async def client(server):
+            body = update_body(1)
+            return await raw_exchange(
+                server.port, b'POST /hook HTTP/1.0\r\nContent-Length: '
+                + str(len(body)).encode() + b'\r\n\r\n' + body)
+
+        server, response = self.run_server(handle, client)
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 '))
+        self.assertEqual(server.handled, 1)
+
+    def test_reply_in_response(self):
+        made = []
+
+        class FakeApi:
+            def send_message(self, chat_id, text):
+                made.append((threading.current_thread(), text))
+
+        async def handle(update):
+            chat_id = update.message.chat.id
+            return [MethodCall('send_message', chat_id=chat_id, text='one'),
+                    MethodCall('send_message', chat_id=chat_id, text='two')]
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                return await transport.request('POST', url, update_body(1))
+
+        server, response = self.run_server(handle, client, api=FakeApi(),
+                                           reply_in_response=True)
+        self.assertEqual(json.loads(response.content), {
+            'method': 'sendMessage', 'chat_id': 3, 'text': 'one'})
+        self.assertEqual(response.headers['content-type'], 'application/json')
+        self.assertEqual([text for _, text in made], ['two'])
+        self.assertNotEqual(made[0][0], threading.main_thread())
+
+    def test_calls_without_reply(self):
+        made = []
+
+        class FakeAsyncApi:
+            async def send_message(self, chat_id, text):
+                made.append(text)
+
+        def handle(update):
+            return MethodCall('send_message', chat_id=1, text='one')
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                return await transport.request('POST', url, update_body(1))
+
+        server, response = self.run_server(handle, client,
+                                           api=FakeAsyncApi())
+        self.assertEqual(response.content, b'')
+        self.assertEqual(made, ['one'])
+
+    def test_reply_when_handler_fails(self):
+        errors = []
+
+        async def handle(update):
+            raise RuntimeError()
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                return await transport.request('POST', url, update_body(1))
+
+        server, response = self.run_server(handle, client,
+                                           reply_in_response=True,
+                                           on_error=errors.append)
+        self.assertEqual((response.status, response.content), (200, b''))
+        self.assertEqual(len(errors), 1)
+
+    def test_prefilter(self):
+        updates = []
+
+        def handle(update):
+            updates.append(update)
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            body = update_body(1).replace(b'"id": 3', b'"id": 4')
+            async with AsyncTransport() as transport:
+                return [(await transport.request('POST', url, body)).status
+                        for body in (update_body(2), body)]
+
+        server, statuses = self.run_server(handle, client,
+                                           prefilter=chats(4))
+        self.assertEqual(statuses, [200, 200])
+        self.assertEqual([update.update_id for update in updates], [1])
+        self.assertEqual((server.filtered, server.handled), (1, 1))
+
+    def test_dedupe(self):
+        updates = []
+
+        def handle(update):
+            updates.append(update)
+
+        async def client(server):
+            url = 'http://127.0.0.1:{}/hook'.format(server.port)
+            async with AsyncTransport() as transport:
+                return [(await transport.request('POST', url,
+                                                 update_body(i))).status
+                        for i in (1, 2, 1, 3, 2)]
+
+        dedupe = UpdateDeduplicator()
+        server, statuses = self.run_server(handle, client, dedupe=dedupe)
+        self.assertEqual(statuses, [200] * 5)
+        self.assertEqual(sorted(update.update_id for update in updates),
+                         [1, 2, 3])
+        self.assertEqual((server.filtered, dedupe.duplicates), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()